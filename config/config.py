@@ -8,7 +8,7 @@ class Config:
     """Configuration class for test automation framework."""
 
     # --- Base URLs ---
-    TWITCH_URL: str = "https://www.twitch.tv"
+    TWITCH_URL: str = os.getenv("TWITCH_URL", "https://www.twitch.tv").strip().rstrip("/")
     
     # --- Browser Configuration ---
     BROWSER: str = os.getenv("BROWSER", "chrome").strip()
@@ -16,6 +16,47 @@ class Config:
     IMPLICIT_WAIT: int = int(os.getenv("IMPLICIT_WAIT", "10").strip())
     PAGE_LOAD_TIMEOUT: int = int(os.getenv("PAGE_LOAD_TIMEOUT", "30").strip())
 
+    # --- Driver Binary Configuration ---
+    # Explicit chromedriver / Chrome paths skip auto-detection entirely
+    CHROMEDRIVER_PATH: str = os.getenv("CHROMEDRIVER_PATH", "").strip()
+    CHROME_BINARY: str = os.getenv("CHROME_BINARY", "").strip()
+    DRIVER_CACHE_DIR: str = os.path.expanduser(
+        os.getenv("DRIVER_CACHE_DIR", "~/.cache/twitch-test-automation").strip()
+    )
+    # Never download drivers; fail if no pinned or PATH chromedriver matches Chrome
+    DRIVER_OFFLINE: bool = os.getenv("DRIVER_OFFLINE", "false").strip().lower() == "true"
+
+    # --- Driver Lifecycle Configuration ---
+    # "fresh" starts a new browser per test, "pooled" reuses warm sessions per process/worker
+    DRIVER_MODE: str = os.getenv("DRIVER_MODE", "fresh").strip().lower()
+    # Pooled sessions are recycled after this many tests (0 = never)
+    DRIVER_POOL_MAX_USES: int = int(os.getenv("DRIVER_POOL_MAX_USES", "50").strip())
+    # Fresh drivers started in the background ahead of the next test (0 = start on demand)
+    DRIVER_PREFETCH_DEPTH: int = int(os.getenv("DRIVER_PREFETCH_DEPTH", "0").strip())
+    # Start each Chrome from a copy of a pre-warmed profile (cache, code cache, consent state)
+    PROFILE_TEMPLATE: bool = os.getenv("PROFILE_TEMPLATE", "false").strip().lower() == "true"
+    PROFILE_TEMPLATE_MAX_AGE_HOURS: float = float(os.getenv("PROFILE_TEMPLATE_MAX_AGE_HOURS", "24").strip())
+    # Paths (relative to TWITCH_URL) visited while building the template
+    PROFILE_TEMPLATE_WARMUP_PATHS: list[str] = [
+        path.strip() for path in os.getenv(
+            "PROFILE_TEMPLATE_WARMUP_PATHS", "/,/directory,/search?term=StarCraft%20II"
+        ).split(",") if path.strip()
+    ]
+
+    # --- Network Configuration ---
+    # Request blocking profile: full, no_third_party, no_media or lean (see utils/resource_profiles.py)
+    RESOURCE_PROFILE: str = os.getenv("RESOURCE_PROFILE", "full").strip().lower()
+    # Record Chrome DevTools network events (needed for blocked request reports)
+    PERFORMANCE_LOG: bool = os.getenv("PERFORMANCE_LOG", "false").strip().lower() == "true"
+    PERFORMANCE_LOG_MAX_EVENTS: int = int(os.getenv("PERFORMANCE_LOG_MAX_EVENTS", "20000").strip())
+
+    # --- Parallel Execution Configuration (pytest -n auto) ---
+    # Resources budgeted per worker (one Chrome each) when choosing the worker count
+    CHROME_MEMORY_MB: int = int(os.getenv("CHROME_MEMORY_MB", "1024").strip())
+    CPUS_PER_WORKER: float = float(os.getenv("CPUS_PER_WORKER", "1").strip())
+    # Upper bound on auto-selected workers (0 = no limit)
+    MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "0").strip())
+
     # --- Mobile Emulator Configuration ---
     # Must match Chrome built-in device names, e.g., "iPhone X", "iPhone 12", "Pixel 5"
     MOBILE_DEVICE: str = os.getenv("MOBILE_DEVICE", "iPhone X").strip()
@@ -23,12 +64,101 @@ class Config:
     # --- Screenshot Configuration ---
     SCREENSHOT_DIR: str = os.getenv("SCREENSHOT_DIR", "screenshots").strip()
     SCREENSHOT_FORMAT: str = os.getenv("SCREENSHOT_FORMAT", "png").strip()
+    # "sync" uses driver.save_screenshot, "cdp" captures over CDP and writes in the background
+    SCREENSHOT_MODE: str = os.getenv("SCREENSHOT_MODE", "sync").strip().lower()
+    # JPEG/WebP quality for CDP screenshots
+    SCREENSHOT_QUALITY: int = int(os.getenv("SCREENSHOT_QUALITY", "80").strip())
+    SCREENSHOT_WORKERS: int = int(os.getenv("SCREENSHOT_WORKERS", "2").strip())
+    # Max background writes in flight before take_screenshot blocks
+    SCREENSHOT_QUEUE_DEPTH: int = int(os.getenv("SCREENSHOT_QUEUE_DEPTH", "8").strip())
     
     # --- Wait Configuration ---
     EXPLICIT_WAIT: int = int(os.getenv("EXPLICIT_WAIT", "10").strip())
     POLLING_FREQUENCY: float = float(os.getenv("POLLING_FREQUENCY", "0.5").strip())
+    # "browser" waits inside the page on DOM mutations, "polling" uses WebDriverWait
+    WAIT_ENGINE: str = os.getenv("WAIT_ENGINE", "browser").strip().lower()
+    # Reuse located elements for clicks and typing until the page navigates or they go stale.
+# Saves WebDriver round trips only with WAIT_ENGINE=polling
+    ELEMENT_CACHE: bool = os.getenv("ELEMENT_CACHE", "false").strip().lower() == "true"
+    # Quiet period (no DOM changes or network activity) that ends a scroll without new items
+    SCROLL_QUIET_MS: int = int(os.getenv("SCROLL_QUIET_MS", "500").strip())
     
+    # --- Journey Configuration ---
+    # "ui" runs every journey step through the UI, "fast" deep-links steps not marked under_test
+    JOURNEY_MODE: str = os.getenv("JOURNEY_MODE", "ui").strip().lower()
+    # When pytest-rerunfailures can rerun a test (--reruns N or a flaky marker), checkpoint every
+    # journey step so the rerun resumes after the last completed one
+    JOURNEY_CHECKPOINTS: bool = os.getenv("JOURNEY_CHECKPOINTS", "true").strip().lower() == "true"
+
+    # --- Stand-in Server Configuration ---
+    # When enabled, the test session serves a local Twitch stand-in and points TWITCH_URL at it
+    STANDIN_SERVER: bool = os.getenv("STANDIN_SERVER", "false").strip().lower() == "true"
+    STANDIN_PORT: int = int(os.getenv("STANDIN_PORT", "0").strip())
+    STANDIN_LATENCY_MS: int = int(os.getenv("STANDIN_LATENCY_MS", "0").strip())
+    STANDIN_JITTER_MS: int = int(os.getenv("STANDIN_JITTER_MS", "0").strip())
+    STANDIN_CARD_COUNT: int = int(os.getenv("STANDIN_CARD_COUNT", "40").strip())
+    # Cards rendered per lazy-load batch; 0 renders all cards up front
+    STANDIN_LAZY_BATCH: int = int(os.getenv("STANDIN_LAZY_BATCH", "0").strip())
+    STANDIN_FAILURE_RATE: float = float(os.getenv("STANDIN_FAILURE_RATE", "0").strip())
+    # Regex of request paths eligible for injected failures; empty means all
+    STANDIN_FAILURE_PATHS: str = os.getenv("STANDIN_FAILURE_PATHS", "").strip()
+    STANDIN_GATE_RATIO: float = float(os.getenv("STANDIN_GATE_RATIO", "0.3").strip())
+    STANDIN_SPINNER_MS: int = int(os.getenv("STANDIN_SPINNER_MS", "500").strip())
+    # Optional local video file served as the stream; a generated audio loop (no frame metrics) is used otherwise
+    STANDIN_MEDIA_FILE: str = os.getenv("STANDIN_MEDIA_FILE", "").strip()
+
+    # --- Network Record/Replay Configuration (utils.network_replay) ---
+    # "live" uses the real site, "record" archives every response, "replay" serves them from the archive
+    NETWORK_MODE: str = os.getenv("NETWORK_MODE", "live").strip().lower()
+    NETWORK_ARCHIVE_DIR: str = os.getenv("NETWORK_ARCHIVE_DIR", "network_archive").strip()
+    # "fail" fails requests missing from the archive, "network" sends them to the live site
+    NETWORK_REPLAY_ON_MISS: str = os.getenv("NETWORK_REPLAY_ON_MISS", "fail").strip().lower()
+    # Replayed response delay: fixed ms plus this share of the recorded response time
+    NETWORK_REPLAY_LATENCY_MS: float = float(os.getenv("NETWORK_REPLAY_LATENCY_MS", "0").strip())
+    NETWORK_REPLAY_LATENCY_SCALE: float = float(os.getenv("NETWORK_REPLAY_LATENCY_SCALE", "0").strip())
+    # Answer a GraphQL request whose variables changed with a recording of the same operation
+    # instead of failing it (every operation POSTs to the same URL, so only the operation is matched)
+    NETWORK_REPLAY_LOOSE_MATCH: bool = os.getenv("NETWORK_REPLAY_LOOSE_MATCH", "false").strip().lower() == "true"
+    # Comma-separated query parameters ignored when matching requests (cache busters)
+    NETWORK_IGNORE_PARAMS: list[str] = [
+        param.strip() for param in os.getenv("NETWORK_IGNORE_PARAMS", "").split(",") if param.strip()
+    ]
+    # Larger response bodies are not recorded
+    NETWORK_MAX_BODY_KB: int = int(os.getenv("NETWORK_MAX_BODY_KB", "5120").strip())
+
+    # --- Playback Benchmark Configuration ---
+    PLAYBACK_BENCHMARK: bool = os.getenv("PLAYBACK_BENCHMARK", "false").strip().lower() == "true"
+    PLAYBACK_BENCHMARK_STREAMS: int = int(os.getenv("PLAYBACK_BENCHMARK_STREAMS", "5").strip())
+    PLAYBACK_OBSERVE_SECONDS: float = float(os.getenv("PLAYBACK_OBSERVE_SECONDS", "5").strip())
+
+    # --- Load Generator Configuration (python -m utils.load_generator) ---
+    LOAD_USERS: int = int(os.getenv("LOAD_USERS", "5").strip())
+    LOAD_RAMP_UP_SECONDS: float = float(os.getenv("LOAD_RAMP_UP_SECONDS", "30").strip())
+    LOAD_DURATION_SECONDS: float = float(os.getenv("LOAD_DURATION_SECONDS", "300").strip())
+    # Max journeys started per minute across all users (0 = unlimited)
+    LOAD_JOURNEYS_PER_MINUTE: float = float(os.getenv("LOAD_JOURNEYS_PER_MINUTE", "0").strip())
+
+    # --- Logging Configuration (utils.structured_logging) ---
+    # Level written to the console and logs/test_execution.jsonl
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+    # DEBUG records kept per test and written to logs/failed_tests/ only if it fails (0 = off)
+    LOG_TEST_BUFFER_RECORDS: int = int(os.getenv("LOG_TEST_BUFFER_RECORDS", "5000").strip())
+
     # --- Report Configuration ---
     REPORT_DIR: str = os.getenv("REPORT_DIR", "reports").strip()
+    # Record per-step timing spans (JSON + Chrome trace per test, p50/p95 summary)
+    STEP_TIMING: bool = os.getenv("STEP_TIMING", "false").strip().lower() == "true"
+    # Capture Navigation Timing, paint, long task and CDP metrics after navigations
+    PAGE_METRICS: bool = os.getenv("PAGE_METRICS", "false").strip().lower() == "true"
+    # Fail the test when a page object's PERFORMANCE_BUDGET is exceeded
+    PAGE_METRICS_ENFORCE_BUDGETS: bool = os.getenv("PAGE_METRICS_ENFORCE_BUDGETS", "true").strip().lower() == "true"
+    # Record a DOM snapshot after each journey step for offline locator checks (utils.locator_replay)
+    DOM_SNAPSHOTS: bool = os.getenv("DOM_SNAPSHOTS", "false").strip().lower() == "true"
+    # Save screenshot, DOM, console, URL and network log of failed tests as one zip (utils.failure_artifacts)
+    FAILURE_ARTIFACTS: bool = os.getenv("FAILURE_ARTIFACTS", "true").strip().lower() == "true"
+    # Total time spent collecting them; artifacts not ready in time are left out
+    FAILURE_ARTIFACT_BUDGET_S: float = float(os.getenv("FAILURE_ARTIFACT_BUDGET_S", "5").strip())
+    # Locators slower than this per call (µs) are flagged by utils.selector_profiler
+    SELECTOR_COST_WARN_US: float = float(os.getenv("SELECTOR_COST_WARN_US", "500").strip())
 
     # --- Add any other configs as needed ---
\ No newline at end of file
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import time
+from typing import Any
+from selenium.common.exceptions import InvalidSelectorException, TimeoutException
+from pages import browser_scripts
+from pages.base_page import ScrollResult
+from config.config import Config
+from utils.cdp_client import CDPError, CDPSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Page script errors meaning the document was replaced while the script ran
+NAVIGATION_ERRORS: tuple[str, ...] = ("Execution context was destroyed", "Cannot find context", "Inspected target navigated")
+
+
+class AsyncBasePage:
+    """
+    Async counterpart of BasePage, driving one tab over the Chrome DevTools Protocol.
+
+    Runs the same browser-side scripts as BasePage (pages.browser_scripts), so waits
+    and scrolling behave identically. Elements are addressed by locator (and index)
+    instead of WebElement handles; clicks and typing are sent as trusted input events.
+    Every method is a coroutine, so one event loop can drive many pages concurrently.
+    """
+
+    def __init__(self, session: CDPSession):
+        """
+        Initialize AsyncBasePage with a CDP page session.
+
+        Args:
+            session (CDPSession): Session from utils.cdp_client.AsyncBrowser.new_session().
+        """
+        self.session: CDPSession = session
+
+    async def go_to_link(self, url: str) -> None:
+        """
+        Navigate to the URL and wait for the load event.
+
+        Args:
+            url (str): The URL to navigate to.
+
+        Raises:
+            CDPError: If the navigation fails.
+        """
+        loaded = self.session.expect_event("Page.loadEventFired")
+        try:
+            result = await self.session.send("Page.navigate", url=url)
+            if result.get("errorText"):
+                raise CDPError(f"Navigation to {url} failed: {result['errorText']}")
+            await asyncio.wait_for(loaded, Config.PAGE_LOAD_TIMEOUT)
+        finally:
+            loaded.cancel()
+
+    async def run_script(self, script: str, *args: Any) -> Any:
+        """
+        Run a script written for `execute_script` (reads `arguments`, returns a value).
+
+        Args:
+            script (str): Script body.
+            *args (Any): JSON-serializable arguments.
+
+        Returns:
+            Any: The returned value, serialized by value.
+        """
+        return await self.session.evaluate(f"(function () {{ {script} }}).apply(null, {json.dumps(args)})")
+
+    async def run_async_script(self, script: str, *args: Any, timeout: float | None = None) -> Any:
+        """
+        Run a script written for `execute_async_script` (calls its last argument with the result).
+
+        Args:
+            script (str): Script body.
+            *args (Any): JSON-serializable arguments.
+            timeout (float | None): Max seconds to wait for the callback.
+
+        Returns:
+            Any: The value passed to the callback, serialized by value.
+        """
+        expression = (
+            f"new Promise(function (resolve) {{ (function () {{ {script} }})"
+            f".apply(null, {json.dumps(args)}.concat([resolve])); }})"
+        )
+        return await self.session.evaluate(expression, await_promise=True, timeout=timeout)
+
+    async def _wait_for(
+        self,
+        locator: tuple[str, str],
+        condition: str,
+        timeout: int | float | None = None,
+        count: int = 1
+    ) -> Any:
+        """
+        Wait for a locator condition inside the page (see BasePage._wait_for).
+
+        Args:
+            locator (tuple[str, str]): Locator tuple (By, value).
+            condition (str): present, present_all, visible, clickable, invisible or count.
+            timeout (int | float | None): Max wait time in seconds.
+            count (int): Minimum number of elements for the "count" condition.
+
+        Returns:
+            Any: The script result value (DOM nodes are serialized as empty objects).
+
+        Raises:
+            TimeoutException: If the condition is not met within the timeout.
+            InvalidSelectorException: If the locator cannot be evaluated in the page.
+        """
+        wait_time = timeout or Config.EXPLICIT_WAIT
+        query = browser_scripts.to_browser_query(locator)
+        if not query:
+            raise InvalidSelectorException(f"Locator cannot be evaluated in the page: {locator}")
+        deadline = time.monotonic() + wait_time
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                result = await self.run_async_script(
+                    browser_scripts.WAIT_FOR_CONDITION, query[0], query[1], condition, count,
+                    int(remaining * 1000), timeout=remaining + 5,
+                )
+            except CDPError as e:
+                if not any(message in str(e) for message in NAVIGATION_ERRORS):
+                    raise
+                # The page navigated while waiting; wait again in the new document
+                logger.debug("Wait script interrupted, retrying: %s", e)
+                await asyncio.sleep(0.05)
+                continue
+            if result and result.get("ok"):
+                return result["value"]
+            if result and result.get("error"):
+                raise InvalidSelectorException(f"Cannot evaluate locator {locator}: {result['error']}")
+            break
+        raise TimeoutException(f"Timed out after {wait_time}s waiting for {condition}: {locator}")
+
+    async def wait_for_element_to_be_invisible(
+        self, locator: tuple[str, str], timeout: int | float | None = None
+    ) -> bool:
+        """Wait until the element is invisible or absent."""
+        return await self._wait_for(locator, "invisible", timeout)
+
+    async def wait_for_visible_element(self, locator: tuple[str, str], timeout: int | float | None = None) -> None:
+        """Wait until the first matching element is visible."""
+        await self._wait_for(locator, "visible", timeout)
+
+    async def wait_for_clickable_element(self, locator: tuple[str, str], timeout: int | float | None = None) -> None:
+        """Wait until the first matching element is visible and enabled."""
+        await self._wait_for(locator, "clickable", timeout)
+
+    async def wait_for_element_count(
+        self, locator: tuple[str, str], count: int, timeout: int | float | None = None
+    ) -> int:
+        """
+        Wait until at least `count` elements match the locator.
+
+        Returns:
+            int: Number of matching elements.
+        """
+        return len(await self._wait_for(locator, "count", timeout, count))
+
+    async def click_element(
+        self, locator: tuple[str, str], timeout: int | float | None = None, index: int = 0
+    ) -> None:
+        """
+        Click an element with trusted mouse events, waiting until the first match is clickable.
+
+        Args:
+            locator (tuple[str, str]): Element locator.
+            timeout (int | float | None): Wait timeout in seconds.
+            index (int): Which match to click.
+
+        Raises:
+            Exception: If the element cannot be clicked.
+        """
+        await self.wait_for_clickable_element(locator, timeout)
+        kind, query = browser_scripts.to_browser_query(locator)
+        center = await self.run_script(browser_scripts.ELEMENT_CENTER, kind, query, index)
+        if not center:
+            raise Exception(f"No element {index} to click for {locator}")
+        for event_type in ("mouseMoved", "mousePressed", "mouseReleased"):
+            await self.session.send(
+                "Input.dispatchMouseEvent", type=event_type, x=center["x"], y=center["y"],
+                button="left", clickCount=0 if event_type == "mouseMoved" else 1,
+            )
+        logger.info("Clicked element: %s[%s]", locator, index)
+
+    async def set_text_field(self, locator: tuple[str, str], text: str, timeout: int | float | None = None) -> None:
+        """
+        Clear and type into a text field, then press RETURN.
+
+        Args:
+            locator (tuple[str, str]): Element locator.
+            text (str): Text to enter.
+            timeout (int | float | None): Wait timeout in seconds.
+        """
+        await self.wait_for_visible_element(locator, timeout)
+        kind, query = browser_scripts.to_browser_query(locator)
+        await self.run_script(browser_scripts.ELEMENT_CENTER, kind, query, 0)
+        await self.run_script(
+            "var el = arguments[0] === 'css' ? document.querySelector(arguments[1]) : document.evaluate("
+            "arguments[1], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;"
+            "el.focus(); el.value = ''; el.dispatchEvent(new Event('input', {bubbles: true}));",
+            kind, query,
+        )
+        await self.session.send("Input.insertText", text=text)
+        for event_type in ("keyDown", "keyUp"):
+            await self.session.send(
+                "Input.dispatchKeyEvent", type=event_type, key="Enter", code="Enter",
+                windowsVirtualKeyCode=13, **({"text": "\r"} if event_type == "keyDown" else {}),
+            )
+        logger.info("Sent keys '%s' to element: %s", text, locator)
+
+    async def scroll_until_loaded(
+        self,
+        locator: tuple[str, str],
+        target_count: int = 0,
+        max_scrolls: int = 10,
+        step_px: int = 0,
+        timeout: int | float | None = None
+    ) -> ScrollResult:
+        """Scroll an infinite list until enough items are loaded (see BasePage.scroll_until_loaded)."""
+        wait_time = timeout or Config.EXPLICIT_WAIT
+        kind, query = browser_scripts.to_browser_query(locator)
+        data = await self.run_async_script(
+            browser_scripts.SCROLL_AND_WAIT_FOR_ITEMS, kind, query, target_count, max_scrolls,
+            step_px, Config.SCROLL_QUIET_MS, int(wait_time * 1000), timeout=wait_time + 5,
+        )
+        return ScrollResult(data["count"], data["loaded"], data["reason"])
+
+    async def get_current_url(self) -> str:
+        """Get the current page URL."""
+        return await self.session.evaluate("location.href")
+
+    async def get_page_title(self) -> str:
+        """Get the current page title."""
+        return await self.session.evaluate("document.title")
@@ -0,0 +1,221 @@
+"""
+Async page objects driven over CDP (see pages.async_base_page).
+
+Locators are taken from the sync page objects, so each selector is defined once.
+"""
+import random
+from functools import cached_property
+from typing import Callable
+from urllib.parse import quote_plus
+from pages import browser_scripts
+from pages.async_base_page import AsyncBasePage
+from pages.base_page import ScrollResult
+from pages.browse_page import BrowsePage
+from pages.navigation_bar import NavigationBar
+from pages.search_results_page import (
+    SearchResultsPage, StreamerCard, StreamerInfo, streamer_cards_from_columns
+)
+from pages.stream_page import StreamPage
+from config.config import Config
+from utils.cdp_client import CDPSession
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNavigationBar(AsyncBasePage):
+    """Async page object for Twitch navigation bar actions."""
+
+    CREATOR_BTN: tuple = NavigationBar.CREATOR_BTN
+    BROWSE_BTN: tuple = NavigationBar.BROWSE_BTN
+    ACTIVITY_BTN: tuple = NavigationBar.ACTIVITY_BTN
+    PROFILE_BTN: tuple = NavigationBar.PROFILE_BTN
+
+    async def go_to_creator(self) -> None:
+        """Navigate to creator page."""
+        await self.click_element(self.CREATOR_BTN)
+
+    async def go_to_browse(self) -> None:
+        """Navigate to browse page."""
+        await self.click_element(self.BROWSE_BTN)
+
+    async def go_to_activity(self) -> None:
+        """Navigate to activity page."""
+        await self.click_element(self.ACTIVITY_BTN)
+
+    async def go_to_profile(self) -> None:
+        """Navigate to profile page."""
+        await self.click_element(self.PROFILE_BTN)
+
+
+class AsyncHomePage(AsyncBasePage):
+    """Async page object for Twitch homepage."""
+
+    def __init__(self, session: CDPSession):
+        """
+        Initialize the AsyncHomePage object.
+
+        Args:
+            session (CDPSession): CDP page session.
+        """
+        super().__init__(session)
+        self.url: str = Config.TWITCH_URL
+
+    @cached_property
+    def navigation_bar(self) -> AsyncNavigationBar:
+        """Return an AsyncNavigationBar scoped to this session."""
+        return AsyncNavigationBar(self.session)
+
+    async def navigate_to_home_page(self) -> None:
+        """Navigate to Twitch homepage."""
+        await self.go_to_link(self.url)
+        logger.info("Navigated to Twitch homepage.")
+
+
+class AsyncBrowsePage(AsyncBasePage):
+    """Async page object for search functionality on Twitch Browse page."""
+
+    SEARCH_INPUT_SELECTOR: tuple[str, str] = BrowsePage.SEARCH_INPUT_SELECTOR
+
+    def __init__(self, session: CDPSession):
+        """
+        Initialize the AsyncBrowsePage object.
+
+        Args:
+            session (CDPSession): CDP page session.
+        """
+        super().__init__(session)
+        self.url: str = Config.TWITCH_URL + "/directory"
+
+    async def perform_search(self, search_term: str) -> None:
+        """
+        Perform a search with the given term.
+
+        Args:
+            search_term (str): The term to search for.
+        """
+        logger.info("Entering search term: '%s'...", search_term)
+        await self.set_text_field(self.SEARCH_INPUT_SELECTOR, search_term)
+
+
+class AsyncSearchResultsPage(AsyncBasePage):
+    """Async page object for search results page on Twitch."""
+
+    STREAMER_CARD: tuple = SearchResultsPage.STREAMER_CARD
+    STREAM_TITLE: tuple = SearchResultsPage.STREAM_TITLE
+
+    def __init__(self, session: CDPSession):
+        """
+        Initialize AsyncSearchResultsPage.
+
+        Args:
+            session (CDPSession): CDP page session.
+        """
+        super().__init__(session)
+        self.url: str = Config.TWITCH_URL + "/search?term="
+
+    async def navigate_to_search_page(self, search_term: str) -> None:
+        """
+        Navigate to Twitch search results page for a term.
+
+        Args:
+            search_term (str): The search keyword.
+        """
+        await self.go_to_link(self.url + quote_plus(search_term))
+        logger.info("Navigated to Twitch search page")
+
+    async def wait_for_search_results_load(self, timeout: int = 15) -> None:
+        """Wait for the first streamer card to be visible."""
+        await self.wait_for_visible_element(self.STREAMER_CARD, timeout)
+        logger.info("Search results loaded")
+
+    async def scroll_down_twice(self) -> ScrollResult:
+        """Scroll down twice, waiting only until new cards appear or the page goes quiet."""
+        return await self.scroll_until_loaded(self.STREAMER_CARD, max_scrolls=2, step_px=400)
+
+    async def get_streamer_cards(self) -> list[StreamerCard]:
+        """
+        Read every streamer card in one script execution.
+
+        Returns:
+            list[StreamerCard]: One record per card, in document order. Element handles
+            do not cross CDP, so `element` is None; click a card by its position.
+        """
+        kind, query = browser_scripts.to_browser_query(self.STREAMER_CARD)
+        title_kind, title_query = browser_scripts.to_browser_query(self.STREAM_TITLE)
+        columns = await self.run_script(
+            browser_scripts.EXTRACT_STREAMER_CARDS, kind, query, title_kind, title_query, None
+        )
+        return streamer_cards_from_columns(columns)
+
+    async def select_random_streamer(
+        self, predicate: Callable[[StreamerCard], bool] | None = None
+    ) -> StreamerInfo:
+        """
+        Click a random streamer card that is clickable in the viewport.
+
+        Args:
+            predicate (Callable[[StreamerCard], bool] | None): Keep only matching cards.
+
+        Returns:
+            StreamerInfo: Information of the chosen card.
+
+        Raises:
+            Exception: If no matching card is found.
+        """
+        candidates = [
+            (index, card) for index, card in enumerate(await self.get_streamer_cards())
+            if card.clickable and (predicate is None or predicate(card))
+        ]
+        if not candidates:
+            raise Exception("No streamer cards matching the criteria found on the page")
+        index, selected = random.choice(candidates)
+        streamer_info = selected.to_info()
+        await self.click_element(self.STREAMER_CARD, index=index)
+        logger.info("Selected streamer: %s", streamer_info)
+        return streamer_info
+
+
+class AsyncStreamPage(AsyncBasePage):
+    """Async page object for a Twitch streamer page."""
+
+    VIDEO_SOURCE: tuple = StreamPage.VIDEO_SOURCE
+    LOADING_SPINNER: tuple = StreamPage.LOADING_SPINNER
+    CONTENT_CLASSIFICATION_GATE_OVERLAY: tuple = StreamPage.CONTENT_CLASSIFICATION_GATE_OVERLAY
+    CONTENT_CLASSIFICATION_GATE_OVERLAY_START_WATCHING_BUTTON: tuple = \
+        StreamPage.CONTENT_CLASSIFICATION_GATE_OVERLAY_START_WATCHING_BUTTON
+
+    def __init__(self, session: CDPSession):
+        """
+        Initialize AsyncStreamPage.
+
+        Args:
+            session (CDPSession): CDP page session.
+        """
+        super().__init__(session)
+        self.url: str = Config.TWITCH_URL
+
+    async def navigate_to_streamer_page(self, streamer_name: str) -> None:
+        """
+        Navigate to a Twitch streamer page by streamer name.
+
+        Args:
+            streamer_name (str): The Twitch username of the streamer (without slash).
+        """
+        await self.go_to_link(self.url + "/" + streamer_name.lstrip("/"))
+        logger.info("Navigated to Twitch streamer page: %s", streamer_name)
+
+    async def handle_streamer_popups(self, timeout: int = 5) -> None:
+        """Click through the content classification gate if it appears."""
+        try:
+            await self.wait_for_visible_element(self.CONTENT_CLASSIFICATION_GATE_OVERLAY, timeout)
+            await self.click_element(self.CONTENT_CLASSIFICATION_GATE_OVERLAY_START_WATCHING_BUTTON)
+            logger.info("Content classification gate overlay handled - clicked 'Start Watching'")
+        except Exception:
+            logger.debug("No content classification gate overlay found.")
+
+    async def wait_for_video_load(self, timeout: int = 10) -> None:
+        """Wait for the spinner to disappear and the video element to be visible."""
+        await self.wait_for_element_to_be_invisible(self.LOADING_SPINNER, timeout)
+        await self.wait_for_visible_element(self.VIDEO_SOURCE, timeout)
+        logger.info("Video player loaded successfully")
@@ -1,17 +1,61 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+from weakref import WeakKeyDictionary
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    InvalidSelectorException,
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.remote.webdriver import WebDriver
+from pages import browser_scripts
+from pages.element_cache import ElementCache
 from config.config import Config
+from utils.step_timer import timed_step
+from utils.page_metrics import PageMetricsRecorder
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Fallback conditions used by the polling engine (and for locators the browser engine cannot run)
+POLLING_CONDITIONS = {
+    "present": EC.presence_of_element_located,
+    "present_all": EC.presence_of_all_elements_located,
+    "visible": EC.visibility_of_element_located,
+    "clickable": EC.element_to_be_clickable,
+    "invisible": EC.invisibility_of_element_located,
+}
+
+# Script timeout currently set on each driver, so it is only raised when a wait needs more
+_script_timeouts: "WeakKeyDictionary[WebDriver, float]" = WeakKeyDictionary()
+DEFAULT_SCRIPT_TIMEOUT: float = 30
+# Document key reported by the last browser-engine wait on each driver, for the element cache
+_wait_documents: "WeakKeyDictionary[WebDriver, str]" = WeakKeyDictionary()
+
+@dataclass
+class ScrollResult:
+    """Outcome of BasePage.scroll_until_loaded."""
+
+    count: int
+    loaded_per_scroll: list[int] = field(default_factory=list)
+    # target, end, max_scrolls or timeout
+    reason: str = "max_scrolls"
+
 class BasePage:
     """Base class for all Page Objects in the UI automation framework."""
 
+    # Page metric limits checked when PAGE_METRICS is enabled; override in a page object whose limits differ.
+    # Keys are the summary names produced by utils.page_metrics.PageMetricsRecorder.
+    PERFORMANCE_BUDGET: dict[str, float] = {"largest_contentful_paint_ms": 4000}
+
     def __init__(self, driver: WebDriver):
         """
         Initialize BasePage with a Selenium WebDriver.
@@ -21,6 +65,7 @@ class BasePage:
         """
         self.driver: WebDriver = driver
 
+    @timed_step()
     def go_to_link(self, url: str) -> None:
         """
         Navigate browser to the specified URL.
@@ -28,8 +73,16 @@ class BasePage:
         Args:
             url (str): The URL to navigate to.
         """
+        recorder = PageMetricsRecorder.current()
+        if recorder:
+            recorder.prepare(self.driver)
+        if Config.ELEMENT_CACHE:
+            self.element_cache.invalidate()
         self.driver.get(url)
+        if recorder:
+            recorder.capture(self, "navigation")
 
+    @timed_step()
     def wait_for_element_to_be_invisible(
         self, locator: tuple[str, str], timeout: int | float | None = None
     ) -> bool:
@@ -46,10 +99,9 @@ class BasePage:
         Raises:
             TimeoutException: If element does not become invisible in time.
         """
-        wait_time = timeout or Config.EXPLICIT_WAIT
-        wait = WebDriverWait(self.driver, wait_time)
-        return wait.until(EC.invisibility_of_element_located(locator))
+        return self._wait_for(locator, "invisible", timeout)
 
+    @timed_step()
     def wait_and_get_present_element(
         self, locator: tuple[str, str], timeout: int | float | None = None
     ) -> WebElement:
@@ -63,10 +115,9 @@ class BasePage:
         Returns:
             WebElement: The located element.
         """
-        wait_time = timeout or Config.EXPLICIT_WAIT
-        wait = WebDriverWait(self.driver, wait_time)
-        return wait.until(EC.presence_of_element_located(locator))
+        return self._wait_for(locator, "present", timeout)
 
+    @timed_step()
     def wait_and_get_visible_element(
         self, locator: tuple[str, str], timeout: int | float | None = None
     ) -> WebElement:
@@ -80,10 +131,9 @@ class BasePage:
         Returns:
             WebElement: The visible element.
         """
-        wait_time = timeout or Config.EXPLICIT_WAIT
-        wait = WebDriverWait(self.driver, wait_time)
-        return wait.until(EC.visibility_of_element_located(locator))
+        return self._wait_for(locator, "visible", timeout)
 
+    @timed_step()
     def wait_and_get_clickable_element(
         self, locator: tuple[str, str], timeout: int | float | None = None
     ) -> WebElement:
@@ -97,10 +147,9 @@ class BasePage:
         Returns:
             WebElement: The clickable element.
         """
-        wait_time = timeout or Config.EXPLICIT_WAIT
-        wait = WebDriverWait(self.driver, wait_time)
-        return wait.until(EC.element_to_be_clickable(locator))
+        return self._wait_for(locator, "clickable", timeout)
 
+    @timed_step()
     def wait_and_get_present_elements(
         self, locator: tuple[str, str], timeout: int | float | None = None
     ) -> list[WebElement]:
@@ -114,10 +163,146 @@ class BasePage:
         Returns:
             list[WebElement]: List of present elements.
         """
+        return self._wait_for(locator, "present_all", timeout)
+
+    @timed_step()
+    def wait_for_element_count(
+        self, locator: tuple[str, str], count: int, timeout: int | float | None = None
+    ) -> list[WebElement]:
+        """
+        Wait until at least `count` elements matching the locator are present.
+
+        Args:
+            locator (tuple[str, str]): Locator tuple (By, value).
+            count (int): Minimum number of elements.
+            timeout (int | float | None): Max wait time in seconds.
+
+        Returns:
+            list[WebElement]: All matching elements.
+
+        Raises:
+            TimeoutException: If fewer than `count` elements are present in time.
+        """
+        return self._wait_for(locator, "count", timeout, count)
+
+    def _wait_for(
+        self,
+        locator: tuple[str, str],
+        condition: str,
+        timeout: int | float | None = None,
+        count: int = 1
+    ) -> Any:
+        """
+        Wait for a locator condition using the configured wait engine.
+
+        The "browser" engine evaluates the condition inside the page, re-checking it on
+        every DOM mutation, so a wait costs one WebDriver round trip and resolves within
+        milliseconds of the change. The "polling" engine uses WebDriverWait.
+
+        Args:
+            locator (tuple[str, str]): Locator tuple (By, value).
+            condition (str): present, present_all, visible, clickable, invisible or count.
+            timeout (int | float | None): Max wait time in seconds.
+            count (int): Minimum number of elements for the "count" condition.
+
+        Returns:
+            Any: The element, list of elements or True, depending on the condition.
+
+        Raises:
+            TimeoutException: If the condition is not met within the timeout.
+        """
         wait_time = timeout or Config.EXPLICIT_WAIT
-        wait = WebDriverWait(self.driver, wait_time)
-        return wait.until(EC.presence_of_all_elements_located(locator))
+        query = browser_scripts.to_browser_query(locator)
+        if Config.WAIT_ENGINE == "browser" and query:
+            result = self._wait_in_browser(query, locator, condition, wait_time, count)
+            self._capture_page_metrics()
+            return result
+
+        if condition == "count":
+            def expected(driver: WebDriver) -> list[WebElement] | bool:
+                elements = driver.find_elements(*locator)
+                return elements if len(elements) >= count else False
+        else:
+            expected = POLLING_CONDITIONS[condition](locator)
+        wait = WebDriverWait(self.driver, wait_time, poll_frequency=Config.POLLING_FREQUENCY)
+        with self._implicit_wait_disabled():
+            result = wait.until(expected, f"Timed out after {wait_time}s waiting for {condition}: {locator}")
+        self._capture_page_metrics()
+        return result
+
+    def _wait_in_browser(
+        self,
+        query: tuple[str, str],
+        locator: tuple[str, str],
+        condition: str,
+        wait_time: int | float,
+        count: int
+    ) -> Any:
+        """
+        Run the wait engine script, retrying if a navigation replaces the document.
+
+        Args:
+            query (tuple[str, str]): Browser query from browser_scripts.to_browser_query.
+            locator (tuple[str, str]): Original locator, for error messages.
+            condition (str): Wait condition name.
+            wait_time (int | float): Max wait time in seconds.
+            count (int): Minimum element count for the "count" condition.
+
+        Returns:
+            Any: The value resolved by the script.
+
+        Raises:
+            TimeoutException: If the condition is not met within the timeout.
+            InvalidSelectorException: If the page cannot evaluate the locator.
+        """
+        deadline = time.monotonic() + wait_time
+        self._ensure_script_timeout(wait_time + 5)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                result = self.driver.execute_async_script(
+                    browser_scripts.WAIT_FOR_CONDITION, query[0], query[1], condition, count, int(remaining * 1000)
+                )
+            except JavascriptException as e:
+                # The page navigated while waiting; wait again in the new document
+                logger.debug("Wait script interrupted, retrying: %s", e.msg)
+                time.sleep(0.05)
+                continue
+            if result and result.get("ok"):
+                _wait_documents[self.driver] = result["document"]
+                return result["value"]
+            if result and result.get("error"):
+                raise InvalidSelectorException(f"Cannot evaluate locator {locator}: {result['error']}")
+            break
+        raise TimeoutException(f"Timed out after {wait_time}s waiting for {condition}: {locator}")
+
+    def _capture_page_metrics(self) -> None:
+        """Capture page metrics if a new document or SPA route was reached and capture is enabled."""
+        recorder = PageMetricsRecorder.current()
+        if recorder:
+            recorder.capture(self, "interaction")
+
+    def _ensure_script_timeout(self, seconds: float) -> None:
+        """Raise the driver's async script timeout if a wait needs longer."""
+        if _script_timeouts.get(self.driver, DEFAULT_SCRIPT_TIMEOUT) < seconds:
+            self.driver.set_script_timeout(seconds)
+            _script_timeouts[self.driver] = seconds
+
+    @contextmanager
+    def _implicit_wait_disabled(self) -> Iterator[None]:
+        """Temporarily disable the implicit wait so explicit polling is not stalled by it."""
+        if not Config.IMPLICIT_WAIT:
+            yield
+            return
+        self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            self.driver.implicitly_wait(Config.IMPLICIT_WAIT)
 
+    @timed_step()
     def get_visible_elements(
         self, locator: tuple[str, str], timeout: int | float | None = None
     ) -> list[WebElement]:
@@ -133,8 +318,9 @@ class BasePage:
         """
         wait_time = timeout or Config.EXPLICIT_WAIT
         present_elements = self.wait_and_get_present_elements(locator, wait_time)
-        return [element for element in present_elements if element.is_displayed()]
+        return self.filter_elements(present_elements, displayed=True)
 
+    @timed_step()
     def get_clickable_elements(
         self, locator: tuple[str, str], timeout: int | float | None = None
     ) -> list[WebElement]:
@@ -150,11 +336,40 @@ class BasePage:
         """
         wait_time = timeout or Config.EXPLICIT_WAIT
         present_elements = self.wait_and_get_present_elements(locator, wait_time)
-        return [
-            el for el in present_elements
-            if el.is_displayed() and el.is_enabled() and self.is_element_in_viewport(el)
-        ]
+        return self.filter_elements(present_elements, displayed=True, enabled=True, in_viewport=True)
 
+    @timed_step()
+    def filter_elements(
+        self,
+        elements: list[WebElement],
+        displayed: bool = True,
+        enabled: bool = False,
+        in_viewport: bool = False
+    ) -> list[WebElement]:
+        """
+        Filter elements by state with a single browser-side script.
+
+        All checks for the whole list run in one `execute_script` call instead of
+        several WebDriver round trips per element.
+
+        Args:
+            elements (list[WebElement]): Elements to filter.
+            displayed (bool): Keep only displayed elements.
+            enabled (bool): Keep only enabled elements.
+            in_viewport (bool): Keep only elements fully within the viewport.
+
+        Returns:
+            list[WebElement]: Elements matching all requested checks, in original order.
+        """
+        if not elements:
+            return []
+        return self.driver.execute_script(
+            browser_scripts.FILTER_ELEMENTS,
+            elements,
+            {"displayed": displayed, "enabled": enabled, "inViewport": in_viewport},
+        )
+
+    @timed_step()
     def click_element(
         self, element: tuple[str, str] | WebElement, timeout: int | float | None = None
     ) -> None:
@@ -169,13 +384,16 @@ class BasePage:
             Exception: If element cannot be clicked.
         """
         try:
-            el = self.wait_and_get_clickable_element(element, timeout) if isinstance(element, tuple) else element
-            el.click()
-            logger.info(f"Clicked element: {el}")
+            el = self._use_element(
+                element, self.wait_and_get_clickable_element, timeout, lambda target: target.click()
+            )
+            logger.info("Clicked element: %s", el)
         except Exception as e:
-            logger.error(f"Failed to click element {element}: {str(e)}")
+            logger.error("Failed to click element %s: %s", element, str(e))
             raise
+        self._capture_page_metrics()
 
+    @timed_step()
     def set_text_field(
         self, element: tuple[str, str] | WebElement, text: str, timeout: int | float | None = None
     ) -> None:
@@ -190,15 +408,98 @@ class BasePage:
         Raises:
             Exception: If text cannot be entered.
         """
-        el = self.wait_and_get_visible_element(element, timeout) if isinstance(element, tuple) else element
+        def type_text(target: WebElement) -> None:
+            target.clear()
+            target.send_keys(text)
+            target.send_keys(Keys.RETURN)
+
         try:
-            el.clear()
-            el.send_keys(text)
-            el.send_keys(Keys.RETURN)
-            logger.info(f"Sent keys '{text}' to element: {el}")
+            el = self._use_element(element, self.wait_and_get_visible_element, timeout, type_text)
+            logger.info("Sent keys '%s' to element: %s", text, el)
         except Exception as e:
-            logger.error(f"Failed to send keys to element {el}: {str(e)}")
+            logger.error("Failed to send keys to element %s: %s", element, str(e))
             raise
+        self._capture_page_metrics()
+
+    @property
+    def element_cache(self) -> ElementCache:
+        """Return the element handle cache shared by page objects on this driver."""
+        return ElementCache.for_driver(self.driver)
+
+    def _use_element(
+        self,
+        element: tuple[str, str] | WebElement,
+        locate: Callable[[tuple[str, str], int | float | None], WebElement],
+        timeout: int | float | None,
+        action: Callable[[WebElement], None]
+    ) -> WebElement:
+        """
+        Run an action on an element, locating it first if a locator is given.
+
+        With Config.ELEMENT_CACHE, a handle cached for the locator is checked with one
+        script (browser_scripts.CACHED_ELEMENT_CHECK) instead of waiting and locating
+        it again. It is used only if the document is the one it was found in and it is
+        still displayed and enabled; otherwise it is dropped (the whole cache, if the
+        document changed) and the element is located again. Stale, non-interactable
+        and intercepted handles found while acting are handled the same way.
+
+        A hit replaces the locating wait with that check. With WAIT_ENGINE=polling,
+        locating takes several WebDriver commands, so every hit saves round trips.
+        With the default browser engine, locating is already one script, so a hit
+        costs the same single round trip (only the in-page query is skipped) and a
+        handle dropped by its check costs one extra; the cache pays off only with
+        the polling engine.
+
+        Args:
+            element (tuple[str, str] | WebElement): Element locator or WebElement.
+            locate (Callable): Wait method used to locate the element, e.g. wait_and_get_clickable_element.
+            timeout (int | float | None): Wait timeout in seconds.
+            action (Callable[[WebElement], None]): Action to perform.
+
+        Returns:
+            WebElement: The element the action was performed on.
+        """
+        if not isinstance(element, tuple):
+            action(element)
+            return element
+        if not Config.ELEMENT_CACHE:
+            el = locate(element, timeout)
+            action(el)
+            return el
+        cache = self.element_cache
+        cached = cache.get(element)
+        if cached is not None:
+            try:
+                check = self._check_cached_element(cached)
+                if check["document"] != cache.document:
+                    logger.debug("Document changed since %s was cached, invalidating cache", element)
+                    cache.invalidate(stale=True)
+                elif not check["usable"]:
+                    logger.debug("Cached element is no longer displayed and enabled, locating it again: %s", element)
+                    cache.discard(element)
+                else:
+                    action(cached)
+                    cache.hits += 1
+                    return cached
+            except StaleElementReferenceException:
+                logger.debug("Cached element is stale, invalidating cache: %s", element)
+                cache.invalidate(stale=True)
+            except (ElementNotInteractableException, ElementClickInterceptedException):
+                logger.debug("Cached element is not interactable, locating it again: %s", element)
+                cache.discard(element)
+        _wait_documents.pop(self.driver, None)
+        el = locate(element, timeout)
+        # The browser wait engine reports the document with the element; the polling engine needs a check
+        document = _wait_documents.pop(self.driver, None) or self._check_cached_element(el)["document"]
+        cache.put(element, el, document)
+        action(el)
+        return el
+
+    def _check_cached_element(self, element: WebElement) -> dict:
+        """Return the current document key and whether the element is displayed and enabled."""
+        return self.driver.execute_script(
+            browser_scripts.CACHED_ELEMENT_CHECK, element, {"displayed": True, "enabled": True}
+        )
 
     def is_element_in_viewport(self, element: WebElement) -> bool:
         """
@@ -210,19 +511,9 @@ class BasePage:
         Returns:
             bool: True if element is in viewport, False otherwise.
         """
-        rect = self.driver.execute_script("""
-            var r = arguments[0].getBoundingClientRect();
-            return {left: r.left, top: r.top, right: r.right, bottom: r.bottom};
-        """, element)
-        window_width: int = self.driver.execute_script("return window.innerWidth;")
-        window_height: int = self.driver.execute_script("return window.innerHeight;")
-        return (
-            rect['top'] >= 0 and
-            rect['left'] >= 0 and
-            rect['bottom'] <= window_height and
-            rect['right'] <= window_width
-        )
+        return bool(self.filter_elements([element], displayed=False, in_viewport=True))
 
+    @timed_step()
     def scroll(
         self,
         x_pixels: int = 0,
@@ -248,8 +539,55 @@ class BasePage:
             if sleep_per_step > 0:
                 time.sleep(sleep_per_step)
         logger.info(
-            f"Scrolled by ({x_pixels}, {y_pixels}) pixels over {steps} steps in {duration}s"
+            "Scrolled by (%s, %s) pixels over %s steps in %ss", x_pixels, y_pixels, steps, duration
+        )
+
+    @timed_step()
+    def scroll_until_loaded(
+        self,
+        locator: tuple[str, str],
+        target_count: int = 0,
+        max_scrolls: int = 10,
+        step_px: int = 0,
+        timeout: int | float | None = None
+    ) -> ScrollResult:
+        """
+        Scroll an infinite list until enough items are loaded or the list ends.
+
+        After each scroll the browser waits until new matches for the locator are
+        inserted or the page goes quiet (no DOM changes or finished resource loads for
+        Config.SCROLL_QUIET_MS), instead of sleeping for a fixed time.
+        The whole loop runs in one script call.
+
+        Args:
+            locator (tuple[str, str]): Locator of the list items.
+            target_count (int): Stop once this many items exist (0 = no target).
+            max_scrolls (int): Maximum number of scrolls.
+            step_px (int): Pixels per scroll (0 = 90% of the viewport height).
+            timeout (int | float | None): Max total time in seconds.
+
+        Returns:
+            ScrollResult: Final item count, items loaded by each scroll and why scrolling stopped.
+
+        Raises:
+            InvalidSelectorException: If the locator cannot be evaluated in the page.
+        """
+        wait_time = timeout or Config.EXPLICIT_WAIT
+        query = browser_scripts.to_browser_query(locator)
+        if not query:
+            raise InvalidSelectorException(f"Locator cannot be evaluated in the page: {locator}")
+        self._ensure_script_timeout(wait_time + 5)
+        data = self.driver.execute_async_script(
+            browser_scripts.SCROLL_AND_WAIT_FOR_ITEMS, query[0], query[1], target_count,
+            max_scrolls, step_px, Config.SCROLL_QUIET_MS, int(wait_time * 1000)
+        )
+        result = ScrollResult(data["count"], data["loaded"], data["reason"])
+        logger.info(
+            "Scrolled %s times for %s: %s items, loaded per scroll %s, stopped on %s",
+            len(result.loaded_per_scroll), locator, result.count, result.loaded_per_scroll, result.reason
         )
+        self._capture_page_metrics()
+        return result
 
     def get_current_url(self) -> str:
         """
@@ -1,3 +1,4 @@
+from functools import cached_property
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webdriver import WebDriver
@@ -5,6 +6,7 @@ from selenium.webdriver.remote.webelement import WebElement
 from pages.base_page import BasePage
 from pages.navigation_bar import NavigationBar
 from config.config import Config
+from utils.step_timer import timed_step
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,7 +15,7 @@ class BrowsePage(BasePage):
     """Page object for search functionality on Twitch Browse page."""
 
     SEARCH_INPUT_SELECTOR: tuple[str, str] = (By.CSS_SELECTOR, "input[data-a-target='tw-input']")
-    
+
     def __init__(self, driver: WebDriver):
         """
         Initialize the BrowsePage object.
@@ -24,7 +26,7 @@ class BrowsePage(BasePage):
         super().__init__(driver)
         self.url: str = Config.TWITCH_URL + "/directory"
 
-    @property
+    @cached_property
     def navigation_bar(self) -> NavigationBar:
         """
         Return a NavigationBar page object scoped to this driver.
@@ -34,6 +36,7 @@ class BrowsePage(BasePage):
         """
         return NavigationBar(self.driver)
     
+    @timed_step()
     def find_search_input(self, timeout: int = 10) -> WebElement:
         """
         Find the search input using the primary selector.
@@ -50,12 +53,13 @@ class BrowsePage(BasePage):
         logger.info("🔍 Looking for search input...")
         try:
             search_input = self.wait_and_get_visible_element(self.SEARCH_INPUT_SELECTOR, timeout)
-            logger.info(f"Found search input using selector: {self.SEARCH_INPUT_SELECTOR}")
+            logger.info("Found search input using selector: %s", self.SEARCH_INPUT_SELECTOR)
             return search_input
         except Exception:
             logger.error("No search input found with any selector!")
             raise Exception("No search input found on Browse page.")
 
+    @timed_step()
     def perform_search(self, search_term: str) -> None:
         """
         Perform a search with the given term.
@@ -67,5 +71,5 @@ class BrowsePage(BasePage):
             Exception: If the search cannot be performed.
         """
         search_input = self.find_search_input()
-        logger.info(f"Entering search term: '{search_term}'...")
+        logger.info("Entering search term: '%s'...", search_term)
         self.set_text_field(search_input, search_term)
@@ -0,0 +1,390 @@
+"""
+JavaScript snippets executed inside the page by BasePage and page objects.
+
+Keeping the browser-side logic here lets a single `execute_script` call replace
+many per-element WebDriver round trips.
+"""
+from selenium.webdriver.common.by import By
+
+# Element state predicates shared by the scripts below.
+# isDisplayed approximates WebDriver's displayedness: connected, not hidden by CSS
+# on any ancestor, not fully transparent and with a non-empty box.
+ELEMENT_STATE_FUNCTIONS: str = """
+    function isDisplayed(el) {
+        if (!el || !el.isConnected) return false;
+        if (el.checkVisibility) {
+            if (!el.checkVisibility({checkOpacity: true, checkVisibilityCSS: true})) return false;
+        } else {
+            for (var n = el; n && n.nodeType === 1; n = n.parentElement) {
+                var style = window.getComputedStyle(n);
+                if (style.display === 'none' || style.opacity === '0') return false;
+            }
+            if (window.getComputedStyle(el).visibility !== 'visible') return false;
+        }
+        var rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    }
+    function isEnabled(el) {
+        return !(el.matches && el.matches(':disabled'));
+    }
+    function isInViewport(el) {
+        var r = el.getBoundingClientRect();
+        return r.top >= 0 && r.left >= 0 &&
+            r.bottom <= window.innerHeight && r.right <= window.innerWidth;
+    }
+    function matchesState(el, opts) {
+        return (!opts.displayed || isDisplayed(el)) &&
+            (!opts.enabled || isEnabled(el)) &&
+            (!opts.inViewport || isInViewport(el));
+    }
+    function documentKey() {
+        return performance.timeOrigin + ' ' + location.href;
+    }
+"""
+
+# arguments[0]: list of elements, arguments[1]: {displayed, enabled, inViewport}
+# Returns the elements that satisfy every requested check, in document order.
+FILTER_ELEMENTS: str = ELEMENT_STATE_FUNCTIONS + """
+    var elements = arguments[0] || [], opts = arguments[1] || {};
+    return elements.filter(function (el) { return matchesState(el, opts); });
+"""
+
+# Element cache check. arguments: [element or null, {displayed, enabled, inViewport}]
+# Returns {document, usable}. document identifies the current document and route:
+# performance.timeOrigin changes on every navigation (links, form submits, reloads),
+# location.href on SPA route changes. usable is true if the element passes every check.
+CACHED_ELEMENT_CHECK: str = ELEMENT_STATE_FUNCTIONS + """
+    var el = arguments[0], opts = arguments[1] || {};
+    return {document: documentKey(), usable: !!el && matchesState(el, opts)};
+"""
+
+# Async wait engine. arguments: [kind, query, condition, count, timeoutMs, callback]
+# kind is "css" or "xpath"; condition is one of present, present_all, visible,
+# clickable, invisible or count. Resolves with {ok: true, value} as soon as the
+# condition holds (re-checked on every DOM mutation, plus a short fallback tick
+# for style/layout-only changes) or {ok: false} once timeoutMs elapses. Every result
+# also carries document (see CACHED_ELEMENT_CHECK), so a located element can be cached
+# without another round trip.
+WAIT_FOR_CONDITION: str = ELEMENT_STATE_FUNCTIONS + """
+    var kind = arguments[0], query = arguments[1], condition = arguments[2],
+        count = arguments[3], timeoutMs = arguments[4], done = arguments[arguments.length - 1];
+    function find() {
+        if (kind === 'css') return Array.prototype.slice.call(document.querySelectorAll(query));
+        var snapshot = document.evaluate(query, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var found = [];
+        for (var i = 0; i < snapshot.snapshotLength; i++) found.push(snapshot.snapshotItem(i));
+        return found;
+    }
+    function check() {
+        var els = find(), first = els[0];
+        switch (condition) {
+            case 'present': return first ? {ok: true, value: first} : null;
+            case 'present_all': return els.length ? {ok: true, value: els} : null;
+            case 'visible': return first && isDisplayed(first) ? {ok: true, value: first} : null;
+            case 'clickable':
+                return first && isDisplayed(first) && isEnabled(first) ? {ok: true, value: first} : null;
+            case 'invisible': return !first || !isDisplayed(first) ? {ok: true, value: true} : null;
+            case 'count': return els.length >= count ? {ok: true, value: els} : null;
+        }
+        throw new Error('Unknown wait condition: ' + condition);
+    }
+    var finished = false, observer = null, ticker = null, timer = null;
+    function finish(result) {
+        if (finished) return;
+        finished = true;
+        if (observer) observer.disconnect();
+        clearInterval(ticker);
+        clearTimeout(timer);
+        result.document = documentKey();
+        done(result);
+    }
+    function attempt() {
+        if (finished) return;
+        try {
+            var result = check();
+            if (result) finish(result);
+        } catch (e) {
+            finish({ok: false, error: String(e)});
+        }
+    }
+    attempt();
+    if (!finished) {
+        observer = new MutationObserver(attempt);
+        observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+        ticker = setInterval(attempt, 50);
+        timer = setTimeout(function () { finish({ok: false}); }, timeoutMs);
+    }
+"""
+
+# Infinite-scroll engine. arguments: [kind, query, targetCount, maxScrolls, stepPx, quietMs,
+# timeoutMs, callback]. Scrolls by stepPx (0 = 90% of the viewport) and after each scroll waits
+# until new matches are inserted, or until the page is quiet: no DOM mutation and no finished
+# resource load (MutationObserver / PerformanceObserver) for quietMs. The page's fetch and XHR
+# are left untouched, so long-lived requests (beacons, streaming, long polling) do not hold
+# every scroll until the deadline. Stops when targetCount matches exist
+# (0 = no target), the bottom was reached and a scroll loaded nothing, maxScrolls scrolls were
+# made or timeoutMs elapsed. Resolves with {count, loaded: [new matches per scroll], reason}.
+SCROLL_AND_WAIT_FOR_ITEMS: str = """
+    var kind = arguments[0], query = arguments[1], targetCount = arguments[2],
+        maxScrolls = arguments[3], stepPx = arguments[4], quietMs = arguments[5],
+        timeoutMs = arguments[6], done = arguments[arguments.length - 1];
+    function count() {
+        if (kind === 'css') return document.querySelectorAll(query).length;
+        return document.evaluate('count(' + query + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue;
+    }
+    var deadline = performance.now() + timeoutMs, loaded = [], total = count(), lastActivity = 0;
+    var observer = new MutationObserver(function () { lastActivity = performance.now(); });
+    observer.observe(document, {childList: true, subtree: true});
+    var resources = window.PerformanceObserver ? new PerformanceObserver(function () {
+        lastActivity = performance.now();
+    }) : null;
+    if (resources) resources.observe({type: 'resource'});
+    function finish(reason) {
+        observer.disconnect();
+        if (resources) resources.disconnect();
+        done({count: total, loaded: loaded, reason: reason});
+    }
+    function atBottom() {
+        var root = document.scrollingElement || document.documentElement;
+        return window.innerHeight + window.scrollY >= root.scrollHeight - 2;
+    }
+    function scrollOnce() {
+        if (targetCount && total >= targetCount) return finish('target');
+        if (loaded.length >= maxScrolls) return finish('max_scrolls');
+        if (performance.now() >= deadline) return finish('timeout');
+        var before = total;
+        window.scrollBy(0, stepPx || Math.round(window.innerHeight * 0.9));
+        lastActivity = performance.now();
+        var ticker = setInterval(function () {
+            var now = performance.now(), current = count();
+            var grew = current > before;
+            var quiet = now - lastActivity >= quietMs;
+            if (!grew && !quiet && now < deadline) return;
+            clearInterval(ticker);
+            total = current;
+            loaded.push(current - before);
+            if (!grew && atBottom()) return finish('end');
+            scrollOnce();
+        }, 25);
+    }
+    scrollOnce();
+"""
+
+# Bulk card extraction. arguments: [kind, query, titleKind, titleQuery, elements]. Reads every
+# streamer card matching the query (or the given elements) in one pass and returns columns of
+# equal length: {elements, title, href, channel, category, viewers, live, clickable}. The title
+# is found with the page object's title locator (relative to the card); other fields are looked
+# up inside the card only (with fallbacks for live Twitch markup); a missing field is null.
+EXTRACT_STREAMER_CARDS: str = ELEMENT_STATE_FUNCTIONS + """
+    var kind = arguments[0], query = arguments[1], titleKind = arguments[2], titleQuery = arguments[3];
+    var elements = arguments[4];
+    if (!elements) {
+        if (kind === 'css') {
+            elements = Array.prototype.slice.call(document.querySelectorAll(query));
+        } else {
+            var snapshot = document.evaluate(query, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            elements = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) elements.push(snapshot.snapshotItem(i));
+        }
+    }
+    function find(card, selector) {
+        return card.querySelector(selector);
+    }
+    function findTitle(card) {
+        if (titleKind === 'css') return card.querySelector(titleQuery);
+        return document.evaluate(titleQuery, card, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    function text(node) { return node ? node.textContent.trim() : null; }
+    var columns = {elements: elements, title: [], href: [], channel: [], category: [],
+                   viewers: [], live: [], clickable: []};
+    elements.forEach(function (card) {
+        var titleNode = findTitle(card);
+        var anchor = card.closest('a[href]') || find(card, 'a[href]');
+        var link = card.getAttribute('data-href') || card.getAttribute('href') ||
+            (anchor ? anchor.getAttribute('href') : null);
+        var channelNode = find(card, '[data-a-target="search-result-channel"]');
+        var viewersNode = find(card, '[data-a-target="tw-stat-value"]');
+        if (!viewersNode) {
+            viewersNode = Array.prototype.find.call(card.querySelectorAll('p, span'), function (n) {
+                return /viewers?$/i.test(n.textContent.trim());
+            });
+        }
+        columns.title.push(titleNode ? titleNode.getAttribute('title') || text(titleNode) : null);
+        columns.href.push(link);
+        columns.channel.push(text(channelNode) || (link ? link.replace(/^https?:[/][/][^/]+/, '').split('/')[1] || null : null));
+        columns.category.push(text(find(card,
+            '[data-a-target="search-result-category"], a[href*="/directory/category/"], a[href*="/directory/game/"]')));
+        columns.viewers.push(text(viewersNode));
+        columns.live.push(!!find(card, '.tw-channel-status-text-indicator, [class*="live-indicator"]'));
+        columns.clickable.push(matchesState(card, {displayed: true, enabled: true, inViewport: true}));
+    });
+    return columns;
+"""
+
+# arguments: [kind, query, index]. Scrolls the index-th match into the middle of the viewport
+# and returns its center in CSS pixels ({x, y}), or null if there is no such match. Used to
+# aim trusted mouse events when driving a page over CDP.
+ELEMENT_CENTER: str = """
+    var kind = arguments[0], query = arguments[1], index = arguments[2], el;
+    if (kind === 'css') {
+        el = document.querySelectorAll(query)[index];
+    } else {
+        el = document.evaluate(query, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotItem(index);
+    }
+    if (!el) return null;
+    el.scrollIntoView({block: 'center', inline: 'center'});
+    var r = el.getBoundingClientRect();
+    return {x: r.left + r.width / 2, y: r.top + r.height / 2};
+"""
+
+# DOM snapshot for offline locator checks. arguments: [maxAttributeLength, maxTextLength].
+# Returns {url, title, elements}: every element in document order as
+# [tag, parentIndex (-1 for the root), [name, value, ...], ownText], where ownText joins the
+# element's direct text nodes (empty when whitespace only). Long values are truncated.
+DOM_SNAPSHOT: str = """
+    var maxAttr = arguments[0], maxText = arguments[1];
+    var all = document.getElementsByTagName('*'), index = new Map(), elements = new Array(all.length);
+    for (var i = 0; i < all.length; i++) {
+        var el = all[i], parent = el.parentElement, attrs = [], text = '';
+        index.set(el, i);
+        for (var a = 0; a < el.attributes.length; a++) {
+            var attr = el.attributes[a];
+            attrs.push(attr.name, attr.value.length > maxAttr ? attr.value.slice(0, maxAttr) : attr.value);
+        }
+        for (var c = el.firstChild; c; c = c.nextSibling) {
+            if (c.nodeType === 3) text += c.nodeValue;
+        }
+        if (!text.trim()) text = '';
+        else if (text.length > maxText) text = text.slice(0, maxText);
+        elements[i] = [el.localName, parent && index.has(parent) ? index.get(parent) : -1, attrs, text];
+    }
+    return {url: location.href, title: document.title, elements: elements};
+"""
+
+
+# Selector cost profiler. arguments: [queries ([[kind, query], ...]), scales, minMs, maxIterations].
+# For each DOM scale factor (ascending), appends scale - 1 hidden copies of the body content,
+# then times every query with querySelectorAll / document.evaluate, repeating each until minMs
+# elapsed or maxIterations calls were made (performance.now() is too coarse for one call).
+# Copies keep their attributes; media, images and frames stay inert (hidden, lazy, no autoplay)
+# and are removed afterwards. Returns [{scale, nodes, costs: [{matches, per_call_us,
+# iterations} | {error}]}].
+SELECTOR_COST: str = """
+    var queries = arguments[0], scales = arguments[1], minMs = arguments[2], maxIterations = arguments[3];
+    function run(kind, query) {
+        if (kind === 'css') return document.querySelectorAll(query).length;
+        return document.evaluate(query, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+    }
+    var template = document.createElement('div');
+    Array.prototype.forEach.call(document.body.children, function (child) {
+        template.appendChild(child.cloneNode(true));
+    });
+    template.querySelectorAll('img, iframe').forEach(function (el) { el.setAttribute('loading', 'lazy'); });
+    template.querySelectorAll('video, audio').forEach(function (el) {
+        el.removeAttribute('autoplay');
+        el.setAttribute('preload', 'none');
+    });
+    var container = document.createElement('div');
+    container.style.display = 'none';
+    container.setAttribute('aria-hidden', 'true');
+    var copies = 0, results = [];
+    try {
+        document.body.appendChild(container);
+        scales.forEach(function (scale) {
+            for (; copies < scale - 1; copies++) container.appendChild(template.cloneNode(true));
+            var costs = queries.map(function (q) {
+                try {
+                    var matches = run(q[0], q[1]), iterations = 0, start = performance.now(), elapsed = 0;
+                    while (iterations < maxIterations && elapsed < minMs) {
+                        run(q[0], q[1]);
+                        iterations++;
+                        elapsed = performance.now() - start;
+                    }
+                    return {matches: matches, per_call_us: elapsed * 1000 / iterations, iterations: iterations};
+                } catch (e) {
+                    return {error: String(e && e.message || e)};
+                }
+            });
+            results.push({scale: scale, nodes: document.getElementsByTagName('*').length, costs: costs});
+        });
+    } finally {
+        container.remove();
+    }
+    return results;
+"""
+
+# Rebuilds a DOM_SNAPSHOT element list as the current document. arguments: [elements].
+# Meant for a blank page whose Content-Security-Policy blocks all loads, so recorded
+# scripts, images and frames stay inert. Returns the number of elements created.
+REBUILD_DOM_SNAPSHOT: str = """
+    var elements = arguments[0], nodes = new Array(elements.length), root = null;
+    var SVG = 'http://www.w3.org/2000/svg';
+    for (var i = 0; i < elements.length; i++) {
+        var e = elements[i], parent = e[1] >= 0 ? nodes[e[1]] : root, el;
+        var inSvg = e[0] === 'svg' || (parent && parent.namespaceURI === SVG && parent.localName !== 'foreignObject');
+        try {
+            el = inSvg ? document.createElementNS(SVG, e[0]) : document.createElement(e[0]);
+        } catch (err) {
+            el = document.createElement('unknown');
+        }
+        for (var a = 0; a < e[2].length; a += 2) {
+            try { el.setAttribute(e[2][a], e[2][a + 1]); } catch (err) {}
+        }
+        if (e[3]) el.appendChild(document.createTextNode(e[3]));
+        nodes[i] = el;
+        if (parent) parent.appendChild(el);
+        else root = el;
+    }
+    if (root) document.replaceChild(root, document.documentElement);
+    return elements.length;
+"""
+
+# Web storage of the current origin for journey checkpoints. Returns {local, session}
+# with every key/value of localStorage and sessionStorage.
+READ_STORAGE: str = """
+    function read(storage) {
+        var items = {};
+        for (var i = 0; i < storage.length; i++) items[storage.key(i)] = storage.getItem(storage.key(i));
+        return items;
+    }
+    return {local: read(window.localStorage), session: read(window.sessionStorage)};
+"""
+
+# Replaces the web storage of the current origin. arguments: [local, session] as returned by READ_STORAGE.
+WRITE_STORAGE: str = """
+    [[window.localStorage, arguments[0]], [window.sessionStorage, arguments[1]]].forEach(function (pair) {
+        pair[0].clear();
+        Object.keys(pair[1]).forEach(function (key) { pair[0].setItem(key, pair[1][key]); });
+    });
+"""
+
+def to_browser_query(locator: tuple[str, str]) -> tuple[str, str] | None:
+    """
+    Translate a Selenium locator into a CSS selector or XPath usable in page scripts.
+
+    Args:
+        locator (tuple[str, str]): Locator tuple (By, value).
+
+    Returns:
+        tuple[str, str] | None: ("css" | "xpath", query), or None if the strategy
+        has no direct browser-side equivalent (e.g. link text).
+    """
+    by, value = locator
+    if by == By.CSS_SELECTOR:
+        return "css", value
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.ID:
+        return "css", f'[id="{_css_escape(value)}"]'
+    if by == By.NAME:
+        return "css", f'[name="{_css_escape(value)}"]'
+    if by == By.CLASS_NAME:
+        return "css", f'[class~="{_css_escape(value)}"]'
+    if by == By.TAG_NAME:
+        return "css", value
+    return None
+
+
+def _css_escape(value: str) -> str:
+    """Escape a value for use inside a double-quoted CSS attribute selector."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
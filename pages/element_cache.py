@@ -0,0 +1,109 @@
+from weakref import WeakKeyDictionary
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+_caches: "WeakKeyDictionary[WebDriver, ElementCache]" = WeakKeyDictionary()
+
+
+class ElementCache:
+    """
+    Per-driver cache of WebElement handles located by BasePage for one document.
+
+    The document is identified by the key BasePage reads with
+    browser_scripts.CACHED_ELEMENT_CHECK (time origin and URL), so any navigation,
+    including clicks, form submits and SPA route changes, empties the cache.
+    Shared by every page object using the same driver.
+    """
+
+    def __init__(self):
+        """Initialize an empty ElementCache."""
+        self.document: str | None = None
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stale: int = 0
+        self._entries: dict[tuple[str, str], WebElement] = {}
+
+    @staticmethod
+    def for_driver(driver: WebDriver) -> "ElementCache":
+        """
+        Get the cache of a driver, creating it on first use.
+
+        Args:
+            driver (WebDriver): Driver the elements belong to.
+
+        Returns:
+            ElementCache: The driver's cache.
+        """
+        cache = _caches.get(driver)
+        if cache is None:
+            cache = _caches[driver] = ElementCache()
+        return cache
+
+    @staticmethod
+    def reset(driver: WebDriver) -> None:
+        """Drop a driver's cache and its counters, e.g. before a pooled driver serves a new test."""
+        _caches.pop(driver, None)
+
+    def get(self, locator: tuple[str, str]) -> WebElement | None:
+        """
+        Get the handle cached for a locator, still to be checked against the current document.
+
+        Args:
+            locator (tuple[str, str]): Locator tuple (By, value).
+
+        Returns:
+            WebElement | None: Cached handle, or None (counted as a miss).
+        """
+        element = self._entries.get(locator)
+        if element is None:
+            self.misses += 1
+        return element
+
+    def put(self, locator: tuple[str, str], element: WebElement, document: str) -> None:
+        """
+        Cache the handle found for a locator, forgetting handles of any other document.
+
+        Args:
+            locator (tuple[str, str]): Locator tuple (By, value).
+            element (WebElement): Element located for it.
+            document (str): Key of the document the element was found in.
+        """
+        if document != self.document:
+            self._entries.clear()
+            self.document = document
+        self._entries[locator] = element
+
+    def discard(self, locator: tuple[str, str]) -> None:
+        """
+        Drop a cached handle that could not be used; it will be looked up again.
+
+        Args:
+            locator (tuple[str, str]): Locator tuple (By, value).
+        """
+        self._entries.pop(locator, None)
+        self.misses += 1
+
+    def invalidate(self, stale: bool = False) -> None:
+        """
+        Forget every handle, e.g. after a navigation.
+
+        Args:
+            stale (bool): True when a check revealed the document changed
+                (counted in `stale` and as a miss).
+        """
+        self.document = None
+        self._entries.clear()
+        if stale:
+            self.stale += 1
+            self.misses += 1
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the cache counters.
+
+        Returns:
+            dict[str, int]: hits (locating waits replaced by a cached-handle check;
+            round trips saved only with WAIT_ENGINE=polling), misses (elements located)
+            and stale (cached handles invalidated by a document change).
+        """
+        return {"hits": self.hits, "misses": self.misses, "stale": self.stale}
@@ -1,7 +1,9 @@
+from functools import cached_property
 from selenium.webdriver.remote.webdriver import WebDriver
 from pages.base_page import BasePage
 from pages.navigation_bar import NavigationBar
 from config.config import Config
+from utils.step_timer import timed_step
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,7 @@ class HomePage(BasePage):
         super().__init__(driver)
         self.url:str = Config.TWITCH_URL
 
+    @timed_step()
     def navigate_to_home_page(self) -> None:
         """
         Navigate to Twitch homepage.
@@ -27,7 +30,7 @@ class HomePage(BasePage):
         self.go_to_link(self.url)
         logger.info("Navigated to Twitch homepage.")
 
-    @property
+    @cached_property
     def navigation_bar(self) -> NavigationBar:
         """
         Return a NavigationBar page object scoped to this driver.
@@ -0,0 +1,369 @@
+import copy
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Iterable
+from urllib.parse import urljoin
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from pages import browser_scripts
+from pages.browse_page import BrowsePage
+from pages.home_page import HomePage
+from pages.search_results_page import SearchResultsPage
+from pages.stream_page import StreamPage
+from config.config import Config
+from utils.dom_snapshot import DomSnapshotRecorder
+from utils.step_timer import StepTimer
+from utils.structured_logging import log_step
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOURNEY_MODES: tuple[str, ...] = ("ui", "fast")
+
+
+@dataclass
+class JourneyContext:
+    """Page objects and state shared by the steps of one journey run."""
+
+    driver: WebDriver
+    search_term: str
+    state: dict[str, Any] = field(default_factory=dict)
+
+    @cached_property
+    def home_page(self) -> HomePage:
+        return HomePage(self.driver)
+
+    @cached_property
+    def browse_page(self) -> BrowsePage:
+        return BrowsePage(self.driver)
+
+    @cached_property
+    def search_results_page(self) -> SearchResultsPage:
+        return SearchResultsPage(self.driver)
+
+    @cached_property
+    def stream_page(self) -> StreamPage:
+        return StreamPage(self.driver)
+
+
+@dataclass
+class JourneyStep:
+    """
+    One stage of a user journey with a UI path and an optional fast path.
+
+    The UI path drives the page like a user (clicks, typing). The fast path reaches
+    the same end state by deep link or state injection. A `standalone` fast path
+    reaches that state from any page, so earlier fast steps can be skipped.
+    """
+
+    name: str
+    ui: Callable[[JourneyContext], None]
+    fast: Callable[[JourneyContext], None] | None = None
+    standalone: bool = False
+
+
+@dataclass
+class StepOutcome:
+    """How a journey step was executed."""
+
+    name: str
+    # "ui", "fast", "skipped" (collapsed into a later standalone fast step)
+    # or "resumed" (completed in an earlier attempt, restored from its checkpoint)
+    path: str
+    duration_ms: float
+
+
+@dataclass
+class JourneyCheckpoint:
+    """Browser and journey state after a completed step."""
+
+    step: str
+    index: int
+    url: str
+    cookies: list[dict]
+    local_storage: dict[str, str]
+    session_storage: dict[str, str]
+    state: dict[str, Any]
+    # Journey time from the first step up to this checkpoint, including earlier attempts
+    elapsed_ms: float
+
+    @classmethod
+    def capture(cls, context: JourneyContext, step: str, index: int, elapsed_ms: float) -> "JourneyCheckpoint":
+        """
+        Record the current page, cookies, web storage and journey state.
+
+        Args:
+            context (JourneyContext): Context of the running journey.
+            step (str): Name of the step just completed.
+            index (int): Position of that step in the journey.
+            elapsed_ms (float): Journey time up to the end of the step.
+
+        Returns:
+            JourneyCheckpoint: The checkpoint.
+        """
+        driver = context.driver
+        storage = driver.execute_script(browser_scripts.READ_STORAGE)
+        return cls(
+            step, index, driver.current_url, driver.get_cookies(),
+            storage["local"], storage["session"], copy.deepcopy(context.state), elapsed_ms,
+        )
+
+    def restore(self, context: JourneyContext) -> None:
+        """
+        Bring the browser and journey state back to this checkpoint.
+
+        Args:
+            context (JourneyContext): Context of the journey to resume.
+
+        Raises:
+            WebDriverException: If the browser state cannot be restored.
+        """
+        driver = context.driver
+        # Cookies and storage can only be set on their origin; a missing robots.txt is still a cheap page there
+        driver.get(urljoin(self.url, "/robots.txt"))
+        driver.delete_all_cookies()
+        for cookie in self.cookies:
+            try:
+                driver.add_cookie(cookie)
+            except WebDriverException as e:
+                logger.debug("Checkpoint cookie %s not restored: %s", cookie.get("name"), e.msg)
+        driver.execute_script(browser_scripts.WRITE_STORAGE, self.local_storage, self.session_storage)
+        driver.get(self.url)
+        context.state.clear()
+        context.state.update(copy.deepcopy(self.state))
+
+
+class JourneyCheckpoints:
+    """
+    Checkpoints of one test's journey, kept in the process so that a
+    pytest-rerunfailures rerun (same worker) can resume after the last completed step.
+    """
+
+    _by_test: dict[str, "JourneyCheckpoints"] = {}
+
+    def __init__(self):
+        """Initialize JourneyCheckpoints. Use for_test() instead."""
+        self.checkpoints: list[JourneyCheckpoint] = []
+
+    @classmethod
+    def for_test(cls, test_id: str) -> "JourneyCheckpoints":
+        """Return the checkpoints of a test, creating them on first use."""
+        return cls._by_test.setdefault(test_id, cls())
+
+    def save(self, checkpoint: JourneyCheckpoint) -> None:
+        """Record a checkpoint, replacing any later ones from an earlier attempt."""
+        self.checkpoints = [c for c in self.checkpoints if c.index < checkpoint.index] + [checkpoint]
+
+    def latest(self) -> JourneyCheckpoint | None:
+        """Return the checkpoint of the last completed step, if any."""
+        return self.checkpoints[-1] if self.checkpoints else None
+
+    def clear(self) -> None:
+        """Forget every checkpoint."""
+        self.checkpoints.clear()
+
+
+class Journey:
+    """
+    Runs journey steps, taking the fast path for every step that is not under test.
+
+    In "ui" mode every step takes its UI path. In "fast" mode only the steps under
+    test (and steps without a fast path) take their UI path. Consecutive fast steps
+    are collapsed: only the last standalone one and the steps after it run.
+
+    With checkpoints, the state after every completed step is recorded; a resumed
+    run restores the latest checkpoint and continues with the step after it.
+    """
+
+    def __init__(
+        self,
+        steps: list[JourneyStep],
+        context: JourneyContext,
+        under_test: Iterable[str] = (),
+        mode: str | None = None,
+        checkpoints: JourneyCheckpoints | None = None,
+        resume: bool = False
+    ):
+        """
+        Initialize Journey.
+
+        Args:
+            steps (list[JourneyStep]): Steps in execution order.
+            context (JourneyContext): Shared page objects and state.
+            under_test (Iterable[str]): Names of steps that must take their UI path.
+            mode (str | None): "ui" or "fast". Defaults to Config.JOURNEY_MODE.
+            checkpoints (JourneyCheckpoints | None): Where to record a checkpoint after each step.
+            resume (bool): Continue from the latest checkpoint instead of the first step.
+
+        Raises:
+            ValueError: If the mode or a step under test is unknown.
+        """
+        self.steps: list[JourneyStep] = steps
+        self.context: JourneyContext = context
+        self.under_test: set[str] = set(under_test)
+        self.mode: str = mode or Config.JOURNEY_MODE
+        if self.mode not in JOURNEY_MODES:
+            raise ValueError(f"Unknown journey mode: {self.mode}. Available: {list(JOURNEY_MODES)}")
+        unknown = self.under_test - {step.name for step in steps}
+        if unknown:
+            raise ValueError(f"Unknown journey steps under test: {sorted(unknown)}")
+        self.outcomes: list[StepOutcome] = []
+        self.checkpoints: JourneyCheckpoints | None = checkpoints
+        self.resume: bool = resume
+        # Step the run resumed after, and the journey time that saved net of restoring
+        self.resumed_from: str | None = None
+        self.time_saved_ms: float = 0.0
+
+    def plan(self) -> list[tuple[JourneyStep, str]]:
+        """
+        Decide the path of every step.
+
+        Returns:
+            list[tuple[JourneyStep, str]]: Each step with "ui", "fast" or "skipped".
+        """
+        paths = [
+            "fast" if self.mode == "fast" and step.fast and step.name not in self.under_test else "ui"
+            for step in self.steps
+        ]
+        index = 0
+        while index < len(paths):
+            if paths[index] != "fast":
+                index += 1
+                continue
+            run_end = index
+            while run_end < len(paths) and paths[run_end] == "fast":
+                run_end += 1
+            standalone = [i for i in range(index, run_end) if self.steps[i].standalone]
+            if standalone:
+                for skipped in range(index, standalone[-1]):
+                    paths[skipped] = "skipped"
+            index = run_end
+        return list(zip(self.steps, paths))
+
+    def run(self) -> list[StepOutcome]:
+        """
+        Execute the journey, recording a DOM snapshot after each executed step
+        when a DomSnapshotRecorder is active, and a checkpoint when checkpoints are kept.
+
+        Returns:
+            list[StepOutcome]: Path and duration of every step.
+        """
+        timer = StepTimer.current()
+        snapshots = DomSnapshotRecorder.current()
+        plan = self.plan()
+        start, elapsed_ms = self._resume(plan)
+        for index, (step, path) in enumerate(plan[start:], start):
+            with log_step(step.name):
+                started = time.perf_counter()
+                if path != "skipped":
+                    action = step.fast if path == "fast" else step.ui
+                    try:
+                        if timer:
+                            with timer.span(f"journey.{step.name}[{path}]"):
+                                action(self.context)
+                        else:
+                            action(self.context)
+                    except Exception:
+                        if snapshots:
+                            snapshots.record(self.context.driver, step.name, failed=True)
+                        raise
+                outcome = StepOutcome(step.name, path, (time.perf_counter() - started) * 1000)
+                self.outcomes.append(outcome)
+                elapsed_ms += outcome.duration_ms
+                logger.info("Journey step '%s' (%s) took %.0f ms", step.name, path, outcome.duration_ms)
+                if snapshots and path != "skipped":
+                    snapshots.record(self.context.driver, step.name)
+                if self.checkpoints is not None and path != "skipped":
+                    try:
+                        self.checkpoints.save(JourneyCheckpoint.capture(self.context, step.name, index, elapsed_ms))
+                    except WebDriverException as e:
+                        logger.warning("Checkpoint after journey step '%s' not recorded: %s", step.name, e.msg)
+        return self.outcomes
+
+    def _resume(self, plan: list[tuple[JourneyStep, str]]) -> tuple[int, float]:
+        """
+        Restore the latest checkpoint when resuming.
+
+        Returns:
+            tuple[int, float]: Index of the first step to run and the journey time
+            already spent before it (0 and 0.0 when starting over).
+        """
+        checkpoint = self.checkpoints.latest() if self.resume and self.checkpoints is not None else None
+        if not checkpoint:
+            return 0, 0.0
+        if checkpoint.index >= len(plan) or plan[checkpoint.index][0].name != checkpoint.step:
+            logger.warning("Checkpoint '%s' does not match this journey; starting over", checkpoint.step)
+            return 0, 0.0
+        started = time.perf_counter()
+        try:
+            checkpoint.restore(self.context)
+        except WebDriverException as e:
+            logger.warning("Checkpoint '%s' could not be restored; starting over: %s", checkpoint.step, e.msg)
+            self.context.state.clear()
+            return 0, 0.0
+        restore_ms = (time.perf_counter() - started) * 1000
+        self.outcomes.extend(StepOutcome(step.name, "resumed", 0.0) for step, _ in plan[:checkpoint.index + 1])
+        self.resumed_from = checkpoint.step
+        self.time_saved_ms = checkpoint.elapsed_ms - restore_ms
+        logger.info(
+            "Journey resumed after '%s' in %.0f ms, saving %.0f ms over a full rerun",
+            checkpoint.step, restore_ms, self.time_saved_ms
+        )
+        return checkpoint.index + 1, checkpoint.elapsed_ms
+
+def _open_home(ctx: JourneyContext) -> None:
+    ctx.home_page.navigate_to_home_page()
+
+def _browse_ui(ctx: JourneyContext) -> None:
+    ctx.home_page.navigation_bar.go_to_browse()
+
+def _browse_fast(ctx: JourneyContext) -> None:
+    ctx.browse_page.go_to_link(ctx.browse_page.url)
+
+def _search_ui(ctx: JourneyContext) -> None:
+    ctx.browse_page.perform_search(ctx.search_term)
+    ctx.search_results_page.wait_for_search_results_load()
+    ctx.state["on_search_results"] = True
+
+def _search_fast(ctx: JourneyContext) -> None:
+    ctx.search_results_page.navigate_to_search_page(ctx.search_term)
+    ctx.search_results_page.wait_for_search_results_load()
+    ctx.state["on_search_results"] = True
+
+def _scroll_ui(ctx: JourneyContext) -> None:
+    ctx.search_results_page.scroll_down_twice()
+
+def _skip(ctx: JourneyContext) -> None:
+    """Fast path for steps whose only effect is what the user sees along the way."""
+
+def _select_streamer_ui(ctx: JourneyContext) -> None:
+    ctx.state["streamer_info"] = ctx.search_results_page.select_random_streamer()
+    ctx.state["on_search_results"] = False
+
+def _select_streamer_fast(ctx: JourneyContext) -> None:
+    if not ctx.state.get("on_search_results"):
+        _search_fast(ctx)
+    ctx.state["streamer_info"] = ctx.search_results_page.open_random_streamer_link()
+    ctx.state["on_search_results"] = False
+
+def _watch(ctx: JourneyContext) -> None:
+    ctx.stream_page.handle_streamer_popups()
+    ctx.stream_page.wait_for_video_load()
+
+
+def watch_streamer_journey() -> list[JourneyStep]:
+    """
+    Steps of the Browse > Search > Scroll > Watch journey.
+
+    Returns:
+        list[JourneyStep]: home, browse, search, scroll, select_streamer and watch.
+    """
+    return [
+        JourneyStep("home", _open_home, _open_home, standalone=True),
+        JourneyStep("browse", _browse_ui, _browse_fast, standalone=True),
+        JourneyStep("search", _search_ui, _search_fast, standalone=True),
+        JourneyStep("scroll", _scroll_ui, _skip),
+        JourneyStep("select_streamer", _select_streamer_ui, _select_streamer_fast, standalone=True),
+        JourneyStep("watch", _watch),
+    ]
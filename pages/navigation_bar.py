@@ -1,6 +1,7 @@
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from utils.step_timer import timed_step
 
 class NavigationBar(BasePage):
     """Page object for Twitch navigation bar actions."""
@@ -19,18 +20,22 @@ class NavigationBar(BasePage):
         """
         super().__init__(driver)
 
+    @timed_step()
     def go_to_creator(self) -> None:
         """Navigate to creator page."""
         self.click_element(self.CREATOR_BTN)
 
+    @timed_step()
     def go_to_browse(self) -> None:
         """Navigate to browse page."""
         self.click_element(self.BROWSE_BTN)
 
+    @timed_step()
     def go_to_activity(self) -> None:
         """Navigate to activity page."""
         self.click_element(self.ACTIVITY_BTN)
 
+    @timed_step()
     def go_to_profile(self) -> None:
         """Navigate to profile page."""
         self.click_element(self.PROFILE_BTN)
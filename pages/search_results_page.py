@@ -1,16 +1,84 @@
-from typing import List, Dict
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from typing import Callable, List
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
-from urllib.parse import quote_plus
-from pages.base_page import BasePage
+from urllib.parse import quote_plus, urljoin
+from pages import browser_scripts
+from pages.base_page import BasePage, ScrollResult
 from pages.navigation_bar import NavigationBar
 from config.config import Config
+from utils.step_timer import timed_step
 import logging
 import random
+import re
 
 logger = logging.getLogger(__name__)
 
+VIEWER_COUNT_PATTERN = re.compile(r"([\d.,]+)\s*([KM]?)", re.IGNORECASE)
+
+# Card data as returned by StreamerCard.to_info(): text fields, viewers (int) and flags (bool)
+StreamerInfo = dict[str, str | int | bool | None]
+
+@dataclass(slots=True)
+class StreamerCard:
+    """Data read from one search result card, plus its element for clicking (None over CDP)."""
+
+    title: str | None
+    channel: str | None
+    href: str | None
+    category: str | None
+    viewers: int | None
+    is_live: bool
+    clickable: bool
+    element: WebElement | None
+
+    def to_info(self) -> StreamerInfo:
+        """Return the card's data without the element, e.g. for logging."""
+        info = asdict(self)
+        info.pop("element")
+        info["stream_title"] = info.pop("title")
+        return info
+
+def streamer_cards_from_columns(columns: dict, elements: List[WebElement] | None = None) -> List[StreamerCard]:
+    """
+    Build card records from the columns returned by browser_scripts.EXTRACT_STREAMER_CARDS.
+
+    Args:
+        columns (dict): title, href, channel, category, viewers, live and clickable lists.
+        elements (List[WebElement] | None): The card elements, in the same order; None
+            when the script ran over CDP and returned no element handles.
+
+    Returns:
+        List[StreamerCard]: One record per card, in document order.
+    """
+    return [
+        StreamerCard(title, channel, href, category, parse_viewer_count(viewers), live, clickable, element)
+        for element, title, href, channel, category, viewers, live, clickable in zip(
+            elements if elements is not None else [None] * len(columns["title"]),
+            columns["title"], columns["href"], columns["channel"],
+            columns["category"], columns["viewers"], columns["live"], columns["clickable"],
+        )
+    ]
+
+def parse_viewer_count(text: str | None) -> int | None:
+    """
+    Parse a viewer count such as "16.3K viewers", "1.2M" or "1,234".
+
+    Args:
+        text (str | None): Viewer count text from a card.
+
+    Returns:
+        int | None: Number of viewers, or None if the text has no count.
+    """
+    match = VIEWER_COUNT_PATTERN.search(text or "")
+    if not match:
+        return None
+    number = float(match.group(1).replace(",", ""))
+    multiplier = {"K": 1_000, "M": 1_000_000}.get(match.group(2).upper(), 1)
+    return int(number * multiplier)
+
 class SearchResultsPage(BasePage):
     """Page object for search results page on Twitch."""
 
@@ -27,11 +95,12 @@ class SearchResultsPage(BasePage):
         super().__init__(driver)
         self.url: str = Config.TWITCH_URL + "/search?term="
 
-    @property
+    @cached_property
     def navigation_bar(self) -> NavigationBar:
         """Return a NavigationBar page object scoped to this driver."""
         return NavigationBar(self.driver)
 
+    @timed_step()
     def navigate_to_search_page(self, search_term: str) -> None:
         """
         Navigate to Twitch search results page for a term.
@@ -43,6 +112,7 @@ class SearchResultsPage(BasePage):
         self.go_to_link(self.url + encoded_term)
         logger.info("Navigated to Twitch search page")
 
+    @timed_step()
     def wait_for_search_results_load(self, timeout: int = 15) -> None:
         """
         Wait for search results to load completely.
@@ -56,29 +126,93 @@ class SearchResultsPage(BasePage):
         self.wait_and_get_visible_element(self.STREAMER_CARD, timeout)
         logger.info("Search results loaded")
 
-    def scroll_down_twice(self) -> None:
+    @timed_step()
+    def scroll_down_twice(self) -> ScrollResult:
         """
         Scroll down twice as specified in requirements.
+
+        Each scroll waits only until newly loaded cards appear or the page goes quiet.
+
+        Returns:
+            ScrollResult: Cards loaded by each scroll.
         """
-        self.scroll(0, 800, 2, 2)
+        return self.scroll_until_loaded(self.STREAMER_CARD, max_scrolls=2, step_px=400)
 
-    def get_available_streamers(self) -> List[WebElement]:
+    @timed_step()
+    def load_streamers(self, min_count: int, max_scrolls: int = 20, timeout: int = 30) -> ScrollResult:
         """
-        Get all visible streamer cards on the page.
+        Scroll the results until at least `min_count` streamer cards are loaded or the list ends.
+
+        Args:
+            min_count (int): Number of cards wanted.
+            max_scrolls (int): Maximum number of scrolls.
+            timeout (int): Max total time in seconds.
+
+        Returns:
+            ScrollResult: Final card count, cards loaded by each scroll and why scrolling stopped.
+        """
+        return self.scroll_until_loaded(self.STREAMER_CARD, min_count, max_scrolls, timeout=timeout)
+
+    @timed_step()
+    def get_available_streamers(self, min_count: int | None = None) -> List[WebElement]:
+        """
+        Get the streamer cards available to click.
+
+        Without `min_count`, returns the clickable cards currently in the viewport.
+        With `min_count`, scrolls until that many cards are loaded and returns every
+        displayed, enabled card (Selenium scrolls a card into view when clicking it).
+
+        Args:
+            min_count (int | None): Minimum number of streamers required.
 
         Returns:
             List[WebElement]: List of clickable streamer card elements.
 
         Raises:
-            Exception: If no streamer cards are found.
+            Exception: If no streamer cards (or fewer than `min_count`) are found.
         """
-        button_elements = self.get_clickable_elements(self.STREAMER_CARD)
+        if min_count:
+            result = self.load_streamers(min_count)
+            present = self.wait_and_get_present_elements(self.STREAMER_CARD)
+            button_elements = self.filter_elements(present, displayed=True, enabled=True)
+            if len(button_elements) < min_count:
+                raise Exception(
+                    f"Only {len(button_elements)} of {min_count} streamer cards available "
+                    f"(scrolling stopped on {result.reason})"
+                )
+        else:
+            button_elements = self.get_clickable_elements(self.STREAMER_CARD)
         if not button_elements:
             raise Exception("No streamer cards found on the page")
-        logger.info(f"Found {len(button_elements)} clickable button elements")
+        logger.info("Found %s clickable button elements", len(button_elements))
         return button_elements
 
-    def get_streamer_info(self, streamer: WebElement) -> Dict[str, str]:
+    @timed_step()
+    def get_streamer_cards(self, elements: List[WebElement] | None = None) -> List[StreamerCard]:
+        """
+        Read title, channel, link, category, viewers and live status of every card at once.
+
+        All cards are read by a single script execution, so filtering and choosing
+        cards afterwards needs no further WebDriver calls.
+
+        Args:
+            elements (List[WebElement] | None): Card elements to read. Defaults to every
+                card currently matching STREAMER_CARD.
+
+        Returns:
+            List[StreamerCard]: One record per card, in document order.
+        """
+        kind, query = browser_scripts.to_browser_query(self.STREAMER_CARD)
+        title_kind, title_query = browser_scripts.to_browser_query(self.STREAM_TITLE)
+        columns = self.driver.execute_script(
+            browser_scripts.EXTRACT_STREAMER_CARDS, kind, query, title_kind, title_query, elements
+        )
+        cards = streamer_cards_from_columns(columns, columns["elements"])
+        logger.info("Extracted %s streamer cards", len(cards))
+        return cards
+
+    @timed_step()
+    def get_streamer_info(self, streamer: WebElement) -> StreamerInfo:
         """
         Get streamer information.
 
@@ -86,28 +220,83 @@ class SearchResultsPage(BasePage):
             streamer (WebElement): Streamer card WebElement.
 
         Returns:
-            Dict[str, str]: Information dictionary (currently only stream_title).
+            StreamerInfo: stream_title, channel, href and category (str or None), viewers
+            (int or None), is_live and clickable (bool).
         """
-        stream_title = streamer.find_element(*self.STREAM_TITLE).text
-        return {"stream_title": stream_title}
+        return self.get_streamer_cards([streamer])[0].to_info()
 
-    def select_random_streamer(self) -> Dict[str, str]:
+    @timed_step()
+    def select_random_streamer(
+        self,
+        predicate: Callable[[StreamerCard], bool] | None = None,
+        min_count: int | None = None
+    ) -> StreamerInfo:
         """
         Select a random streamer from the available ones and click it.
 
+        Cards are read in one script call and filtered in Python. Without `min_count`
+        only cards clickable in the viewport are considered; with it, results are
+        scrolled until that many cards are loaded and any loaded card may be chosen.
+
+        Args:
+            predicate (Callable[[StreamerCard], bool] | None): Keep only matching cards,
+                e.g. `lambda card: card.is_live and (card.viewers or 0) > 1000`.
+            min_count (int | None): Minimum number of cards to load before choosing.
+
         Returns:
-            Dict[str, str]: Streamer information.
+            StreamerInfo: Information of the chosen card, as returned by get_streamer_info.
 
         Raises:
             Exception: If no streamers found or clicking fails.
         """
-        streamers = self.get_available_streamers()
-        selected_streamer = random.choice(streamers)
-        streamer_info = self.get_streamer_info(selected_streamer)
+        if min_count:
+            self.load_streamers(min_count)
+        else:
+            self.wait_and_get_present_element(self.STREAMER_CARD)
+        cards = [
+            card for card in self.get_streamer_cards()
+            if (card.clickable or min_count) and (predicate is None or predicate(card))
+        ]
+        if not cards:
+            raise Exception("No streamer cards matching the criteria found on the page")
+        selected = random.choice(cards)
+        streamer_info = selected.to_info()
         try:
-            selected_streamer.click()
-            logger.info(f"Selected streamer: {streamer_info}")
+            selected.element.click()
+            logger.info("Selected streamer: %s", streamer_info)
             return streamer_info
         except Exception as e:
-            logger.error(f"Failed to click on streamer: {str(e)}")
+            logger.error("Failed to click on streamer: %s", str(e))
             raise
+
+    @timed_step()
+    def open_random_streamer_link(
+        self, predicate: Callable[[StreamerCard], bool] | None = None
+    ) -> StreamerInfo:
+        """
+        Pick a random streamer card and navigate straight to its channel URL.
+
+        Deep-link alternative to select_random_streamer for journeys where clicking
+        the card is not under test; any loaded card with a link may be chosen.
+
+        Args:
+            predicate (Callable[[StreamerCard], bool] | None): Keep only matching cards.
+
+        Returns:
+            StreamerInfo: Information of the chosen card, as returned by get_streamer_info.
+
+        Raises:
+            Exception: If no card with a channel link is found.
+        """
+        self.wait_and_get_present_element(self.STREAMER_CARD)
+        cards = [
+            card for card in self.get_streamer_cards()
+            if card.href and (predicate is None or predicate(card))
+        ]
+        if not cards:
+            raise Exception("No streamer cards with a channel link found on the page")
+        selected = random.choice(cards)
+        streamer_info = selected.to_info()
+        self.go_to_link(urljoin(Config.TWITCH_URL + "/", selected.href))
+        logger.info("Opened streamer link: %s", streamer_info)
+        return streamer_info
@@ -1,8 +1,11 @@
+from functools import cached_property
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from pages.base_page import BasePage
 from pages.navigation_bar import NavigationBar
 from config.config import Config
+from utils.step_timer import timed_step
+from utils.playback_probe import PlaybackProbe, PlaybackReport
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,11 +29,12 @@ class StreamPage(BasePage):
         super().__init__(driver)
         self.url: str = Config.TWITCH_URL
 
-    @property
+    @cached_property
     def navigation_bar(self) -> NavigationBar:
         """Return a NavigationBar page object scoped to this driver."""
         return NavigationBar(self.driver)
 
+    @timed_step()
     def navigate_to_streamer_page(self, streamer_name: str) -> None:
         """
         Navigate to a Twitch streamer page by streamer name.
@@ -42,8 +46,9 @@ class StreamPage(BasePage):
             Exception: If navigation fails.
         """
         self.go_to_link(self.url + "/" + streamer_name.lstrip("/"))
-        logger.info(f"Navigated to Twitch streamer page: {streamer_name}")
+        logger.info("Navigated to Twitch streamer page: %s", streamer_name)
 
+    @timed_step()
     def handle_streamer_popups(self, timeout: int = 5) -> None:
         """
         Handle popups specific to streamer pages (e.g., mature content overlays).
@@ -61,6 +66,7 @@ class StreamPage(BasePage):
         except Exception:
             logger.debug("No content classification gate overlay found.")
 
+    @timed_step()
     def wait_for_video_load(self, timeout: int = 10) -> None:
         """
         Wait for the video player to load on the stream page.
@@ -74,3 +80,22 @@ class StreamPage(BasePage):
         self.wait_for_element_to_be_invisible(self.LOADING_SPINNER, timeout)
         self.wait_and_get_visible_element(self.VIDEO_SOURCE, timeout)
         logger.info("Video player loaded successfully")
+
+    @timed_step()
+    def measure_playback(self, observe_seconds: float | None = None) -> PlaybackReport:
+        """
+        Measure playback quality of the loaded stream.
+
+        Samples readyState, currentTime, dropped/total frames and waiting/stalled events
+        inside the page. Time to first frame is only known if PlaybackProbe.install()
+        ran before navigating to the stream.
+
+        Args:
+            observe_seconds (float | None): Observation window. Defaults to Config.PLAYBACK_OBSERVE_SECONDS.
+
+        Returns:
+            PlaybackReport: Time to first frame, rebuffers and dropped frame ratio.
+        """
+        observe_seconds = observe_seconds or Config.PLAYBACK_OBSERVE_SECONDS
+        self._ensure_script_timeout(observe_seconds + 10)
+        return PlaybackProbe.measure(self.driver, self.VIDEO_SOURCE[1], observe_seconds)
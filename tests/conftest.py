@@ -1,71 +1,223 @@
 import pytest
+import json
 import logging
 import os
+from collections import defaultdict
 from typing import Generator
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from utils.webdriver_factory import WebDriverFactory
+from utils.driver_pool import DriverPool
+from utils.driver_prefetch import DriverPrefetchQueue
+from utils.standin_server import StandInServer
+from utils.step_timer import StepTimer
+from utils.page_metrics import PageMetricsRecorder
+from utils.dom_snapshot import DomSnapshotRecorder
+from utils.performance_log import PerformanceLog
+from utils.failure_artifacts import FailureArtifacts
+from utils.resource_profiles import ResourceBlocker
+from utils.stats import summarize
+from utils import parallel, structured_logging
 from utils.screenshot_utils import ScreenshotUtils as ScreenshotUtilsType
 from config.config import Config
 
+from pages.element_cache import ElementCache
+from utils.network_replay import NetworkTap
+from pages.journey import Journey, JourneyCheckpoints, JourneyContext, watch_streamer_journey
 from pages.home_page import HomePage as HomePageType
 from pages.stream_page import StreamPage as StreamPageType
 from pages.browse_page import BrowsePage as BrowsePageType
 from pages.search_results_page import SearchResultsPage as SearchResultsPageType
 
 def pytest_configure(config):
-    os.makedirs("logs", exist_ok=True)
-    log_path = "logs/test_execution.log"
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    if not root_logger.hasHandlers():
-        file_handler = logging.FileHandler(log_path, mode="a", encoding="utf-8")
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(logging.Formatter(
-            "%(asctime)s %(levelname)s %(name)s: %(message)s"
-        ))
-        root_logger.addHandler(file_handler)
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(logging.Formatter(
-            "%(asctime)s %(levelname)s %(name)s: %(message)s"
-        ))
-        root_logger.addHandler(console_handler)
+    config.addinivalue_line(
+        "markers", "fresh_driver: run the test in a new browser even when DRIVER_MODE=pooled"
+    )
+    config.addinivalue_line(
+        "markers", "resource_profile(name): request blocking profile for the test, e.g. lean or full"
+    )
+    config.addinivalue_line(
+        "markers", "under_test(*steps): journey steps that must run through the UI when JOURNEY_MODE=fast"
+    )
+    config.addinivalue_line(
+        "markers", "flaky(reruns=N): pytest-rerunfailures reruns; journeys resume from their last checkpoint"
+    )
+    if parallel.is_worker():
+        # Each xdist worker gets its own artifact directories; the controller merges them at the end
+        Config.SCREENSHOT_DIR = parallel.worker_artifact_dir(Config.SCREENSHOT_DIR)
+        Config.REPORT_DIR = parallel.worker_artifact_dir(Config.REPORT_DIR)
+    structured_logging.configure(parallel.worker_artifact_dir("logs"))
+    # pytest's own capture handlers format records on the test thread; keep them off DEBUG
+    if config.option.log_level is None:
+        config.option.log_level = Config.LOG_LEVEL
+
+def pytest_unconfigure(config):
+    structured_logging.shutdown()
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    return parallel.auto_worker_count()
+
+def pytest_sessionfinish(session, exitstatus):
+    if parallel.is_worker() or not getattr(session.config.option, "numprocesses", None):
+        return
+    merged_log = parallel.merge_worker_logs(
+        "logs", structured_logging.LOG_FILE_NAME, structured_logging.MERGED_LOG_FILE_NAME
+    )
+    index = parallel.write_artifact_index(
+        [Config.SCREENSHOT_DIR, Config.REPORT_DIR], os.path.join(Config.REPORT_DIR, "artifacts_index.json")
+    )
+    if merged_log:
+        logger.info("Merged worker logs into %s", merged_log)
+    logger.info("Indexed artifacts from %s workers", len(index))
 
 logger = logging.getLogger(__name__)
 
+# Step durations (ms) collected from every test report, keyed by step name
+_step_durations: dict[str, list[float]] = defaultdict(list)
+# Blocked request totals collected from every test report
+_blocked_totals: dict[str, int] = defaultdict(int)
+# Element cache counters collected from every test report
+_element_cache_totals: dict[str, int] = defaultdict(int)
+# Network replay counters and missed requests collected from every test report
+_network_replay_totals: dict[str, int] = defaultdict(int)
+_network_replay_misses: dict[str, int] = defaultdict(int)
+# Resumed journey reruns, keyed by (test, attempt)
+_journey_resumes: dict[tuple[str, int], dict] = {}
+# Tests with a failed (or rerun) phase, whose buffered DEBUG logs are kept
+_failed_tests: set[str] = set()
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    structured_logging.begin_test(item.nodeid)
+    yield
+    structured_logging.end_test(item.nodeid, failed=item.nodeid in _failed_tests)
+
 @pytest.fixture(scope="session", autouse=True)
 def test_session() -> Generator[None, None, None]:
     logger.info("==== Test session start ====")
     os.makedirs(Config.SCREENSHOT_DIR, exist_ok=True)
     os.makedirs(Config.REPORT_DIR, exist_ok=True)
     os.makedirs("logs", exist_ok=True)
+    standin_server = None
+    if Config.STANDIN_SERVER:
+        standin_server = StandInServer(port=Config.STANDIN_PORT).start()
+        Config.TWITCH_URL = standin_server.url
+        logger.info("Using stand-in Twitch server: %s", Config.TWITCH_URL)
     yield
+    ScreenshotUtilsType.shutdown()
+    if standin_server:
+        standin_server.stop()
     logger.info("==== Test session completed ====")
 
+@pytest.fixture(scope="function", autouse=True)
+def step_timer(request) -> Generator[StepTimer | None, None, None]:
+    if not Config.STEP_TIMING:
+        yield None
+        return
+    timer = StepTimer(request.node.nodeid).activate()
+    yield timer
+    timer.deactivate()
+    json_path, trace_path = timer.write(os.path.join(Config.REPORT_DIR, "timings"))
+    request.node.user_properties.append(("step_timings", timer.durations()))
+    logger.info("Step timings saved: %s, %s", json_path, trace_path)
+
+@pytest.fixture(scope="function", autouse=True)
+def page_metrics(request) -> Generator[PageMetricsRecorder | None, None, None]:
+    if not Config.PAGE_METRICS:
+        yield None
+        return
+    recorder = PageMetricsRecorder(request.node.nodeid).activate()
+    yield recorder
+    recorder.deactivate()
+    path = recorder.write(os.path.join(Config.REPORT_DIR, "page_metrics"))
+    request.node.user_properties.append(("page_metrics", [r["summary"] for r in recorder.records]))
+    logger.info("Page metrics saved: %s", path)
+
+@pytest.fixture(scope="function", autouse=True)
+def dom_snapshots(request) -> Generator[DomSnapshotRecorder | None, None, None]:
+    if not Config.DOM_SNAPSHOTS:
+        yield None
+        return
+    recorder = DomSnapshotRecorder(request.node.nodeid).activate()
+    yield recorder
+    recorder.deactivate()
+    path = recorder.write(os.path.join(Config.REPORT_DIR, "dom_snapshots"))
+    if path:
+        logger.info("DOM snapshots saved: %s", path)
+
+@pytest.fixture(scope="session")
+def driver_pool() -> Generator[DriverPool, None, None]:
+    pool = DriverPool()
+    yield pool
+    pool.close_all()
+    logger.info("Driver pool closed")
+
+@pytest.fixture(scope="session")
+def driver_prefetch() -> Generator[DriverPrefetchQueue, None, None]:
+    prefetch = DriverPrefetchQueue()
+    yield prefetch
+    prefetch.close_all()
+    logger.info("Driver prefetch queue closed")
+
 @pytest.fixture(scope="function")
-def driver(request) -> Generator[WebDriver, None, None]:
+def driver(
+    request, driver_pool: DriverPool, driver_prefetch: DriverPrefetchQueue
+) -> Generator[WebDriver, None, None]:
     driver = None
     test_name = request.node.name
+    pooled = Config.DRIVER_MODE == "pooled" and request.node.get_closest_marker("fresh_driver") is None
+    # Applied by WebDriverFactory; pooled and prefetched drivers are kept apart per profile
+    profile_marker = request.node.get_closest_marker("resource_profile")
+    resource_profile = profile_marker.args[0] if profile_marker else None
     try:
-        driver = WebDriverFactory.get_driver()
-        logger.info(f"WebDriver created for test: {test_name}")
+        if pooled:
+            driver = driver_pool.acquire(resource_profile=resource_profile)
+            logger.info("Pooled WebDriver acquired for test: %s", test_name)
+        elif Config.DRIVER_PREFETCH_DEPTH:
+            driver = driver_prefetch.get(resource_profile=resource_profile)
+            logger.info("Prefetched WebDriver taken for test: %s", test_name)
+        else:
+            driver = WebDriverFactory.get_driver(resource_profile=resource_profile)
+            logger.info("WebDriver created for test: %s", test_name)
+        if Config.STEP_TIMING:
+            StepTimer.instrument_driver(driver)
+        PerformanceLog.clear(driver)
+        ElementCache.reset(driver)
         yield driver
+        if Config.ELEMENT_CACHE:
+            cache_stats = ElementCache.for_driver(driver).stats()
+            request.node.user_properties.append(("element_cache", cache_stats))
+            logger.info("Element cache for %s: %s", test_name, cache_stats)
+        if Config.NETWORK_MODE == "replay" and NetworkTap.for_driver(driver):
+            replay_stats = NetworkTap.for_driver(driver).take_stats()
+            request.node.user_properties.append(("network_replay", replay_stats))
+            logger.info(
+                "Network replay for %s: %s exact, %s loose, %s missed",
+                test_name, replay_stats["exact"], replay_stats["loose"], replay_stats["miss"]
+            )
+        if Config.PERFORMANCE_LOG:
+            blocking_report = ResourceBlocker.report(driver)
+            request.node.user_properties.append(("resource_blocking", blocking_report))
+            logger.info("Resource blocking for %s: %s", test_name, blocking_report)
     except Exception as e:
-        logger.error(f"Driver error in test {test_name}: {e}")
-        if driver:
-            try:
-                ScreenshotUtilsType.take_screenshot_on_failure(driver, test_name)
-            except Exception as screenshot_error:
-                logger.error(f"Failed to take error screenshot: {str(screenshot_error)}")
+        # Artifacts of failed tests are collected by pytest_runtest_makereport
+        logger.error("Driver error in test %s: %s", test_name, e)
         raise
     finally:
-        if driver:
+        if driver and pooled and not FailureArtifacts.settle(driver):
+            # A late artifact collector may still be driving it; don't hand it to the next test
+            driver_pool.discard(driver)
+            logger.info("Pooled WebDriver discarded for test: %s", test_name)
+        elif driver and pooled:
+            driver_pool.release(driver)
+            logger.info("Pooled WebDriver released for test: %s", test_name)
+        elif driver:
             try:
                 driver.quit()
-                logger.info(f"WebDriver closed for test: {test_name}")
+                logger.info("WebDriver closed for test: %s", test_name)
             except Exception as e:
-                logger.warning(f"Error closing WebDriver for test {test_name}: {e}")
+                logger.warning("Error closing WebDriver for test %s: %s", test_name, e)
 
 @pytest.fixture(scope="function")
 def home_page(driver: WebDriver) -> HomePageType:
@@ -83,17 +235,128 @@ def browse_page(driver: WebDriver) -> BrowsePageType:
 def search_results_page(driver: WebDriver) -> SearchResultsPageType:
     return SearchResultsPageType(driver)
 
+def _rerun_count(node) -> int:
+    """Reruns pytest-rerunfailures allows for a test (flaky marker or --reruns)."""
+    marker = node.get_closest_marker("flaky")
+    if marker and "reruns" in marker.kwargs:
+        return marker.kwargs["reruns"]
+    return getattr(node.config.option, "reruns", None) or 0
+
+@pytest.fixture(scope="function")
+def watch_journey(request, driver: WebDriver) -> Generator[Journey, None, None]:
+    marker = request.node.get_closest_marker("under_test")
+    search_term = request.getfixturevalue("search_term") if "search_term" in request.fixturenames else "StarCraft II"
+    checkpoints = None
+    # pytest-rerunfailures numbers the attempts of a test in execution_count
+    attempt = getattr(request.node, "execution_count", 1)
+    # Checkpoints cost a few WebDriver calls per step; only keep them when a rerun can use them
+    if Config.JOURNEY_CHECKPOINTS and _rerun_count(request.node) > 0:
+        checkpoints = JourneyCheckpoints.for_test(request.node.nodeid)
+        if attempt == 1:
+            checkpoints.clear()
+    journey = Journey(
+        watch_streamer_journey(),
+        JourneyContext(driver, search_term),
+        under_test=marker.args if marker else (),
+        checkpoints=checkpoints,
+        resume=attempt > 1,
+    )
+    yield journey
+    if journey.resumed_from:
+        request.node.user_properties.append(("journey_resume", {
+            "attempt": attempt, "step": journey.resumed_from, "time_saved_ms": round(journey.time_saved_ms, 1),
+        }))
+
 @pytest.fixture(scope="function")
 def screenshot_utils() -> ScreenshotUtilsType:
     return ScreenshotUtilsType
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    driver = getattr(item, "funcargs", {}).get("driver")
+    if Config.FAILURE_ARTIFACTS and report.failed and report.when in ("setup", "call") and driver:
+        try:
+            bundle = FailureArtifacts.capture(driver, item.nodeid)
+            report.user_properties.append(("failure_artifacts", bundle))
+        except Exception as e:
+            logger.error("Failed to save failure artifacts for %s: %s", item.nodeid, e)
+
 def pytest_runtest_logreport(report):
+    if report.failed or report.outcome == "rerun":
+        _failed_tests.add(report.nodeid)
+    for name, value in report.user_properties:
+        if name == "step_timings" and report.when == "teardown":
+            for step, duration in value:
+                _step_durations[step].append(duration)
+        if name == "resource_blocking" and report.when == "teardown":
+            _blocked_totals["requests"] += value["blocked_requests"]
+            _blocked_totals["bytes"] += value["estimated_bytes_avoided"]
+        if name == "element_cache" and report.when == "teardown":
+            for counter, count in value.items():
+                _element_cache_totals[counter] += count
+        if name == "journey_resume" and report.when == "teardown":
+            _journey_resumes[(report.nodeid, value["attempt"])] = value
+        if name == "network_replay" and report.when == "teardown":
+            for counter in ("exact", "loose", "miss"):
+                _network_replay_totals[counter] += value[counter]
+            for missed, count in value["missed"].items():
+                _network_replay_misses[missed] += count
     if report.when == "call":
         if report.passed:
-            logger.info(f"Test PASSED: {report.nodeid}")
+            logger.info("Test PASSED: %s", report.nodeid)
         elif report.failed:
-            logger.error(f"Test FAILED: {report.nodeid}")
+            logger.error("Test FAILED: %s", report.nodeid)
             if report.longrepr:
-                logger.error(f"Failure details: {report.longrepr}")
+                logger.error("Failure details: %s", report.longrepr)
         elif report.skipped:
-            logger.warning(f"Test SKIPPED: {report.nodeid}")
+            logger.warning("Test SKIPPED: %s", report.nodeid)
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if _blocked_totals:
+        terminalreporter.write_sep("=", "resource blocking")
+        terminalreporter.write_line(
+            f"Requests avoided: {_blocked_totals['requests']}, "
+            f"estimated bytes avoided: {_blocked_totals['bytes'] / 1024:.0f} KiB"
+        )
+    if _element_cache_totals:
+        terminalreporter.write_sep("=", "element cache")
+        terminalreporter.write_line(
+            f"Cached handles used: {_element_cache_totals['hits']}, "
+            f"elements located: {_element_cache_totals['misses']}, "
+            f"stale handles: {_element_cache_totals['stale']}"
+        )
+    if _journey_resumes:
+        terminalreporter.write_sep("=", "journey checkpoints")
+        for (nodeid, attempt), resume in sorted(_journey_resumes.items()):
+            terminalreporter.write_line(
+                f"{nodeid} attempt {attempt}: resumed after '{resume['step']}', "
+                f"saved {resume['time_saved_ms'] / 1000:.1f}s over a full rerun"
+            )
+        total_saved = sum(resume["time_saved_ms"] for resume in _journey_resumes.values())
+        terminalreporter.write_line(f"Total time saved: {total_saved / 1000:.1f}s")
+    if _network_replay_totals:
+        terminalreporter.write_sep("=", "network replay")
+        terminalreporter.write_line(
+            f"Exact matches: {_network_replay_totals['exact']}, body mismatches served: "
+            f"{_network_replay_totals['loose']}, misses: {_network_replay_totals['miss']}"
+        )
+        if _network_replay_misses:
+            for missed, count in sorted(_network_replay_misses.items(), key=lambda item: -item[1])[:10]:
+                terminalreporter.write_line(f"  {count:>5}  {missed}")
+            misses_path = os.path.join(Config.REPORT_DIR, "network_replay_misses.json")
+            with open(misses_path, "w", encoding="utf-8") as f:
+                json.dump(_network_replay_misses, f, indent=2)
+            terminalreporter.write_line(f"All misses: {misses_path}")
+    if not _step_durations:
+        return
+    summary = {step: summarize(durations) for step, durations in _step_durations.items()}
+    terminalreporter.write_sep("=", "step timings (ms)")
+    terminalreporter.write_line(f"{'step':<60} {'n':>5} {'p50':>10} {'p95':>10}")
+    for step, stats in sorted(summary.items(), key=lambda item: -item[1]["p95"]):
+        terminalreporter.write_line(f"{step:<60} {stats['count']:>5} {stats['p50']:>10.1f} {stats['p95']:>10.1f}")
+    summary_path = os.path.join(Config.REPORT_DIR, "timings", "summary.json")
+    os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
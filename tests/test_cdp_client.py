@@ -0,0 +1,184 @@
+import asyncio
+import json
+import pytest
+from selenium.common.exceptions import InvalidSelectorException, TimeoutException
+from selenium.webdriver.common.by import By
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import AcceptConnection, Request, TextMessage
+from pages import browser_scripts
+from pages.async_base_page import AsyncBasePage
+from pages.async_pages import AsyncSearchResultsPage
+from utils.cdp_client import CDPConnection, CDPError
+
+BUTTON = (By.CSS_SELECTOR, "button.search")
+
+
+class FakeBrowser:
+    """
+    Server end of a DevTools WebSocket: decodes the client's commands from the
+    writer side and feeds replies and events into the client's reader.
+    """
+
+    def __init__(self):
+        self.ws: WSConnection = WSConnection(ConnectionType.SERVER)
+        self.reader: asyncio.StreamReader = asyncio.StreamReader()
+        self.commands: list[dict] = []
+
+    # asyncio.StreamWriter interface used by CDPConnection
+    def write(self, data: bytes) -> None:
+        self.ws.receive_data(data)
+        for event in self.ws.events():
+            if isinstance(event, Request):
+                continue
+            if isinstance(event, TextMessage):
+                self.commands.append(json.loads(event.data))
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def push(self, message: dict) -> None:
+        """Send one DevTools message to the client."""
+        self.reader.feed_data(self.ws.send(TextMessage(data=json.dumps(message))))
+
+
+async def connect() -> tuple[CDPConnection, FakeBrowser]:
+    """Open a CDPConnection to a FakeBrowser, as CDPConnection.connect would."""
+    browser = FakeBrowser()
+    client = WSConnection(ConnectionType.CLIENT)
+    browser.write(client.send(Request(host="127.0.0.1:9222", target="/devtools/browser/1")))
+    client.receive_data(browser.ws.send(AcceptConnection()))
+    list(client.events())
+    connection = CDPConnection(browser.reader, browser, client)
+    connection._read_task = asyncio.create_task(connection._read_loop())
+    return connection, browser
+
+
+async def settle() -> None:
+    """Let the read loop and pending sends run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestCDPConnectionDispatch:
+    """Routing of command results, errors and events by CDPConnection._dispatch."""
+
+    def test_results_resolve_the_matching_command(self) -> None:
+        async def scenario() -> None:
+            connection, browser = await connect()
+            first = asyncio.create_task(connection.send("Page.navigate", {"url": "https://x.test"}, "s1"))
+            second = asyncio.create_task(connection.send("Runtime.enable"))
+            await settle()
+            navigate, enable = browser.commands
+            assert navigate == {"id": navigate["id"], "method": "Page.navigate",
+                                "params": {"url": "https://x.test"}, "sessionId": "s1"}
+            assert "sessionId" not in enable
+            browser.push({"id": enable["id"], "result": {}})
+            browser.push({"id": navigate["id"], "result": {"frameId": "F1"}, "sessionId": "s1"})
+            assert await first == {"frameId": "F1"}
+            assert await second == {}
+            assert connection._pending == {}
+            await connection.close()
+        asyncio.run(scenario())
+
+    def test_error_raises_cdp_error(self) -> None:
+        async def scenario() -> None:
+            connection, browser = await connect()
+            command = asyncio.create_task(connection.send("DOM.getDocument"))
+            await settle()
+            browser.push({"id": browser.commands[0]["id"], "error": {"code": -32000, "message": "Not attached"}})
+            with pytest.raises(CDPError, match=r"Not attached \(-32000\)"):
+                await command
+            await connection.close()
+        asyncio.run(scenario())
+
+    def test_events_reach_global_and_own_session_listeners_only(self) -> None:
+        async def scenario() -> None:
+            connection, browser = await connect()
+            received: list[tuple[str, dict]] = []
+            connection.on("Page.loadEventFired", lambda params: received.append(("any", params)))
+            connection.on("Page.loadEventFired", lambda params: received.append(("s1", params)), "s1")
+            loaded = connection.expect_event("Page.loadEventFired", "s2", lambda params: params["timestamp"] > 1)
+            browser.push({"method": "Page.loadEventFired", "params": {"timestamp": 1}, "sessionId": "s2"})
+            browser.push({"method": "Page.loadEventFired", "params": {"timestamp": 2}, "sessionId": "s1"})
+            browser.push({"method": "Page.loadEventFired", "params": {"timestamp": 3}, "sessionId": "s2"})
+            assert await asyncio.wait_for(loaded, 1) == {"timestamp": 3}
+            assert received == [
+                ("any", {"timestamp": 1}), ("any", {"timestamp": 2}), ("s1", {"timestamp": 2}),
+                ("any", {"timestamp": 3}),
+            ]
+            assert connection._listeners[("s2", "Page.loadEventFired")] == []
+            await connection.close()
+        asyncio.run(scenario())
+
+    def test_closed_connection_fails_pending_commands(self) -> None:
+        async def scenario() -> None:
+            connection, browser = await connect()
+            command = asyncio.create_task(connection.send("Page.navigate", {"url": "https://x.test"}))
+            await settle()
+            browser.reader.feed_eof()
+            with pytest.raises(ConnectionError):
+                await command
+            await connection.wait_closed()
+        asyncio.run(scenario())
+
+
+class FakeSession:
+    """CDPSession stand-in answering Runtime.evaluate from a list of outcomes."""
+
+    def __init__(self, *outcomes):
+        self.outcomes: list = list(outcomes)
+        self.expressions: list[str] = []
+
+    async def evaluate(self, expression: str, await_promise: bool = False, timeout: float | None = None):
+        self.expressions.append(expression)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class TestAsyncWaitRetry:
+    """AsyncBasePage._wait_for across navigations."""
+
+    def test_navigation_during_the_wait_is_retried(self) -> None:
+        session = FakeSession(
+            CDPError("Page script failed: Error: Execution context was destroyed."),
+            CDPError("Cannot find context with specified id (-32000)"),
+            {"ok": True, "value": {}},
+        )
+        asyncio.run(AsyncBasePage(session).wait_for_visible_element(BUTTON, timeout=5))
+        assert len(session.expressions) == 3
+        assert all(browser_scripts.WAIT_FOR_CONDITION in expression for expression in session.expressions)
+
+    def test_other_script_errors_are_raised(self) -> None:
+        session = FakeSession(CDPError("Page script failed: ReferenceError: x is not defined"))
+        with pytest.raises(CDPError, match="ReferenceError"):
+            asyncio.run(AsyncBasePage(session).wait_for_visible_element(BUTTON, timeout=5))
+        assert len(session.expressions) == 1
+
+    def test_invalid_selector_and_timeout(self) -> None:
+        invalid = FakeSession({"ok": False, "error": "SyntaxError: 'button[' is not a valid selector"})
+        with pytest.raises(InvalidSelectorException):
+            asyncio.run(AsyncBasePage(invalid).wait_for_visible_element(BUTTON, timeout=5))
+        timed_out = FakeSession({"ok": False})
+        with pytest.raises(TimeoutException):
+            asyncio.run(AsyncBasePage(timed_out).wait_for_visible_element(BUTTON, timeout=5))
+
+
+class TestAsyncStreamerCards:
+    """Cards read over CDP share the sync page's record type."""
+
+    def test_cards_have_no_element_handles(self) -> None:
+        columns = {
+            "elements": [{}, {}], "title": ["Alpha plays", None], "href": ["/alpha", "/beta"],
+            "channel": ["alpha", "beta"], "category": ["StarCraft II", None],
+            "viewers": ["16.3K viewers", None], "live": [True, False], "clickable": [True, False],
+        }
+        cards = asyncio.run(AsyncSearchResultsPage(FakeSession(columns)).get_streamer_cards())
+        assert [(card.channel, card.viewers, card.element) for card in cards] == [
+            ("alpha", 16300, None), ("beta", None, None),
+        ]
+        assert cards[0].to_info()["stream_title"] == "Alpha plays"
@@ -0,0 +1,204 @@
+import itertools
+import json
+import pytest
+from selenium.common.exceptions import WebDriverException
+from config.config import Config
+from utils import driver_pool as driver_pool_module
+from utils import webdriver_factory as webdriver_factory_module
+from utils.driver_pool import CLEARED_STORAGE_TYPES, DriverPool
+from utils.performance_log import PerformanceLog
+
+_session_ids = itertools.count(1)
+
+
+class _SwitchTo:
+    def __init__(self, driver: "FakeDriver"):
+        self.driver = driver
+
+    def window(self, handle: str) -> None:
+        self.driver.current_handle = handle
+
+
+class FakeDriver:
+    """Records the commands DriverPool sends instead of driving a browser."""
+
+    def __init__(self, origin: str = "https://www.twitch.tv", documents: tuple[str, ...] = ()):
+        self.session_id: str = f"session-{next(_session_ids)}"
+        self.window_handles: list[str] = ["main"]
+        self.current_handle: str = "main"
+        self.switch_to: _SwitchTo = _SwitchTo(self)
+        self.origin: str = origin
+        self.documents: tuple[str, ...] = documents
+        self.cdp_calls: list[tuple[str, dict]] = []
+        self.visited: list[str] = []
+        self.closed: list[str] = []
+        self.alive: bool = True
+        self.quit_called: bool = False
+        self.reject_wildcard: bool = False
+
+    def execute_script(self, script: str, *args):
+        if not self.alive:
+            raise WebDriverException("session deleted")
+        return 1 if script == "return 1;" else self.origin
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        if self.reject_wildcard and params.get("origin") == "*":
+            raise WebDriverException("invalid origin")
+        self.cdp_calls.append((cmd, params))
+        return {}
+
+    def get_log(self, log_type: str) -> list[dict]:
+        documents, self.documents = self.documents, ()
+        return [
+            {"timestamp": 0, "message": json.dumps({"message": {
+                "method": "Network.requestWillBeSent", "params": {"type": "Document", "documentURL": url},
+            }})}
+            for url in documents
+        ]
+
+    def close(self) -> None:
+        self.closed.append(self.current_handle)
+
+    def get(self, url: str) -> None:
+        self.visited.append(url)
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+    def cleared_origins(self) -> list[str]:
+        return [params["origin"] for cmd, params in self.cdp_calls if cmd == "Storage.clearDataForOrigin"]
+
+
+@pytest.fixture
+def created(monkeypatch) -> list[FakeDriver]:
+    """Fake drivers handed out by WebDriverFactory.get_driver, in creation order."""
+    drivers: list[FakeDriver] = []
+
+    def get_driver(*args, **kwargs) -> FakeDriver:
+        drivers.append(FakeDriver())
+        drivers[-1].created_with = args
+        return drivers[-1]
+    monkeypatch.setattr(driver_pool_module.WebDriverFactory, "get_driver", staticmethod(get_driver))
+    return drivers
+
+
+class TestDriverPoolReset:
+    """State cleared by DriverPool.reset between tests."""
+
+    def test_clears_cookies_and_storage_of_every_origin(self) -> None:
+        driver = FakeDriver()
+        driver.window_handles = ["main", "popup"]
+        DriverPool.reset(driver)
+        assert driver.closed == ["popup"]
+        assert driver.current_handle == "main"
+        assert driver.cdp_calls[0] == ("Network.clearBrowserCookies", {})
+        assert driver.cdp_calls[1] == (
+            "Storage.clearDataForOrigin", {"origin": "*", "storageTypes": CLEARED_STORAGE_TYPES}
+        )
+        assert "https://www.twitch.tv" in driver.cleared_origins()
+        assert driver.visited == ["about:blank"]
+
+    def test_clears_origins_visited_during_the_test(self, monkeypatch) -> None:
+        monkeypatch.setattr(Config, "PERFORMANCE_LOG", True)
+        driver = FakeDriver(documents=(
+            "https://www.twitch.tv/directory", "https://id.twitch.tv/oauth2/authorize?x=1",
+            "https://player.twitch.tv/?channel=alpha", "about:blank",
+        ))
+        DriverPool.reset(driver)
+        assert driver.cleared_origins() == [
+            "*", "https://id.twitch.tv", "https://player.twitch.tv", "https://www.twitch.tv",
+        ]
+        PerformanceLog.clear(driver)
+
+    def test_rejected_wildcard_still_clears_visited_origins(self) -> None:
+        driver = FakeDriver()
+        driver.reject_wildcard = True
+        DriverPool.reset(driver)
+        assert driver.cleared_origins() == ["https://www.twitch.tv"]
+
+    def test_blank_page_has_no_origin_to_clear(self) -> None:
+        driver = FakeDriver(origin="null")
+        DriverPool.reset(driver)
+        assert driver.cleared_origins() == ["*"]
+
+
+class TestDriverPoolReuse:
+    """Reuse, recycling and discarding of pooled sessions."""
+
+    def test_released_driver_is_reset_and_reused(self, created: list[FakeDriver]) -> None:
+        pool = DriverPool(max_uses=0)
+        first = pool.acquire()
+        pool.release(first)
+        assert first.visited == ["about:blank"]
+        assert pool.acquire() is first
+        assert len(created) == 1
+
+    def test_recycled_after_max_uses(self, created: list[FakeDriver]) -> None:
+        pool = DriverPool(max_uses=2)
+        for _ in range(2):
+            driver = pool.acquire()
+            pool.release(driver)
+        assert created[0].quit_called
+        assert created[0].visited == ["about:blank"]
+        assert pool.acquire() is created[1]
+        assert len(created) == 2
+
+    def test_options_get_their_own_sessions(self, created: list[FakeDriver]) -> None:
+        pool = DriverPool(max_uses=0)
+        desktop = pool.acquire()
+        pool.release(desktop)
+        mobile = pool.acquire(mobile_device="Pixel 7")
+        assert mobile is not desktop
+        assert pool.acquire() is desktop
+
+    def test_resource_profiles_get_their_own_sessions(self, created: list[FakeDriver]) -> None:
+        pool = DriverPool(max_uses=0)
+        default = pool.acquire()
+        pool.release(default)
+        lean = pool.acquire(resource_profile="lean")
+        assert lean is not default
+        assert lean.created_with == (None, None, None, "lean")
+        assert default.created_with == (None, None, None, Config.RESOURCE_PROFILE)
+        assert pool.acquire(resource_profile=Config.RESOURCE_PROFILE) is default
+
+    def test_dead_idle_driver_is_replaced(self, created: list[FakeDriver]) -> None:
+        pool = DriverPool(max_uses=0)
+        first = pool.acquire()
+        pool.release(first)
+        first.alive = False
+        assert pool.acquire() is created[1]
+        assert first.quit_called
+
+    def test_driver_that_fails_to_reset_is_discarded(self, created: list[FakeDriver]) -> None:
+        pool = DriverPool(max_uses=0)
+        first = pool.acquire()
+        first.alive = False
+        pool.release(first)
+        assert first.quit_called
+        assert pool.acquire() is created[1]
+
+    def test_close_all_quits_idle_and_in_use_drivers(self, created: list[FakeDriver]) -> None:
+        pool = DriverPool(max_uses=0)
+        idle = pool.acquire()
+        in_use = pool.acquire()
+        pool.release(idle)
+        pool.close_all()
+        assert idle.quit_called and in_use.quit_called
+
+
+class TestWebDriverFactorySetup:
+    """Drivers whose setup fails after the browser started."""
+
+    def test_browser_is_quit_when_network_mode_fails(self, monkeypatch) -> None:
+        driver = FakeDriver()
+        factory = driver_pool_module.WebDriverFactory
+        monkeypatch.setattr(Config, "PROFILE_TEMPLATE", False)
+        monkeypatch.setattr(factory, "_create_chrome_driver", staticmethod(lambda *args: driver))
+        monkeypatch.setattr(webdriver_factory_module.ResourceBlocker, "apply", staticmethod(lambda *args: None))
+
+        def fail(driver) -> None:
+            raise ConnectionError("DevTools endpoint unreachable")
+        monkeypatch.setattr(webdriver_factory_module, "attach_network_mode", fail)
+        with pytest.raises(ConnectionError):
+            factory.get_driver("chrome")
+        assert driver.quit_called
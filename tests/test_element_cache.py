@@ -0,0 +1,79 @@
+import pytest
+from selenium.webdriver.common.by import By
+from config.config import Config
+from pages import browser_scripts
+from pages.base_page import BasePage
+from pages.element_cache import ElementCache
+
+BUTTON = (By.CSS_SELECTOR, "button.search")
+
+
+class FakeElement:
+    def __init__(self, name: str):
+        self.name = name
+        self.clicks = 0
+
+    def click(self) -> None:
+        self.clicks += 1
+
+
+class FakeDriver:
+    """Answers the wait engine and cache check scripts and counts round trips."""
+
+    def __init__(self):
+        self.document: str = "1000 https://www.twitch.tv/directory"
+        self.usable: bool = True
+        self.located: list[FakeElement] = []
+        self.round_trips: list[str] = []
+
+    def set_script_timeout(self, seconds: float) -> None:
+        pass
+
+    def execute_async_script(self, script: str, *args) -> dict:
+        assert script == browser_scripts.WAIT_FOR_CONDITION
+        self.round_trips.append("wait")
+        self.located.append(FakeElement(f"button-{len(self.located)}"))
+        return {"ok": True, "value": self.located[-1], "document": self.document}
+
+    def execute_script(self, script: str, *args) -> dict:
+        assert script == browser_scripts.CACHED_ELEMENT_CHECK
+        self.round_trips.append("check")
+        return {"document": self.document, "usable": self.usable}
+
+
+@pytest.fixture
+def page(monkeypatch) -> BasePage:
+    monkeypatch.setattr(Config, "ELEMENT_CACHE", True)
+    monkeypatch.setattr(Config, "WAIT_ENGINE", "browser")
+    return BasePage(FakeDriver())
+
+
+class TestElementCacheRoundTrips:
+    """WebDriver round trips made by BasePage._use_element with the browser wait engine."""
+
+    def test_miss_costs_only_the_wait(self, page: BasePage) -> None:
+        page.click_element(BUTTON)
+        assert page.driver.round_trips == ["wait"]
+        assert ElementCache.for_driver(page.driver).stats() == {"hits": 0, "misses": 1, "stale": 0}
+
+    def test_hit_replaces_the_wait_with_one_check(self, page: BasePage) -> None:
+        page.click_element(BUTTON)
+        page.click_element(BUTTON)
+        assert page.driver.round_trips == ["wait", "check"]
+        assert page.driver.located[0].clicks == 2
+        assert ElementCache.for_driver(page.driver).stats()["hits"] == 1
+
+    def test_unusable_handle_is_located_again(self, page: BasePage) -> None:
+        page.click_element(BUTTON)
+        page.driver.usable = False
+        page.click_element(BUTTON)
+        assert page.driver.round_trips == ["wait", "check", "wait"]
+        assert [e.clicks for e in page.driver.located] == [1, 1]
+
+    def test_document_change_invalidates_the_cache(self, page: BasePage) -> None:
+        page.click_element(BUTTON)
+        page.driver.document = "1000 https://www.twitch.tv/search?term=sc2"
+        page.click_element(BUTTON)
+        page.click_element(BUTTON)
+        assert page.driver.round_trips == ["wait", "check", "wait", "check"]
+        assert ElementCache.for_driver(page.driver).stats() == {"hits": 1, "misses": 2, "stale": 1}
@@ -0,0 +1,98 @@
+import json
+import threading
+import weakref
+import zipfile
+import pytest
+from utils import failure_artifacts
+from utils.failure_artifacts import FailureArtifacts
+
+
+class FakeDriver:
+    """Stands in for the failed test's driver; collectors below never call it."""
+
+    def __init__(self):
+        self.release: threading.Event = threading.Event()
+
+
+def page(driver: FakeDriver) -> bytes:
+    return b'{"url": "https://www.twitch.tv/directory"}'
+
+
+def console(driver: FakeDriver) -> bytes:
+    raise RuntimeError("browser log unavailable")
+
+
+def hung_dom(driver: FakeDriver) -> bytes:
+    driver.release.wait(5)
+    return b"<html></html>"
+
+
+@pytest.fixture(autouse=True)
+def collectors(monkeypatch) -> None:
+    monkeypatch.setattr(failure_artifacts, "COLLECTORS", {
+        "page": ("page.json", page),
+        "console": ("console.json", console),
+        "dom": ("dom.html", hung_dom),
+    })
+    monkeypatch.setattr(FailureArtifacts, "_estimates", {})
+    monkeypatch.setattr(FailureArtifacts, "_late", weakref.WeakKeyDictionary())
+
+
+def read_bundle(path: str) -> tuple[dict, list[str]]:
+    """Return the manifest and the artifact file names of a bundle."""
+    with zipfile.ZipFile(path) as bundle:
+        return json.loads(bundle.read("manifest.json")), sorted(set(bundle.namelist()) - {"manifest.json"})
+
+
+class TestFailureArtifactsCapture:
+    """Collection within the time budget."""
+
+    def test_slow_and_failing_collectors_are_left_out(self, tmp_path) -> None:
+        driver = FakeDriver()
+        manifest, files = read_bundle(FailureArtifacts.capture(driver, "tests/x.py::test_a", 0.2, str(tmp_path)))
+        driver.release.set()
+        assert files == ["page.json"]
+        assert list(manifest["artifacts"]) == ["page"]
+        assert manifest["skipped"] == {
+            "console": "failed: browser log unavailable",
+            "dom": "not ready within the budget",
+        }
+        assert manifest["elapsed_s"] < 2
+        assert "console" not in FailureArtifacts._estimates
+        assert FailureArtifacts.settle(driver, 5)
+
+    def test_settle_is_false_while_a_late_collector_runs(self, tmp_path) -> None:
+        driver = FakeDriver()
+        FailureArtifacts.capture(driver, "tests/x.py::test_b", 0.1, str(tmp_path))
+        assert not FailureArtifacts.settle(driver, 0.1)
+        assert len(FailureArtifacts._late[driver]) == 1
+        driver.release.set()
+        assert FailureArtifacts.settle(driver, 5)
+        assert driver not in FailureArtifacts._late
+        assert FailureArtifacts.settle(driver, 0)
+
+    def test_settle_without_late_collectors(self) -> None:
+        assert FailureArtifacts.settle(FakeDriver(), 0)
+
+
+class TestFailureArtifactsEstimates:
+    """Running capture time estimates deciding which collectors are started."""
+
+    def test_over_budget_estimate_decays_until_the_artifact_is_tried_again(self, tmp_path) -> None:
+        driver = FakeDriver()
+        driver.release.set()
+        FailureArtifacts._estimates["dom"] = 8.0
+        estimates = []
+        for _ in range(3):
+            manifest, _ = read_bundle(FailureArtifacts.capture(driver, "tests/x.py::test_c", 1.0, str(tmp_path)))
+            assert manifest["skipped"]["dom"].endswith("over the budget")
+            estimates.append(FailureArtifacts._estimates["dom"])
+        assert estimates == [4.0, 2.0, 1.0]
+        manifest, files = read_bundle(FailureArtifacts.capture(driver, "tests/x.py::test_c", 1.0, str(tmp_path)))
+        assert "dom" in manifest["artifacts"] and "dom.html" in files
+        assert 0.5 <= FailureArtifacts._estimates["dom"] < 1.0
+
+    def test_estimate_follows_recent_capture_times(self) -> None:
+        FailureArtifacts._update_estimate("page", 0.4)
+        FailureArtifacts._update_estimate("page", 0.2)
+        assert FailureArtifacts._estimates["page"] == pytest.approx(0.3)
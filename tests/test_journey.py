@@ -0,0 +1,191 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+from pages import browser_scripts
+from pages.journey import Journey, JourneyCheckpoint, JourneyCheckpoints, JourneyContext, JourneyStep
+
+
+class FakeDriver:
+    """Just enough of a WebDriver for checkpoints: URL, cookies and web storage."""
+
+    def __init__(self, fail_get: bool = False):
+        self.current_url: str = "https://www.twitch.tv/"
+        self.cookies: list[dict] = []
+        self.local_storage: dict[str, str] = {}
+        self.session_storage: dict[str, str] = {}
+        self.visited: list[str] = []
+        self.fail_get: bool = fail_get
+
+    def get(self, url: str) -> None:
+        if self.fail_get:
+            raise WebDriverException("session deleted")
+        self.visited.append(url)
+        self.current_url = url
+
+    def get_cookies(self) -> list[dict]:
+        return list(self.cookies)
+
+    def delete_all_cookies(self) -> None:
+        self.cookies = []
+
+    def add_cookie(self, cookie: dict) -> None:
+        self.cookies.append(cookie)
+
+    def execute_script(self, script: str, *args):
+        if script == browser_scripts.READ_STORAGE:
+            return {"local": dict(self.local_storage), "session": dict(self.session_storage)}
+        if script == browser_scripts.WRITE_STORAGE:
+            self.local_storage, self.session_storage = dict(args[0]), dict(args[1])
+            return None
+        raise WebDriverException("script not supported by FakeDriver")
+
+
+class StubSteps:
+    """Journey steps that record which path ran and move the fake browser."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+        self.fail: set[str] = set()
+
+    def step(self, name: str, fast: bool = True, standalone: bool = False) -> JourneyStep:
+        def action(path: str):
+            def run(ctx: JourneyContext) -> None:
+                self.calls.append(f"{name}:{path}")
+                if name in self.fail:
+                    raise RuntimeError(f"{name} failed")
+                ctx.driver.current_url = f"https://www.twitch.tv/{name}"
+                ctx.driver.local_storage[name] = path
+                ctx.state[name] = path
+            return run
+        return JourneyStep(name, action("ui"), action("fast") if fast else None, standalone)
+
+
+@pytest.fixture
+def stubs() -> StubSteps:
+    return StubSteps()
+
+
+@pytest.fixture
+def context() -> JourneyContext:
+    return JourneyContext(FakeDriver(), "StarCraft II")
+
+
+def paths(journey: Journey) -> list[str]:
+    return [path for _, path in journey.plan()]
+
+
+class TestJourneyPlan:
+    """Path chosen for each step by Journey.plan()."""
+
+    def test_ui_mode_runs_every_ui_path(self, stubs: StubSteps, context: JourneyContext) -> None:
+        steps = [stubs.step("home"), stubs.step("browse", standalone=True), stubs.step("search")]
+        assert paths(Journey(steps, context, mode="ui")) == ["ui", "ui", "ui"]
+
+    def test_fast_run_collapses_up_to_last_standalone_step(self, stubs: StubSteps, context: JourneyContext) -> None:
+        steps = [
+            stubs.step("home"), stubs.step("browse", standalone=True),
+            stubs.step("search", standalone=True), stubs.step("scroll"), stubs.step("watch"),
+        ]
+        assert paths(Journey(steps, context, mode="fast")) == ["skipped", "skipped", "fast", "fast", "fast"]
+
+    def test_fast_run_without_standalone_step_is_not_collapsed(
+        self, stubs: StubSteps, context: JourneyContext
+    ) -> None:
+        steps = [stubs.step("home"), stubs.step("browse"), stubs.step("search")]
+        assert paths(Journey(steps, context, mode="fast")) == ["fast", "fast", "fast"]
+
+    def test_steps_under_test_split_fast_runs(self, stubs: StubSteps, context: JourneyContext) -> None:
+        steps = [
+            stubs.step("home"), stubs.step("browse", standalone=True), stubs.step("search"),
+            stubs.step("select", standalone=True), stubs.step("watch", standalone=True),
+        ]
+        journey = Journey(steps, context, under_test=["search"], mode="fast")
+        assert paths(journey) == ["skipped", "fast", "ui", "skipped", "fast"]
+
+    def test_steps_without_fast_path_take_ui_path(self, stubs: StubSteps, context: JourneyContext) -> None:
+        steps = [stubs.step("home"), stubs.step("screenshot", fast=False), stubs.step("watch", standalone=True)]
+        assert paths(Journey(steps, context, mode="fast")) == ["fast", "ui", "fast"]
+
+    def test_run_skips_collapsed_steps(self, stubs: StubSteps, context: JourneyContext) -> None:
+        steps = [stubs.step("home"), stubs.step("browse", standalone=True), stubs.step("search")]
+        outcomes = Journey(steps, context, mode="fast").run()
+        assert stubs.calls == ["browse:fast", "search:fast"]
+        assert [(o.name, o.path) for o in outcomes] == [("home", "skipped"), ("browse", "fast"), ("search", "fast")]
+
+    @pytest.mark.parametrize("kwargs", [{"mode": "turbo"}, {"under_test": ["unknown"]}], ids=["mode", "step"])
+    def test_rejects_unknown_mode_or_step(self, stubs: StubSteps, context: JourneyContext, kwargs: dict) -> None:
+        with pytest.raises(ValueError):
+            Journey([stubs.step("home")], context, **kwargs)
+
+
+class TestJourneyResume:
+    """Checkpoints recorded by Journey.run() and restored by a resumed run."""
+
+    def failed_run(self, stubs: StubSteps, steps: list[JourneyStep], checkpoints: JourneyCheckpoints) -> None:
+        """Run the journey once with the "search" step failing, keeping checkpoints."""
+        stubs.fail = {"search"}
+        with pytest.raises(RuntimeError):
+            Journey(steps, JourneyContext(FakeDriver(), "StarCraft II"), mode="ui", checkpoints=checkpoints).run()
+        stubs.fail = set()
+        stubs.calls.clear()
+
+    def test_resume_continues_after_last_completed_step(self, stubs: StubSteps) -> None:
+        steps = [stubs.step("home"), stubs.step("browse"), stubs.step("search"), stubs.step("watch")]
+        checkpoints = JourneyCheckpoints()
+        self.failed_run(stubs, steps, checkpoints)
+        assert [c.step for c in checkpoints.checkpoints] == ["home", "browse"]
+
+        context = JourneyContext(FakeDriver(), "StarCraft II")
+        journey = Journey(steps, context, mode="ui", checkpoints=checkpoints, resume=True)
+        outcomes = journey.run()
+        assert stubs.calls == ["search:ui", "watch:ui"]
+        assert [o.path for o in outcomes] == ["resumed", "resumed", "ui", "ui"]
+        assert journey.resumed_from == "browse"
+        assert context.driver.visited[-1] == "https://www.twitch.tv/browse"
+        assert context.driver.local_storage == {"home": "ui", "browse": "ui", "search": "ui", "watch": "ui"}
+        assert context.state == {"home": "ui", "browse": "ui", "search": "ui", "watch": "ui"}
+        assert [c.step for c in checkpoints.checkpoints] == ["home", "browse", "search", "watch"]
+
+    def test_checkpoint_of_another_step_starts_over(self, stubs: StubSteps) -> None:
+        steps = [stubs.step("home"), stubs.step("browse"), stubs.step("search")]
+        checkpoints = JourneyCheckpoints()
+        self.failed_run(stubs, steps, checkpoints)
+
+        renamed = [stubs.step("home"), stubs.step("directory"), stubs.step("search")]
+        journey = Journey(renamed, JourneyContext(FakeDriver(), "x"), mode="ui", checkpoints=checkpoints, resume=True)
+        journey.run()
+        assert stubs.calls == ["home:ui", "directory:ui", "search:ui"]
+        assert journey.resumed_from is None
+
+    def test_checkpoint_past_the_end_starts_over(self, stubs: StubSteps, context: JourneyContext) -> None:
+        checkpoints = JourneyCheckpoints()
+        checkpoints.save(JourneyCheckpoint("watch", 5, "https://www.twitch.tv/watch", [], {}, {}, {}, 900.0))
+        journey = Journey([stubs.step("home")], context, mode="ui", checkpoints=checkpoints, resume=True)
+        assert [o.path for o in journey.run()] == ["ui"]
+        assert journey.resumed_from is None
+
+    def test_failed_restore_starts_over_with_clean_state(self, stubs: StubSteps) -> None:
+        steps = [stubs.step("home"), stubs.step("browse"), stubs.step("search")]
+        checkpoints = JourneyCheckpoints()
+        self.failed_run(stubs, steps, checkpoints)
+
+        context = JourneyContext(FakeDriver(fail_get=True), "x", state={"leftover": True})
+        journey = Journey(steps, context, mode="ui", checkpoints=checkpoints, resume=True)
+        assert journey._resume(journey.plan()) == (0, 0.0)
+        assert context.state == {}
+        assert journey.outcomes == []
+
+    def test_without_resume_checkpoints_are_ignored(self, stubs: StubSteps) -> None:
+        steps = [stubs.step("home"), stubs.step("browse"), stubs.step("search")]
+        checkpoints = JourneyCheckpoints()
+        self.failed_run(stubs, steps, checkpoints)
+
+        Journey(steps, JourneyContext(FakeDriver(), "x"), mode="ui", checkpoints=checkpoints).run()
+        assert stubs.calls == ["home:ui", "browse:ui", "search:ui"]
+
+    def test_save_drops_checkpoints_of_later_steps(self) -> None:
+        checkpoints = JourneyCheckpoints()
+        for index, step in enumerate(["home", "browse", "search"]):
+            checkpoints.save(JourneyCheckpoint(step, index, "", [], {}, {}, {}, 0.0))
+        checkpoints.save(JourneyCheckpoint("browse", 1, "", [], {}, {}, {}, 0.0))
+        assert [c.step for c in checkpoints.checkpoints] == ["home", "browse"]
+        assert checkpoints.latest().step == "browse"
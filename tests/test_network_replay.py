@@ -0,0 +1,171 @@
+import base64
+import json
+import pytest
+from utils.network_replay import (
+    ARCHIVE_SUFFIX, HarArchive, _paused_request_body, graphql_operations, normalize_url, request_key
+)
+
+GQL_URL = "https://gql.twitch.tv/gql"
+
+
+def gql(operation: str, sha: str = "abc", **variables) -> str:
+    """GraphQL persisted-query body as sent by Twitch."""
+    return json.dumps({
+        "operationName": operation, "variables": variables,
+        "extensions": {"persistedQuery": {"version": 1, "sha256Hash": sha}},
+    })
+
+
+def har_entry(method: str, url: str, body: str | None = None, status: int = 200) -> dict:
+    """
+    Build a minimal HAR 1.2 entry.
+
+    Args:
+        method (str): Request method.
+        url (str): Request URL.
+        body (str | None): Request body (postData.text).
+        status (int): Response status, used to tell entries apart.
+
+    Returns:
+        dict: HAR entry.
+    """
+    request = {"method": method, "url": url, "headers": []}
+    if body is not None:
+        request["postData"] = {"mimeType": "application/json", "text": body}
+    return {"request": request, "response": {"status": status, "headers": [], "content": {"text": ""}}}
+
+
+class TestNormalizeUrl:
+    """URL normalization used for archive lookups."""
+
+    def test_sorts_query_and_drops_fragment(self) -> None:
+        assert normalize_url("https://www.twitch.tv/search?term=sc2&a=1#top") == \
+            "https://www.twitch.tv/search?a=1&term=sc2"
+
+    def test_drops_ignored_params(self) -> None:
+        url = "https://static.twitchcdn.net/app.js?v=2&_=1699999999&cb=42"
+        assert normalize_url(url, ["_", "cb"]) == "https://static.twitchcdn.net/app.js?v=2"
+
+    def test_keeps_blank_and_repeated_values(self) -> None:
+        assert normalize_url("https://x.test/p?b=2&flag=&b=1") == "https://x.test/p?b=1&b=2&flag="
+
+    def test_equivalent_encodings_match(self) -> None:
+        assert normalize_url("https://x.test/search?term=star+craft") == \
+            normalize_url("https://x.test/search?term=star%20craft")
+
+
+class TestRequestKey:
+    """Request keys: method, normalized URL and body hash."""
+
+    def test_method_is_upper_cased(self) -> None:
+        assert request_key("get", "https://x.test/a", None)[0] == "GET"
+
+    def test_no_body_has_empty_hash(self) -> None:
+        assert request_key("GET", "https://x.test/a", None)[2] == ""
+        assert request_key("POST", "https://x.test/a", b"")[2] == ""
+
+    def test_body_hash_depends_on_body_only(self) -> None:
+        first = request_key("POST", GQL_URL, gql("SearchResultsPage").encode())
+        same = request_key("POST", GQL_URL + "#ignored", gql("SearchResultsPage").encode())
+        other = request_key("POST", GQL_URL, gql("ChannelShell").encode())
+        assert first == same
+        assert first[:2] == other[:2] and first[2] != other[2]
+        assert len(first[2]) == 16
+
+    def test_ignored_params_do_not_change_the_key(self) -> None:
+        assert request_key("GET", "https://x.test/a?_=1", None, ["_"]) == \
+            request_key("GET", "https://x.test/a?_=2", None, ["_"])
+
+    def test_paused_request_body_matches_har_body(self) -> None:
+        body = '{"operationName":"SearchResultsPage"}'
+        paused = {"postDataEntries": [{"bytes": base64.b64encode(body.encode()).decode()}]}
+        assert _paused_request_body(paused) == body.encode()
+        assert _paused_request_body({"postData": body}) == body.encode()
+        assert _paused_request_body({}) is None
+
+
+class TestGraphqlOperations:
+    """Operation signatures used for loose GraphQL matching."""
+
+    def test_single_and_batched_operations(self) -> None:
+        assert graphql_operations(gql("SearchResultsPage", term="sc2").encode()) == "SearchResultsPage:abc"
+        batch = "[" + gql("ChannelShell", sha="1") + "," + gql("StreamMetadata", sha="2") + "]"
+        assert graphql_operations(batch.encode()) == "ChannelShell:1,StreamMetadata:2"
+
+    @pytest.mark.parametrize("body", [None, b"", b"not json", b'{"query": "{ user }"}', b"[]", b'[1]', b"\xff"])
+    def test_other_bodies_have_no_operation(self, body: bytes | None) -> None:
+        assert graphql_operations(body) is None
+
+
+class TestHarArchive:
+    """Exact and loose archive matching."""
+
+    ENTRIES = [
+        har_entry("GET", "https://www.twitch.tv/search?term=sc2&_=1", status=200),
+        har_entry("POST", GQL_URL, gql("SearchResultsPage", term="sc2"), status=201),
+        har_entry("POST", GQL_URL, gql("SearchResultsPage", term="sc2"), status=202),
+        har_entry("POST", GQL_URL, gql("SearchResultsPage", term="wow"), status=203),
+        har_entry("POST", GQL_URL, gql("ChannelShell", login="alpha"), status=204),
+        har_entry("POST", "https://x.test/form", "a=1", status=205),
+    ]
+
+    @pytest.fixture
+    def archive(self) -> HarArchive:
+        return HarArchive(self.ENTRIES, ignore_params=["_"], loose=False)
+
+    @pytest.fixture
+    def loose_archive(self) -> HarArchive:
+        return HarArchive(self.ENTRIES, ignore_params=["_"], loose=True)
+
+    @staticmethod
+    def statuses(entries: list[dict]) -> list[int]:
+        return [entry["response"]["status"] for entry in entries]
+
+    def test_exact_match_returns_entries_in_recording_order(self, archive: HarArchive) -> None:
+        key, entries, match = archive.candidates("POST", GQL_URL, gql("SearchResultsPage", term="sc2").encode())
+        assert match == "exact"
+        assert self.statuses(entries) == [201, 202]
+        assert key[:2] == ("POST", GQL_URL)
+
+    def test_exact_match_ignores_cache_busters_and_param_order(self, archive: HarArchive) -> None:
+        _, entries, match = archive.candidates("get", "https://www.twitch.tv/search?_=99&term=sc2", None)
+        assert (match, self.statuses(entries)) == ("exact", [200])
+
+    def test_body_mismatch_is_a_miss_by_default(self, archive: HarArchive) -> None:
+        assert archive.candidates("POST", GQL_URL, gql("SearchResultsPage", term="lol").encode())[1:] == ([], "miss")
+        assert archive.candidates("POST", GQL_URL, gql("StreamMetadata", login="alpha").encode())[1:] == ([], "miss")
+
+    def test_loose_match_same_operation_other_variables(self, loose_archive: HarArchive) -> None:
+        _, entries, match = loose_archive.candidates("POST", GQL_URL, gql("SearchResultsPage", term="lol").encode())
+        assert match == "loose"
+        assert self.statuses(entries) == [201, 202, 203]
+
+    def test_loose_match_never_crosses_operations(self, loose_archive: HarArchive) -> None:
+        body = gql("StreamMetadata", login="alpha").encode()
+        assert loose_archive.candidates("POST", GQL_URL, body)[1:] == ([], "miss")
+        other_hash = gql("SearchResultsPage", sha="def", term="sc2").encode()
+        assert loose_archive.candidates("POST", GQL_URL, other_hash)[1:] == ([], "miss")
+
+    def test_loose_match_requires_graphql_body(self, loose_archive: HarArchive) -> None:
+        assert loose_archive.candidates("POST", "https://x.test/form", b"a=2")[1:] == ([], "miss")
+
+    def test_miss_on_other_method_or_url(self, archive: HarArchive) -> None:
+        assert archive.candidates("GET", GQL_URL, None)[1:] == ([], "miss")
+        assert archive.candidates("GET", "https://www.twitch.tv/search?term=wow", None)[1:] == ([], "miss")
+
+    def test_to_har_keeps_every_entry(self, archive: HarArchive) -> None:
+        har = archive.to_har()
+        assert har["log"]["version"] == "1.2"
+        assert len(har["log"]["entries"]) == len(self.ENTRIES)
+
+    def test_load_reads_archive_files_and_skips_truncated_lines(self, tmp_path) -> None:
+        (tmp_path / ("a" + ARCHIVE_SUFFIX)).write_text(
+            json.dumps(har_entry("GET", "https://x.test/a")) + "\n", encoding="utf-8"
+        )
+        (tmp_path / ("b" + ARCHIVE_SUFFIX)).write_text(
+            json.dumps(har_entry("GET", "https://x.test/b")) + "\n" + '{"request": {"met', encoding="utf-8"
+        )
+        archive = HarArchive.load(str(tmp_path))
+        assert [entry["request"]["url"] for entry in archive.entries] == ["https://x.test/a", "https://x.test/b"]
+        assert HarArchive.load(str(tmp_path)) is archive
+        assert HarArchive.load(str(tmp_path), loose=not archive.loose) is not archive
@@ -0,0 +1,43 @@
+import logging
+import os
+import pytest
+from config.config import Config
+from pages.search_results_page import SearchResultsPage
+from pages.stream_page import StreamPage
+from utils.playback_probe import PlaybackBenchmark
+
+logger = logging.getLogger(__name__)
+
+@pytest.mark.skipif(not Config.PLAYBACK_BENCHMARK, reason="Set PLAYBACK_BENCHMARK=true to run")
+class TestPlaybackBenchmark:
+    """
+    Benchmark: Measure video playback quality across several streamers
+    Steps: Search > Select random streamer > Measure QoE, repeated N times
+    """
+
+    @pytest.mark.parametrize("search_term", ["StarCraft II"], ids=["Search: StarCraft II"])
+    def test_playback_qoe_across_streamers(
+        self,
+        search_results_page: SearchResultsPage,
+        stream_page: StreamPage,
+        search_term: str,
+    ) -> None:
+        """
+        Benchmark scenario: playback QoE distribution over PLAYBACK_BENCHMARK_STREAMS streams.
+        1. Open search results and click a random streamer
+        2. Handle popups and wait for video
+        3. Sample playback (first frame, rebuffers, dropped frames)
+        4. Write per-stream reports and percentiles
+        """
+        def open_stream(index: int) -> None:
+            search_results_page.navigate_to_search_page(search_term)
+            search_results_page.wait_for_search_results_load()
+            search_results_page.select_random_streamer()
+
+        benchmark = PlaybackBenchmark(stream_page)
+        summary = benchmark.run(open_stream, Config.PLAYBACK_BENCHMARK_STREAMS)
+        report_path = benchmark.write(os.path.join(Config.REPORT_DIR, "playback_benchmark.json"))
+        logger.info("Playback benchmark summary: %s (saved to %s)", summary, report_path)
+
+        assert summary["streams"] > 0, f"No stream could be measured: {benchmark.errors}"
+        assert summary["playing_ratio"] > 0, "No measured stream advanced playback"
@@ -0,0 +1,115 @@
+import json
+import shutil
+import subprocess
+import pytest
+from utils.playback_probe import EARLY_PROBE_SCRIPT, OBSERVE_SCRIPT, PlaybackProbe
+
+NODE = shutil.which("node")
+
+# Minimal page for the probe scripts: a manual clock, one <video> and captured listeners.
+# Reads {"early", "observe", "args", "timeline", "videoWidth"} from stdin; timeline entries are [ms, action, value?]:
+# "route" sets location.href, "loadstart"/"timeupdate"/"waiting"/"playing" fire that event,
+# "frame" runs the pending requestVideoFrameCallback, "currentTime" sets it.
+PAGE_HARNESS = """
+var input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+var clock = 0, listeners = {};
+global.window = global;
+global.performance = {now: function () { return clock; }};
+global.location = {href: 'https://www.twitch.tv/search?term=sc2'};
+var video = {
+    tagName: 'VIDEO', currentTime: 0, readyState: 4, videoWidth: input.videoWidth, frameCallback: null,
+    requestVideoFrameCallback: function (cb) { this.frameCallback = cb; },
+    getVideoPlaybackQuality: function () { return {droppedVideoFrames: 3, totalVideoFrames: 300}; }
+};
+global.document = {
+    addEventListener: function (type, fn) { (listeners[type] = listeners[type] || []).push(fn); },
+    querySelector: function () { return video; }
+};
+if (input.early) eval(input.early);
+input.timeline.forEach(function (entry) {
+    clock = entry[0];
+    var action = entry[1];
+    if (action === 'route') location.href = entry[2];
+    else if (action === 'frame') { if (video.frameCallback) video.frameCallback(clock); }
+    else if (action === 'currentTime') video.currentTime = entry[2];
+    else (listeners[action] || []).forEach(function (fn) { fn({target: video}); });
+});
+new Function(input.observe).apply(null, input.args.concat([function (result) {
+    process.stdout.write(JSON.stringify(result));
+}]));
+"""
+
+
+class FakeDriver:
+    """Runs the probe scripts in Node against a scripted page timeline."""
+
+    def __init__(self, timeline: list[list], early: bool = True, video_width: int = 1280):
+        self.timeline = timeline
+        self.early = early
+        self.video_width = video_width
+
+    def execute_async_script(self, script: str, *args) -> dict:
+        assert script == OBSERVE_SCRIPT
+        payload = {
+            "early": EARLY_PROBE_SCRIPT if self.early else None,
+            "observe": script,
+            "args": list(args),
+            "timeline": self.timeline,
+            "videoWidth": self.video_width,
+        }
+        completed = subprocess.run(
+            [NODE, "-e", PAGE_HARNESS], input=json.dumps(payload), capture_output=True, text=True, timeout=10, check=True
+        )
+        return json.loads(completed.stdout)
+
+
+@pytest.mark.skipif(NODE is None, reason="Node.js is needed to run the probe scripts")
+class TestPlaybackProbeFirstFrame:
+    """Time to first frame measured by the in-page probe."""
+
+    def test_ttff_is_measured_from_loadstart_after_a_delayed_route_change(self) -> None:
+        # 5 s on the search page, SPA click to the channel, player starts loading 1.2 s later
+        driver = FakeDriver([
+            [5000, "route", "https://www.twitch.tv/alpha"],
+            [6200, "loadstart"],
+            [6650, "frame"],
+            [7000, "currentTime", 0.3],
+            [7000, "timeupdate"],
+        ])
+        report = PlaybackProbe.measure(driver, "video", 0)
+        assert report.time_to_first_frame_ms == 450
+        assert report.url == "https://www.twitch.tv/alpha"
+        assert (report.dropped_frames, report.total_frames) == (3, 300)
+
+    def test_next_stream_on_the_same_document_is_measured_again(self) -> None:
+        driver = FakeDriver([
+            [1000, "loadstart"],
+            [1300, "frame"],
+            [1300, "waiting"],
+            [1500, "playing"],
+            [9000, "route", "https://www.twitch.tv/beta"],
+            [9500, "loadstart"],
+            [9600, "currentTime", 0.1],
+            [9600, "timeupdate"],
+        ])
+        report = PlaybackProbe.measure(driver, "video", 0)
+        assert report.time_to_first_frame_ms == 100
+        assert report.rebuffer_count == 0
+
+    def test_route_without_a_new_loadstart_is_unknown(self) -> None:
+        driver = FakeDriver([
+            [1000, "loadstart"],
+            [1300, "frame"],
+            [9000, "route", "https://www.twitch.tv/beta"],
+        ])
+        assert PlaybackProbe.measure(driver, "video", 0).time_to_first_frame_ms is None
+
+    def test_late_install_leaves_ttff_unknown(self) -> None:
+        driver = FakeDriver([[2000, "loadstart"], [2100, "frame"]], early=False)
+        assert PlaybackProbe.measure(driver, "video", 0).time_to_first_frame_ms is None
+
+    def test_audio_only_media_has_no_frame_metrics(self) -> None:
+        driver = FakeDriver([[1000, "loadstart"], [1200, "currentTime", 0.2], [1200, "timeupdate"]], video_width=0)
+        report = PlaybackProbe.measure(driver, "video", 0)
+        assert not report.has_video_track
+        assert (report.time_to_first_frame_ms, report.dropped_frames, report.dropped_frame_ratio) == (None, None, None)
@@ -0,0 +1,46 @@
+import pytest
+from utils.resource_profiles import ResourceBlocker
+
+
+class FakeDriver:
+    """Records the CDP commands sent to it."""
+
+    def __init__(self):
+        self.cdp_calls: list[tuple[str, dict]] = []
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        self.cdp_calls.append((cmd, params))
+        return {}
+
+
+class TestResourceBlockerApply:
+    """CDP commands sent by ResourceBlocker.apply."""
+
+    def test_full_profile_on_a_new_driver_sends_nothing(self) -> None:
+        driver = FakeDriver()
+        ResourceBlocker.apply(driver, "full")
+        assert driver.cdp_calls == []
+        assert driver._resource_profile == "full"
+
+    def test_blocking_profile_enables_network_and_sets_patterns(self) -> None:
+        driver = FakeDriver()
+        ResourceBlocker.apply(driver, "lean")
+        assert [cmd for cmd, _ in driver.cdp_calls] == ["Network.enable", "Network.setBlockedURLs"]
+        assert driver.cdp_calls[1][1]["urls"] == ResourceBlocker.blocked_patterns("lean")
+
+    def test_same_profile_is_applied_once(self) -> None:
+        driver = FakeDriver()
+        ResourceBlocker.apply(driver, "no_media")
+        ResourceBlocker.apply(driver, "no_media")
+        assert len(driver.cdp_calls) == 2
+
+    def test_switching_back_to_full_clears_blocked_urls(self) -> None:
+        driver = FakeDriver()
+        ResourceBlocker.apply(driver, "lean")
+        ResourceBlocker.apply(driver, "full")
+        assert driver.cdp_calls[-1] == ("Network.setBlockedURLs", {"urls": []})
+        assert driver._resource_profile == "full"
+
+    def test_unknown_profile_is_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            ResourceBlocker.apply(FakeDriver(), "everything")
@@ -0,0 +1,216 @@
+from html.parser import HTMLParser
+import pytest
+from selenium.webdriver.common.by import By
+from utils.dom_snapshot import DomSnapshot
+from utils.locator_registry import RegisteredLocator
+from utils.locator_replay import replay
+from utils.selector_matcher import UnsupportedSelectorError, compile_locator
+
+RESULTS_HTML = """
+<html><body>
+  <nav id="top-nav" class="nav">
+    <a href="/directory" data-a-target="browse-link">Browse</a>
+    <a href="/search" class="nav-link">Search Twitch</a>
+  </nav>
+  <div id="results" class="grid">
+    <button class="ScCoreLink tw-link" data-href="/alpha">
+      <p title="Alpha plays">Alpha plays</p>
+      <span class="live">LIVE</span>
+    </button>
+    <button class="ScCoreLink tw-link" data-href="/beta">
+      <p title="Beta ladder">Beta ladder</p>
+    </button>
+    <button class="ScCoreLink tw-link disabled" data-href="/gamma" disabled>
+      <p title="Gamma casts">Gamma casts</p>
+      <span class="live">LIVE</span>
+    </button>
+  </div>
+  <input type="text" name="q">
+</body></html>
+"""
+
+VOID_TAGS = {"area", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+
+class _SnapshotBuilder(HTMLParser):
+    """Converts HTML into DomSnapshot elements: [tag, parent index, flat attributes, own text]."""
+
+    def __init__(self):
+        super().__init__()
+        self.elements: list[list] = []
+        self.open: list[int] = []
+
+    def handle_starttag(self, tag, attrs):
+        flat = [part for name, value in attrs for part in (name, value or "")]
+        self.elements.append([tag, self.open[-1] if self.open else -1, flat, ""])
+        if tag not in VOID_TAGS:
+            self.open.append(len(self.elements) - 1)
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_TAGS and self.open:
+            self.open.pop()
+
+    def handle_data(self, data):
+        if self.open and data.strip():
+            self.elements[self.open[-1]][3] += data
+
+
+def snapshot_from_html(html: str, step: str = "search", content_key: int | None = None) -> DomSnapshot:
+    """
+    Build a DomSnapshot from HTML, as the browser-side recorder would.
+
+    Args:
+        html (str): Page markup.
+        step (str): Journey step the snapshot belongs to.
+        content_key (int | None): Content hash, as set by load_snapshots.
+
+    Returns:
+        DomSnapshot: Snapshot of the markup.
+    """
+    builder = _SnapshotBuilder()
+    builder.feed(html)
+    snapshot = DomSnapshot(builder.elements, url="https://www.twitch.tv/search", step=step)
+    snapshot.content_key = content_key
+    return snapshot
+
+
+@pytest.fixture(scope="module")
+def snapshot() -> DomSnapshot:
+    return snapshot_from_html(RESULTS_HTML)
+
+
+def match(snapshot: DomSnapshot, locator: tuple[str, str]) -> list[str]:
+    """Return the tag (and data-href, if any) of each element matching a locator."""
+    result = []
+    for index in compile_locator(locator)(snapshot):
+        href = snapshot.attrs[index].get("data-href")
+        result.append(f"{snapshot.tags[index]}{href}" if href else snapshot.tags[index])
+    return result
+
+
+class TestCssSelectors:
+    """CSS selectors evaluated against a snapshot."""
+
+    @pytest.mark.parametrize("selector, expected", [
+        ("#results > button", ["button/alpha", "button/beta", "button/gamma"]),
+        ("div.grid p[title]", ["p", "p", "p"]),
+        ("button[data-href='/alpha'] + button", ["button/beta"]),
+        ("button[data-href='/alpha'] ~ button", ["button/beta", "button/gamma"]),
+        ("nav > a.nav-link", ["a"]),
+        ("body > p", []),
+        ("button[class*='ScCoreLink'][class*='tw-link']", ["button/alpha", "button/beta", "button/gamma"]),
+        ("button:not(.disabled)", ["button/alpha", "button/beta"]),
+        ("button:disabled", ["button/gamma"]),
+        ("#top-nav a, input[name=q]", ["a", "a", "input"]),
+    ], ids=["child", "descendant", "adjacent sibling", "general sibling", "child with class",
+            "no match", "attribute substring", "not", "disabled", "selector list"])
+    def test_combinators_and_attributes(self, snapshot: DomSnapshot, selector: str, expected: list[str]) -> None:
+        assert match(snapshot, (By.CSS_SELECTOR, selector)) == expected
+
+    @pytest.mark.parametrize("selector, expected", [
+        ("#results > button:nth-child(2)", ["button/beta"]),
+        ("#results > button:nth-child(odd)", ["button/alpha", "button/gamma"]),
+        ("#results > button:nth-child(2n+2)", ["button/beta"]),
+        ("#results > button:first-child", ["button/alpha"]),
+        ("#results > button:last-child", ["button/gamma"]),
+        ("button > span:only-child", []),
+    ])
+    def test_structural_pseudo_classes(self, snapshot: DomSnapshot, selector: str, expected: list[str]) -> None:
+        assert match(snapshot, (By.CSS_SELECTOR, selector)) == expected
+
+    def test_id_class_and_name_strategies(self, snapshot: DomSnapshot) -> None:
+        assert match(snapshot, (By.ID, "results")) == ["div"]
+        assert match(snapshot, (By.CLASS_NAME, "live")) == ["span", "span"]
+        assert match(snapshot, (By.NAME, "q")) == ["input"]
+        assert match(snapshot, (By.TAG_NAME, "button")) == ["button/alpha", "button/beta", "button/gamma"]
+
+
+class TestXPath:
+    """XPath expressions evaluated against a snapshot."""
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("//div[@id='results']/button", ["button/alpha", "button/beta", "button/gamma"]),
+        ("//div[@id='results']/button[2]", ["button/beta"]),
+        ("//div[@id='results']/button[last()]", ["button/gamma"]),
+        ("//button[span[@class='live']]", ["button/alpha", "button/gamma"]),
+        ("//button[not(@disabled)]", ["button/alpha", "button/beta"]),
+        ("//button[contains(@class, 'tw-link') and contains(@data-href, 'a')]",
+         ["button/alpha", "button/beta", "button/gamma"]),
+        ("//p[contains(text(), 'ladder')]/..", ["button/beta"]),
+        ("//button[contains(., 'Gamma')]", ["button/gamma"]),
+        ("//a[starts-with(@href, '/dir')] | //input", ["a", "input"]),
+        ("//p[normalize-space()='Alpha plays']/following::p", ["p", "p"]),
+    ], ids=["child path", "position", "last", "nested predicate", "not", "contains and",
+            "contains text", "contains string value", "union", "following axis"])
+    def test_predicates_and_functions(self, snapshot: DomSnapshot, expression: str, expected: list[str]) -> None:
+        assert match(snapshot, (By.XPATH, expression)) == expected
+
+
+class TestLinkText:
+    """Link text strategies."""
+
+    def test_exact_link_text(self, snapshot: DomSnapshot) -> None:
+        assert match(snapshot, (By.LINK_TEXT, "Browse")) == ["a"]
+        assert match(snapshot, (By.LINK_TEXT, "Search")) == []
+
+    def test_partial_link_text(self, snapshot: DomSnapshot) -> None:
+        indexes = compile_locator((By.PARTIAL_LINK_TEXT, "Search"))(snapshot)
+        assert [snapshot.attrs[i]["href"] for i in indexes] == ["/search"]
+
+
+class TestUnsupportedSelectors:
+    """Locators that need a live browser are rejected, not guessed."""
+
+    @pytest.mark.parametrize("locator", [
+        (By.CSS_SELECTOR, "button:hover"),
+        (By.CSS_SELECTOR, "div::before"),
+        (By.XPATH, "//p/text()"),
+        (By.XPATH, "//button[@data-href"),
+        ("accessibility id", "search"),
+    ], ids=["hover", "pseudo-element", "text node result", "malformed", "unknown strategy"])
+    def test_raises_unsupported_selector_error(self, snapshot: DomSnapshot, locator: tuple[str, str]) -> None:
+        with pytest.raises(UnsupportedSelectorError):
+            compile_locator(locator)(snapshot)
+
+    def test_replay_reports_unsupported_locators(self, snapshot: DomSnapshot) -> None:
+        report = replay([snapshot], [RegisteredLocator("SearchPage", "HOVERED", (By.CSS_SELECTOR, "a:hover"))])
+        assert "SearchPage.HOVERED" in report["unsupported"]
+        assert report["counts"] == {}
+
+
+class TestReplayCardinality:
+    """Cardinality changes reported by locator_replay.replay()."""
+
+    CARD = RegisteredLocator("SearchResultsPage", "STREAMER_CARD", (By.CSS_SELECTOR, "#results > button"))
+    LIVE = RegisteredLocator("SearchResultsPage", "LIVE_BADGE", (By.CSS_SELECTOR, "button:first-child > span.live"))
+
+    def test_counts_zero_and_multiple(self, snapshot: DomSnapshot) -> None:
+        missing = RegisteredLocator("SearchResultsPage", "MISSING", (By.ID, "missing"))
+        report = replay([snapshot], [self.CARD, self.LIVE, missing])
+        assert report["counts"]["SearchResultsPage.STREAMER_CARD"] == {"search": [3, 3]}
+        assert report["zero"] == ["SearchResultsPage.MISSING"]
+        assert report["multiple"] == {"SearchResultsPage.STREAMER_CARD": {"search": 3}}
+        assert report["changed"] == {}
+
+    def test_unstable_within_a_step(self) -> None:
+        with_badge = snapshot_from_html(RESULTS_HTML)
+        without_badge = snapshot_from_html(RESULTS_HTML.replace('<span class="live">LIVE</span>', ""))
+        report = replay([with_badge, without_badge], [self.LIVE])
+        change = report["changed"]["SearchResultsPage.LIVE_BADGE"]["search"]
+        assert change == {"current": [0, 1], "baseline": None, "reason": "unstable"}
+
+    def test_changed_against_baseline(self, snapshot: DomSnapshot) -> None:
+        baseline = {"counts": {"SearchResultsPage.STREAMER_CARD": {"search": [1, 1]}}}
+        report = replay([snapshot], [self.CARD], baseline)
+        change = report["changed"]["SearchResultsPage.STREAMER_CARD"]["search"]
+        assert change == {"current": [3, 3], "baseline": [1, 1], "reason": "baseline"}
+
+    def test_same_cardinality_as_baseline_is_not_a_change(self, snapshot: DomSnapshot) -> None:
+        baseline = {"counts": {"SearchResultsPage.STREAMER_CARD": {"search": [2, 5]}}}
+        assert replay([snapshot], [self.CARD], baseline)["changed"] == {}
+
+    def test_identical_snapshots_matched_once(self) -> None:
+        snapshots = [snapshot_from_html(RESULTS_HTML, content_key=1) for _ in range(3)]
+        report = replay(snapshots, [self.CARD])
+        assert (report["snapshots"], report["unique_snapshots"]) == (3, 1)
+        assert report["unique_snapshots_per_second"] < report["snapshots_per_second"]
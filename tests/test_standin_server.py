@@ -0,0 +1,37 @@
+import json
+import urllib.error
+import urllib.request
+from typing import Generator
+import pytest
+from utils.standin_server import StandInOptions, StandInServer
+
+
+@pytest.fixture(scope="module")
+def standin() -> Generator[StandInServer, None, None]:
+    with StandInServer(StandInOptions(card_count=10)) as server:
+        yield server
+
+
+def get(server: StandInServer, path: str) -> tuple[int, bytes]:
+    """Return the status and body of a GET request to the stand-in server."""
+    try:
+        with urllib.request.urlopen(server.url + path, timeout=5) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+class TestCardsApi:
+    """Lazy loading endpoint /api/cards."""
+
+    def test_returns_requested_batch(self, standin: StandInServer) -> None:
+        status, body = get(standin, "/api/cards?term=sc2&offset=8&limit=5")
+        payload = json.loads(body)
+        assert status == 200
+        assert (payload["next"], payload["done"]) == (10, True)
+        assert payload["html"].count('data-a-target="search-result-card"') == 2
+
+    @pytest.mark.parametrize("query", ["offset=x", "limit=-1", "limit=1e3", "offset=%EF%BC%91"])
+    def test_rejects_malformed_offset_or_limit(self, standin: StandInServer, query: str) -> None:
+        status, _ = get(standin, f"/api/cards?term=sc2&{query}")
+        assert status == 400
@@ -0,0 +1,41 @@
+import json
+import logging
+import queue
+import sys
+from utils.structured_logging import JsonFormatter, _DeferredQueueHandler
+
+
+def make_record(level: int, msg: str, *args, exc_info=None) -> logging.LogRecord:
+    return logging.LogRecord("tests", level, __file__, 1, msg, args, exc_info)
+
+
+class TestDeferredQueueHandler:
+    """Records prepared on the logging thread for the listener."""
+
+    def setup_method(self) -> None:
+        self.queue: queue.Queue = queue.Queue()
+        self.handler = _DeferredQueueHandler(self.queue, logging.INFO)
+
+    def test_emitted_record_keeps_argument_values_at_the_call(self) -> None:
+        streams = ["alpha"]
+        self.handler.emit(make_record(logging.INFO, "Streams: %s", streams))
+        streams.append("beta")
+        record = self.queue.get_nowait()
+        assert (record.msg, record.args) == ("Streams: ['alpha']", None)
+        assert json.loads(JsonFormatter().format(record))["message"] == "Streams: ['alpha']"
+
+    def test_emitted_record_carries_the_rendered_traceback(self) -> None:
+        try:
+            raise ValueError("no video")
+        except ValueError:
+            self.handler.emit(make_record(logging.ERROR, "Playback failed", exc_info=sys.exc_info()))
+        record = self.queue.get_nowait()
+        assert record.exc_info is None
+        assert "ValueError: no video" in json.loads(JsonFormatter().format(record))["exception"]
+        assert logging.Formatter().format(record).endswith("ValueError: no video")
+
+    def test_buffered_debug_record_is_not_formatted(self) -> None:
+        streams = ["alpha"]
+        self.handler.emit(make_record(logging.DEBUG, "Streams: %s", streams))
+        record = self.queue.get_nowait()
+        assert (record.msg, record.args) == ("Streams: %s", (streams,))
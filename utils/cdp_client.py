@@ -0,0 +1,434 @@
+import asyncio
+import itertools
+import json
+import re
+import shutil
+import tempfile
+from typing import Any, Callable
+from urllib.parse import urlsplit
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import AcceptConnection, CloseConnection, Ping, RejectConnection, Request, TextMessage
+from config.config import Config
+from utils.driver_resolver import ChromeDriverResolver
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEVTOOLS_URL_PATTERN = re.compile(r"DevTools listening on (ws://\S+)")
+
+EventCallback = Callable[[dict], None]
+
+
+class CDPError(Exception):
+    """Error returned by Chrome for a DevTools command, or a failed page script."""
+
+
+class CDPConnection:
+    """
+    Chrome DevTools Protocol client over a single asyncio WebSocket.
+
+    One connection to the browser endpoint multiplexes any number of page sessions
+    (flattened `sessionId` routing), so an event loop can drive dozens of tabs
+    concurrently. WebSocket framing is done by wsproto (pinned in requirements.txt).
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, ws: WSConnection):
+        """
+        Initialize CDPConnection. Use connect() instead.
+
+        Args:
+            reader (asyncio.StreamReader): Socket reader.
+            writer (asyncio.StreamWriter): Socket writer.
+            ws (WSConnection): Open wsproto client connection.
+        """
+        self._reader: asyncio.StreamReader = reader
+        self._writer: asyncio.StreamWriter = writer
+        self._ws: WSConnection = ws
+        self._ids: itertools.count = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._listeners: dict[tuple[str | None, str], list[EventCallback]] = {}
+        self._read_task: asyncio.Task | None = None
+
+    @classmethod
+    async def connect(cls, ws_url: str, timeout: float = 10) -> "CDPConnection":
+        """
+        Open a WebSocket connection to a DevTools endpoint.
+
+        Args:
+            ws_url (str): ws:// URL, e.g. from "DevTools listening on ...".
+            timeout (float): Max seconds for the TCP connect and handshake.
+
+        Returns:
+            CDPConnection: Connected client.
+
+        Raises:
+            ConnectionError: If the endpoint rejects the WebSocket handshake.
+        """
+        parts = urlsplit(ws_url)
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(parts.hostname, parts.port), timeout)
+        ws = WSConnection(ConnectionType.CLIENT)
+        writer.write(ws.send(Request(host=parts.netloc, target=parts.path or "/")))
+        await writer.drain()
+
+        async def handshake() -> None:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    raise ConnectionError(f"DevTools endpoint closed during handshake: {ws_url}")
+                ws.receive_data(data)
+                for event in ws.events():
+                    if isinstance(event, AcceptConnection):
+                        return
+                    if isinstance(event, RejectConnection):
+                        raise ConnectionError(f"DevTools endpoint rejected WebSocket: {event.status_code}")
+
+        await asyncio.wait_for(handshake(), timeout)
+        connection = cls(reader, writer, ws)
+        connection._read_task = asyncio.create_task(connection._read_loop())
+        return connection
+
+    async def send(
+        self,
+        method: str,
+        params: dict | None = None,
+        session_id: str | None = None,
+        timeout: float | None = None
+    ) -> dict:
+        """
+        Send a DevTools command and wait for its result.
+
+        Args:
+            method (str): Command name, e.g. "Page.navigate".
+            params (dict | None): Command parameters.
+            session_id (str | None): Target session to route the command to.
+            timeout (float | None): Max seconds to wait. Defaults to Config.EXPLICIT_WAIT * 3.
+
+        Returns:
+            dict: The command result.
+
+        Raises:
+            CDPError: If Chrome returns an error.
+            ConnectionError: If the connection is closed.
+        """
+        command_id = next(self._ids)
+        message: dict[str, Any] = {"id": command_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = future
+        try:
+            self._writer.write(self._ws.send(TextMessage(data=json.dumps(message))))
+            await self._writer.drain()
+            return await asyncio.wait_for(future, timeout or Config.EXPLICIT_WAIT * 3)
+        finally:
+            self._pending.pop(command_id, None)
+
+    def on(self, method: str, callback: EventCallback, session_id: str | None = None) -> None:
+        """
+        Call `callback(params)` for every event of `method` (from `session_id` only, if given).
+
+        Args:
+            method (str): Event name, e.g. "Page.loadEventFired".
+            callback (EventCallback): Called on the event loop with the event params.
+            session_id (str | None): Session the event must come from.
+        """
+        self._listeners.setdefault((session_id, method), []).append(callback)
+
+    def off(self, method: str, callback: EventCallback, session_id: str | None = None) -> None:
+        """Remove a callback registered with on()."""
+        listeners = self._listeners.get((session_id, method), [])
+        if callback in listeners:
+            listeners.remove(callback)
+
+    def expect_event(
+        self,
+        method: str,
+        session_id: str | None = None,
+        predicate: Callable[[dict], bool] | None = None
+    ) -> asyncio.Future:
+        """
+        Start listening for the next event of `method` matching `predicate`.
+
+        Call before triggering the event (e.g. before Page.navigate), then await the
+        returned future, typically with asyncio.wait_for.
+
+        Args:
+            method (str): Event name.
+            session_id (str | None): Session the event must come from.
+            predicate (Callable[[dict], bool] | None): Filter on the event params.
+
+        Returns:
+            asyncio.Future: Resolves to the event params.
+        """
+        future = asyncio.get_running_loop().create_future()
+
+        def callback(params: dict) -> None:
+            if not future.done() and (predicate is None or predicate(params)):
+                future.set_result(params)
+
+        self.on(method, callback, session_id)
+        future.add_done_callback(lambda _: self.off(method, callback, session_id))
+        return future
+
+    async def wait_for_event(
+        self,
+        method: str,
+        session_id: str | None = None,
+        timeout: float | None = None,
+        predicate: Callable[[dict], bool] | None = None
+    ) -> dict:
+        """
+        Wait for the next event of `method` matching `predicate` (see expect_event()).
+
+        Args:
+            method (str): Event name.
+            session_id (str | None): Session the event must come from.
+            timeout (float | None): Max seconds to wait. Defaults to Config.PAGE_LOAD_TIMEOUT.
+            predicate (Callable[[dict], bool] | None): Filter on the event params.
+
+        Returns:
+            dict: The event params.
+        """
+        future = self.expect_event(method, session_id, predicate)
+        return await asyncio.wait_for(future, timeout or Config.PAGE_LOAD_TIMEOUT)
+
+    async def close(self) -> None:
+        """Close the WebSocket and stop the reader."""
+        try:
+            self._writer.write(self._ws.send(CloseConnection(code=1000)))
+            await self._writer.drain()
+        except Exception as e:
+            logger.debug("Error closing DevTools WebSocket: %s", e)
+        self._writer.close()
+        if self._read_task:
+            self._read_task.cancel()
+            await asyncio.gather(self._read_task, return_exceptions=True)
+
+    async def wait_closed(self) -> None:
+        """Wait until the connection is closed, by close() or by the browser going away."""
+        if self._read_task:
+            await asyncio.wait([self._read_task])
+
+    async def _read_loop(self) -> None:
+        """Dispatch command results and events until the connection closes."""
+        fragments: list[str] = []
+        try:
+            while True:
+                data = await self._reader.read(1 << 20)
+                if not data:
+                    break
+                self._ws.receive_data(data)
+                for event in self._ws.events():
+                    if isinstance(event, TextMessage):
+                        fragments.append(event.data)
+                        if event.message_finished:
+                            self._dispatch(json.loads("".join(fragments)))
+                            fragments.clear()
+                    elif isinstance(event, Ping):
+                        self._writer.write(self._ws.send(event.response()))
+                    elif isinstance(event, CloseConnection):
+                        return
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("DevTools connection closed"))
+
+    def _dispatch(self, message: dict) -> None:
+        """Resolve a pending command or notify event listeners."""
+        if "id" in message:
+            future = self._pending.get(message["id"])
+            if future is None or future.done():
+                return
+            if "error" in message:
+                future.set_exception(CDPError(f"{message['error'].get('message')} ({message['error'].get('code')})"))
+            else:
+                future.set_result(message.get("result", {}))
+            return
+        method, params, session_id = message.get("method"), message.get("params", {}), message.get("sessionId")
+        callbacks = list(self._listeners.get((None, method), []))
+        if session_id:
+            callbacks += self._listeners.get((session_id, method), [])
+        for callback in callbacks:
+            callback(params)
+
+
+class CDPSession:
+    """One page (tab) driven through a shared CDPConnection."""
+
+    def __init__(self, connection: CDPConnection, session_id: str, target_id: str):
+        """
+        Initialize CDPSession. Use AsyncBrowser.new_session() instead.
+
+        Args:
+            connection (CDPConnection): Browser connection.
+            session_id (str): Flattened session id of the attached target.
+            target_id (str): Target id of the page.
+        """
+        self.connection: CDPConnection = connection
+        self.session_id: str = session_id
+        self.target_id: str = target_id
+
+    async def send(self, method: str, timeout: float | None = None, **params: Any) -> dict:
+        """Send a DevTools command to this page (see CDPConnection.send)."""
+        return await self.connection.send(method, params, self.session_id, timeout)
+
+    def expect_event(self, method: str, predicate: Callable[[dict], bool] | None = None) -> asyncio.Future:
+        """Start listening for an event from this page (see CDPConnection.expect_event)."""
+        return self.connection.expect_event(method, self.session_id, predicate)
+
+    async def wait_for_event(
+        self, method: str, timeout: float | None = None, predicate: Callable[[dict], bool] | None = None
+    ) -> dict:
+        """Wait for an event from this page (see CDPConnection.wait_for_event)."""
+        return await self.connection.wait_for_event(method, self.session_id, timeout, predicate)
+
+    async def evaluate(self, expression: str, await_promise: bool = False, timeout: float | None = None) -> Any:
+        """
+        Evaluate a JavaScript expression in the page and return its JSON value.
+
+        Args:
+            expression (str): Expression to evaluate.
+            await_promise (bool): Wait for a returned promise to settle.
+            timeout (float | None): Max seconds to wait for the result.
+
+        Returns:
+            Any: The value, serialized by value (DOM nodes become empty objects).
+
+        Raises:
+            CDPError: If the expression throws.
+        """
+        result = await self.send(
+            "Runtime.evaluate", timeout=timeout, expression=expression,
+            awaitPromise=await_promise, returnByValue=True,
+        )
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            description = details.get("exception", {}).get("description") or details.get("text")
+            raise CDPError(f"Page script failed: {description}")
+        return result["result"].get("value")
+
+    async def close(self) -> None:
+        """Close the page."""
+        await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
+
+
+class AsyncBrowser:
+    """
+    Chrome launched with --remote-debugging-port and driven over one CDP connection.
+
+    Example:
+        async with await AsyncBrowser.launch() as browser:
+            sessions = await asyncio.gather(*(browser.new_session() for _ in range(20)))
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process, connection: CDPConnection, user_data_dir: str):
+        """
+        Initialize AsyncBrowser. Use launch() instead.
+
+        Args:
+            process (asyncio.subprocess.Process): Chrome process.
+            connection (CDPConnection): Browser-level DevTools connection.
+            user_data_dir (str): Temporary profile directory, deleted on close.
+        """
+        self.process: asyncio.subprocess.Process = process
+        self.connection: CDPConnection = connection
+        self.user_data_dir: str = user_data_dir
+
+    @classmethod
+    async def launch(cls, headless: bool | None = None, timeout: float = 30) -> "AsyncBrowser":
+        """
+        Start Chrome with a DevTools endpoint on a free port and connect to it.
+
+        Args:
+            headless (bool | None): Headless mode. Defaults to Config.HEADLESS.
+            timeout (float): Max seconds for Chrome to expose its endpoint.
+
+        Returns:
+            AsyncBrowser: Connected browser.
+
+        Raises:
+            RuntimeError: If Chrome cannot be found or does not start.
+        """
+        binary = ChromeDriverResolver.chrome_binary()
+        if not binary:
+            raise RuntimeError("Chrome not found; set CHROME_BINARY")
+        headless = Config.HEADLESS if headless is None else headless
+        user_data_dir = tempfile.mkdtemp(prefix="cdp-profile-")
+        args = [
+            "--remote-debugging-port=0", f"--user-data-dir={user_data_dir}",
+            "--no-first-run", "--no-default-browser-check", "--no-sandbox",
+            "--disable-dev-shm-usage", "--disable-gpu", "--disable-extensions",
+            "--disable-notifications", "--disable-popup-blocking",
+        ]
+        if headless:
+            args.append("--headless=new")
+        process = await asyncio.create_subprocess_exec(
+            binary, *args, "about:blank",
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        )
+
+        async def endpoint() -> str:
+            while True:
+                line = await process.stderr.readline()
+                if not line:
+                    raise RuntimeError(f"Chrome exited before exposing DevTools (code {process.returncode})")
+                match = DEVTOOLS_URL_PATTERN.search(line.decode(errors="replace"))
+                if match:
+                    return match.group(1)
+
+        try:
+            ws_url = await asyncio.wait_for(endpoint(), timeout)
+            connection = await CDPConnection.connect(ws_url)
+        except BaseException:
+            process.kill()
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+            raise
+        # Keep draining stderr so Chrome never blocks on a full pipe
+        asyncio.create_task(cls._drain(process.stderr))
+        logger.info("Chrome started with DevTools endpoint %s", ws_url)
+        return cls(process, connection, user_data_dir)
+
+    async def new_session(self, url: str = "about:blank") -> CDPSession:
+        """
+        Open a new tab and attach to it.
+
+        Args:
+            url (str): Initial URL.
+
+        Returns:
+            CDPSession: Session with the Page and Runtime domains enabled.
+        """
+        target_id = (await self.connection.send("Target.createTarget", {"url": url}))["targetId"]
+        session_id = (await self.connection.send(
+            "Target.attachToTarget", {"targetId": target_id, "flatten": True}
+        ))["sessionId"]
+        session = CDPSession(self.connection, session_id, target_id)
+        await asyncio.gather(session.send("Page.enable"), session.send("Runtime.enable"))
+        return session
+
+    async def close(self) -> None:
+        """Close the connection, stop Chrome and delete its profile."""
+        try:
+            await self.connection.send("Browser.close", timeout=5)
+        except Exception as e:
+            logger.debug("Browser.close failed, terminating Chrome: %s", e)
+        await self.connection.close()
+        if self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+    @staticmethod
+    async def _drain(stream: asyncio.StreamReader) -> None:
+        """Read and discard a stream until EOF."""
+        while await stream.read(65536):
+            pass
+
+    async def __aenter__(self) -> "AsyncBrowser":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
@@ -0,0 +1,312 @@
+import glob
+import gzip
+import json
+import os
+import re
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import cached_property
+from typing import Iterable, Iterator
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from pages import browser_scripts
+import logging
+
+logger = logging.getLogger(__name__)
+
+_active_recorder: ContextVar["DomSnapshotRecorder | None"] = ContextVar("active_dom_snapshot_recorder", default=None)
+
+# Truncation limits keeping snapshots compact (inline SVG paths, data URLs, long copy)
+MAX_ATTRIBUTE_LENGTH: int = 512
+MAX_TEXT_LENGTH: int = 200
+
+
+class DomSnapshot:
+    """
+    The elements of one page, as recorded by browser_scripts.DOM_SNAPSHOT.
+
+    Elements are addressed by their index in document order, so a parent always
+    precedes its children and every subtree is a contiguous index range. Lookup
+    indexes (by tag, id, class and attribute name) are built on first use.
+    """
+
+    def __init__(
+        self,
+        elements: list[list],
+        url: str = "",
+        title: str = "",
+        step: str = "",
+        test: str = "",
+        failed: bool = False,
+        recorded_at: float = 0
+    ):
+        """
+        Initialize DomSnapshot.
+
+        Args:
+            elements (list[list]): [tag, parent index, [name, value, ...], own text] per element.
+            url (str): Page URL.
+            title (str): Page title.
+            step (str): Journey step after which the snapshot was taken.
+            test (str): Test nodeid.
+            failed (bool): Whether the step failed.
+            recorded_at (float): Epoch seconds.
+        """
+        self.elements: list[list] = elements
+        self.url: str = url
+        self.title: str = title
+        self.step: str = step
+        self.test: str = test
+        self.failed: bool = failed
+        self.recorded_at: float = recorded_at
+        self.tags: list[str] = [element[0].lower() for element in elements]
+        self.parents: list[int] = [element[1] for element in elements]
+        self.texts: list[str] = [element[3] for element in elements]
+        self._string_values: dict[int, str] = {}
+        # Hash of the serialized elements when loaded from disk; equal keys mean equal DOMs
+        self.content_key: int | None = None
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DomSnapshot":
+        """Build a snapshot from its to_dict() form."""
+        return cls(
+            data["elements"], data.get("url", ""), data.get("title", ""), data.get("step", ""),
+            data.get("test", ""), data.get("failed", False), data.get("recorded_at", 0),
+        )
+
+    def to_dict(self) -> dict:
+        """Serialize the snapshot to JSON-compatible data (elements last, see load_snapshots)."""
+        return {
+            "test": self.test, "step": self.step, "failed": self.failed, "url": self.url,
+            "title": self.title, "recorded_at": self.recorded_at, "elements": self.elements,
+        }
+
+    @cached_property
+    def attrs(self) -> list[dict[str, str]]:
+        self._attribute_index
+        return self.__dict__["attrs"]
+
+    @cached_property
+    def class_sets(self) -> list[frozenset[str]]:
+        empty = frozenset()
+        return [frozenset(attrs["class"].split()) if "class" in attrs else empty for attrs in self.attrs]
+
+    @cached_property
+    def children(self) -> list[list[int]]:
+        children: list[list[int]] = [[] for _ in self.elements]
+        for index, parent in enumerate(self.parents):
+            if parent >= 0:
+                children[parent].append(index)
+        return children
+
+    @cached_property
+    def roots(self) -> list[int]:
+        return [index for index, parent in enumerate(self.parents) if parent < 0]
+
+    def children_of(self, index: int) -> list[int]:
+        """Element children of an element, or the root elements for -1 (the document)."""
+        return self.roots if index < 0 else self.children[index]
+
+    @cached_property
+    def sibling_position(self) -> list[int]:
+        position = [0] * len(self.elements)
+        for siblings in (self.roots, *self.children):
+            for offset, index in enumerate(siblings):
+                position[index] = offset
+        return position
+
+    @cached_property
+    def subtree_end(self) -> list[int]:
+        """Per element, the index one past its last descendant."""
+        end = list(range(1, len(self.elements) + 1))
+        for index in range(len(self.elements) - 1, -1, -1):
+            parent = self.parents[index]
+            if parent >= 0 and end[index] > end[parent]:
+                end[parent] = end[index]
+        return end
+
+    def descendants(self, index: int) -> range:
+        """Descendants of an element (or every element for -1), in document order."""
+        return range(0, len(self.elements)) if index < 0 else range(index + 1, self.subtree_end[index])
+
+    def descendants_with_tag(self, index: int, tag: str) -> list[int]:
+        """Descendants with the given tag, found by bisecting the tag index."""
+        tagged = self.by_tag.get(tag, [])
+        if index < 0:
+            return tagged
+        return tagged[bisect_left(tagged, index + 1):bisect_left(tagged, self.subtree_end[index])]
+
+    def ancestors(self, index: int) -> list[int]:
+        """Ancestors of an element, nearest first."""
+        result = []
+        index = self.parents[index] if index >= 0 else -1
+        while index >= 0:
+            result.append(index)
+            index = self.parents[index]
+        return result
+
+    def string_value(self, index: int) -> str:
+        """Text content of an element and its descendants (the whole page for -1)."""
+        if index not in self._string_values:
+            indexes = self.descendants(index) if index < 0 else range(index, self.subtree_end[index])
+            self._string_values[index] = "".join(self.texts[i] for i in indexes)
+        return self._string_values[index]
+
+    @cached_property
+    def by_tag(self) -> dict[str, list[int]]:
+        index: dict[str, list[int]] = {}
+        for position, tag in enumerate(self.tags):
+            index.setdefault(tag, []).append(position)
+        return index
+
+    @property
+    def by_id(self) -> dict[str, list[int]]:
+        return self.attribute_values("id")
+
+    @cached_property
+    def by_class(self) -> dict[str, list[int]]:
+        index: dict[str, list[int]] = {}
+        for value, positions in self.attribute_values("class").items():
+            for name in value.split():
+                bucket = index.setdefault(name, [])
+                bucket.extend(positions)
+        for bucket in index.values():
+            bucket.sort()
+        return index
+
+    def attribute_values(self, name: str) -> dict[str, list[int]]:
+        """Elements having attribute `name`, grouped by its value."""
+        return self._attribute_index.get(name, {})
+
+    @cached_property
+    def by_attribute(self) -> dict[str, list[int]]:
+        return {
+            name: sorted(i for positions in values.values() for i in positions)
+            for name, values in self._attribute_index.items()
+        }
+
+    @cached_property
+    def _attribute_index(self) -> dict[str, dict[str, list[int]]]:
+        """Attribute name -> value -> elements, built in the same pass as `attrs`."""
+        attrs_list = []
+        index: dict[str, dict[str, list[int]]] = {}
+        for position, element in enumerate(self.elements):
+            flat = element[2]
+            attrs = dict(zip(flat[::2], flat[1::2]))
+            attrs_list.append(attrs)
+            for name, value in attrs.items():
+                by_value = index.get(name)
+                if by_value is None:
+                    by_value = index[name] = {}
+                bucket = by_value.get(value)
+                if bucket is None:
+                    by_value[value] = [position]
+                else:
+                    bucket.append(position)
+        self.__dict__["attrs"] = attrs_list
+        return index
+
+
+class DomSnapshotRecorder:
+    """
+    Records a DOM snapshot after each journey step of one test.
+
+    Snapshots are written as gzipped JSON lines and replayed offline by
+    utils.locator_replay to check page object locators without a browser.
+    """
+
+    def __init__(self, test_id: str):
+        """
+        Initialize DomSnapshotRecorder.
+
+        Args:
+            test_id (str): Identifier of the test (usually the nodeid).
+        """
+        self.test_id: str = test_id
+        self.snapshots: list[DomSnapshot] = []
+        self._token = None
+
+    @staticmethod
+    def current() -> "DomSnapshotRecorder | None":
+        """Return the recorder active in the current context, if any."""
+        return _active_recorder.get()
+
+    def activate(self) -> "DomSnapshotRecorder":
+        """Make this recorder the active one for the current context."""
+        self._token = _active_recorder.set(self)
+        return self
+
+    def deactivate(self) -> None:
+        """Stop recording into this recorder."""
+        if self._token is not None:
+            _active_recorder.reset(self._token)
+            self._token = None
+
+    def record(self, driver: WebDriver, step: str, failed: bool = False) -> DomSnapshot | None:
+        """
+        Snapshot the current page.
+
+        Args:
+            driver (WebDriver): Driver showing the page.
+            step (str): Journey step that just ran.
+            failed (bool): Whether the step failed.
+
+        Returns:
+            DomSnapshot | None: The snapshot, or None if the page could not be read.
+        """
+        try:
+            data = driver.execute_script(browser_scripts.DOM_SNAPSHOT, MAX_ATTRIBUTE_LENGTH, MAX_TEXT_LENGTH)
+        except WebDriverException as e:
+            logger.warning("Failed to record DOM snapshot after step '%s': %s", step, e)
+            return None
+        snapshot = DomSnapshot(
+            data["elements"], data["url"], data["title"], step, self.test_id, failed, time.time()
+        )
+        self.snapshots.append(snapshot)
+        logger.debug("DOM snapshot after step '%s': %s elements at %s", step, len(snapshot), snapshot.url)
+        return snapshot
+
+    def write(self, directory: str) -> str | None:
+        """
+        Write the recorded snapshots as gzipped JSON lines.
+
+        Args:
+            directory (str): Output directory.
+
+        Returns:
+            str | None: Path of the written file, or None if nothing was recorded.
+        """
+        if not self.snapshots:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, re.sub(r"\W+", "_", self.test_id).strip("_") + ".jsonl.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for snapshot in self.snapshots:
+                f.write(json.dumps(snapshot.to_dict(), separators=(",", ":")) + "\n")
+        return path
+
+
+def load_snapshots(paths: Iterable[str]) -> Iterator[DomSnapshot]:
+    """
+    Read snapshots from files or directories of *.jsonl.gz files.
+
+    Args:
+        paths (Iterable[str]): Snapshot files or directories (searched recursively).
+
+    Yields:
+        DomSnapshot: Each recorded snapshot.
+    """
+    for path in paths:
+        files = sorted(glob.glob(os.path.join(path, "**", "*.jsonl.gz"), recursive=True)) \
+            if os.path.isdir(path) else [path]
+        for file in files:
+            with gzip.open(file, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        snapshot = DomSnapshot.from_dict(json.loads(line))
+                        snapshot.content_key = hash(line[line.find('"elements":'):])
+                        yield snapshot
@@ -0,0 +1,199 @@
+from urllib.parse import urlsplit
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.performance_log import PerformanceLog
+from utils.webdriver_factory import WebDriverFactory
+from config.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (browser name, headless, mobile device, resource profile) a driver was created with
+DriverKey = tuple[str | None, bool | None, str | None, str | None]
+# Storage.clearDataForOrigin types cleared between tests (the HTTP cache is kept warm)
+CLEARED_STORAGE_TYPES: str = "local_storage,indexeddb,service_workers,cache_storage,websql,file_systems"
+
+
+class DriverPool:
+    """
+    Pool of warm WebDriver sessions kept alive for the lifetime of a process.
+
+    Each pytest process (or xdist worker) owns its own pool, so sessions are never
+    shared between workers. Drivers are keyed by the options they were created with,
+    reset between tests and replaced when they stop responding.
+    """
+
+    def __init__(self, max_uses: int | None = None):
+        """
+        Initialize an empty DriverPool.
+
+        Args:
+            max_uses (int | None): Number of tests a session may serve before it is
+                recycled. 0 disables recycling. Defaults to Config.DRIVER_POOL_MAX_USES.
+        """
+        self.max_uses: int = Config.DRIVER_POOL_MAX_USES if max_uses is None else max_uses
+        self._idle: dict[DriverKey, list[WebDriver]] = {}
+        self._in_use: dict[int, tuple[DriverKey, WebDriver]] = {}
+        self._uses: dict[int, int] = {}
+
+    def acquire(
+        self,
+        browser_name: str | None = None,
+        headless: bool | None = None,
+        mobile_device: str | None = None,
+        resource_profile: str | None = None
+    ) -> WebDriver:
+        """
+        Get a healthy driver for the given options, reusing an idle one when possible.
+
+        Args:
+            browser_name (str | None): Browser name passed to WebDriverFactory.
+            headless (bool | None): Headless flag passed to WebDriverFactory.
+            mobile_device (str | None): Mobile emulation device passed to WebDriverFactory.
+            resource_profile (str | None): Request blocking profile passed to WebDriverFactory.
+
+        Returns:
+            WebDriver: A driver ready for a new test.
+        """
+        key: DriverKey = (browser_name, headless, mobile_device, resource_profile or Config.RESOURCE_PROFILE)
+        idle = self._idle.setdefault(key, [])
+        while idle:
+            driver = idle.pop()
+            if self.is_healthy(driver):
+                logger.info("Reusing pooled WebDriver session %s", driver.session_id)
+                break
+            logger.warning("Discarding dead pooled WebDriver session %s", driver.session_id)
+            self._discard(driver)
+        else:
+            driver = WebDriverFactory.get_driver(*key)
+            self._uses[id(driver)] = 0
+            logger.info("Pooled WebDriver session created: %s", driver.session_id)
+
+        self._in_use[id(driver)] = (key, driver)
+        self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver: WebDriver) -> None:
+        """
+        Return a driver to the pool after resetting its state.
+
+        Drivers that fail to reset, are unhealthy or have reached max_uses are quit.
+
+        Args:
+            driver (WebDriver): Driver previously obtained from acquire().
+        """
+        entry = self._in_use.pop(id(driver), None)
+        if entry is None:
+            logger.warning("Releasing a WebDriver that does not belong to this pool")
+            return
+        key = entry[0]
+
+        if self.max_uses and self._uses.get(id(driver), 0) >= self.max_uses:
+            logger.info("Recycling pooled WebDriver session after %s uses", self.max_uses)
+            self._discard(driver)
+            return
+
+        try:
+            self.reset(driver)
+        except WebDriverException as e:
+            logger.warning("Failed to reset pooled WebDriver, discarding it: %s", e)
+            self._discard(driver)
+            return
+        self._idle.setdefault(key, []).append(driver)
+
+    def discard(self, driver: WebDriver) -> None:
+        """
+        Quit a driver obtained from acquire() instead of returning it to the pool.
+
+        Args:
+            driver (WebDriver): Driver previously obtained from acquire().
+        """
+        self._in_use.pop(id(driver), None)
+        self._discard(driver)
+
+    def close_all(self) -> None:
+        """Quit every driver owned by the pool, idle or in use."""
+        for drivers in self._idle.values():
+            for driver in drivers:
+                self._discard(driver)
+        for _, driver in self._in_use.values():
+            self._discard(driver)
+        self._idle.clear()
+        self._in_use.clear()
+        self._uses.clear()
+
+    @staticmethod
+    def reset(driver: WebDriver) -> None:
+        """
+        Reset browser state so the next test starts from a clean page.
+
+        Closes all windows but one, clears cookies and the storage of every origin,
+        and navigates to about:blank. The HTTP cache is kept so the session stays warm.
+
+        Args:
+            driver (WebDriver): Driver to reset.
+
+        Raises:
+            WebDriverException: If the session cannot be reset.
+        """
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        origin = driver.execute_script(
+            "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            "return window.location.origin;"
+        )
+        if hasattr(driver, "execute_cdp_cmd"):
+            # WebDriver only deletes cookies of the current domain; CDP clears all of them
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            # "*" clears every origin; origins seen in the performance log are cleared
+            # one by one as well, in case the browser does not accept the wildcard
+            for storage_origin in ["*", *DriverPool._visited_origins(driver, origin)]:
+                try:
+                    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                        "origin": storage_origin, "storageTypes": CLEARED_STORAGE_TYPES,
+                    })
+                except WebDriverException as e:
+                    logger.debug("Could not clear storage for %s: %s", storage_origin, e)
+        else:
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    @staticmethod
+    def is_healthy(driver: WebDriver) -> bool:
+        """
+        Check that the session still responds to commands.
+
+        Args:
+            driver (WebDriver): Driver to check.
+
+        Returns:
+            bool: True if the session is alive, False otherwise.
+        """
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _visited_origins(driver: WebDriver, current: str | None) -> list[str]:
+        """Origins of the documents loaded by the driver, from the performance log."""
+        origins = {current} if current and current != "null" else set()
+        for event in PerformanceLog.events(driver):
+            if event["method"] == "Network.requestWillBeSent" and event["params"].get("type") == "Document":
+                parts = urlsplit(event["params"].get("documentURL", ""))
+                if parts.scheme in ("http", "https"):
+                    origins.add(f"{parts.scheme}://{parts.netloc}")
+        return sorted(origins)
+
+    def _discard(self, driver: WebDriver) -> None:
+        """Quit a driver, ignoring errors from already-dead sessions."""
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug("Error quitting pooled WebDriver: %s", e)
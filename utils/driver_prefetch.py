@@ -0,0 +1,105 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.driver_pool import DriverKey, DriverPool
+from utils.webdriver_factory import WebDriverFactory
+from config.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPrefetchQueue:
+    """
+    Queue of fresh WebDriver sessions started in the background ahead of use.
+
+    Unlike DriverPool, drivers are never reused: every get() returns a browser that
+    has not served a test yet. While the current test runs, a background thread
+    starts the next `depth` drivers with the same options, so Chrome startup is
+    taken off the test's critical path. Each pytest process (or xdist worker) owns
+    its own queue.
+    """
+
+    def __init__(self, depth: int | None = None):
+        """
+        Initialize an empty DriverPrefetchQueue.
+
+        Args:
+            depth (int | None): Number of drivers kept starting or ready per option
+                set. Defaults to Config.DRIVER_PREFETCH_DEPTH.
+        """
+        self.depth: int = Config.DRIVER_PREFETCH_DEPTH if depth is None else depth
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="driver-prefetch"
+        )
+        self._queues: dict[DriverKey, deque[Future]] = {}
+
+    def get(
+        self,
+        browser_name: str | None = None,
+        headless: bool | None = None,
+        mobile_device: str | None = None,
+        resource_profile: str | None = None
+    ) -> WebDriver:
+        """
+        Take a prefetched driver for the given options and start prefetching the next ones.
+
+        Waits for a prefetched driver that is still starting. Falls back to creating
+        a driver synchronously when none was prefetched or the prefetch failed.
+
+        Args:
+            browser_name (str | None): Browser name passed to WebDriverFactory.
+            headless (bool | None): Headless flag passed to WebDriverFactory.
+            mobile_device (str | None): Mobile emulation device passed to WebDriverFactory.
+            resource_profile (str | None): Request blocking profile passed to WebDriverFactory.
+
+        Returns:
+            WebDriver: A driver that has not been used by any test.
+        """
+        key: DriverKey = (browser_name, headless, mobile_device, resource_profile or Config.RESOURCE_PROFILE)
+        queue = self._queues.setdefault(key, deque())
+        driver = None
+        while queue and driver is None:
+            future = queue.popleft()
+            try:
+                driver = future.result()
+            except Exception as e:
+                logger.warning("Prefetched WebDriver failed to start: %s", e)
+                continue
+            if not DriverPool.is_healthy(driver):
+                logger.warning("Discarding dead prefetched WebDriver session %s", driver.session_id)
+                self._quit(driver)
+                driver = None
+        if driver is None:
+            driver = WebDriverFactory.get_driver(*key)
+        else:
+            logger.info("Using prefetched WebDriver session %s", driver.session_id)
+        self._refill(key)
+        return driver
+
+    def close_all(self) -> None:
+        """Cancel pending prefetches and quit every driver that was started but not taken."""
+        for queue in self._queues.values():
+            for future in queue:
+                if future.cancel():
+                    continue
+                try:
+                    self._quit(future.result())
+                except Exception as e:
+                    logger.debug("Prefetched WebDriver failed to start: %s", e)
+            queue.clear()
+        self._executor.shutdown(wait=True)
+
+    def _refill(self, key: DriverKey) -> None:
+        """Submit background starts until `depth` drivers are pending or ready for key."""
+        queue = self._queues[key]
+        while len(queue) < self.depth:
+            queue.append(self._executor.submit(WebDriverFactory.get_driver, *key))
+
+    @staticmethod
+    def _quit(driver: WebDriver) -> None:
+        """Quit a driver, ignoring errors from already-dead sessions."""
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug("Error quitting prefetched WebDriver: %s", e)
@@ -0,0 +1,267 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from config.config import Config
+from utils.file_lock import FileLock
+import logging
+
+logger = logging.getLogger(__name__)
+
+VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+
+CHROME_CANDIDATES: dict[str, list[str]] = {
+    "linux": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"],
+    "darwin": [
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        "/Applications/Chromium.app/Contents/MacOS/Chromium",
+    ],
+    "win32": [
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    ],
+}
+
+
+class ChromeDriverResolver:
+    """
+    Resolve the chromedriver binary once per machine and reuse it offline.
+
+    The resolved path is pinned to the installed Chrome major version and stored in
+    a JSON manifest under Config.DRIVER_CACHE_DIR. The manifest is written atomically
+    under a file lock, so parallel workers can read it without coordination. Only the
+    first resolution on a machine (or after a Chrome upgrade) may touch the network.
+    """
+
+    _resolved_path: str | None = None
+
+    @classmethod
+    def get_driver_path(cls) -> str:
+        """
+        Get the local chromedriver path, resolving and caching it if needed.
+
+        Returns:
+            str: Absolute path to a chromedriver matching the installed Chrome.
+
+        Raises:
+            RuntimeError: If no matching driver exists locally and downloads are disabled.
+        """
+        if Config.CHROMEDRIVER_PATH:
+            return Config.CHROMEDRIVER_PATH
+        if cls._resolved_path:
+            return cls._resolved_path
+
+        manifest = cls._read_manifest()
+        chrome = cls._chrome_info(manifest)
+        driver_path = cls._lookup(manifest, chrome["major"])
+        if not driver_path:
+            with FileLock(cls._manifest_path() + ".lock"):
+                # Another worker may have resolved it while we waited for the lock
+                manifest = cls._read_manifest()
+                driver_path = cls._lookup(manifest, chrome["major"])
+                if not driver_path:
+                    driver_path = cls._resolve(chrome["major"])
+                    manifest["chrome"] = chrome
+                    manifest.setdefault("drivers", {})[chrome["major"]] = {
+                        "path": driver_path,
+                        "version": cls._binary_version(driver_path),
+                        "resolved_at": datetime.now().isoformat(timespec="seconds"),
+                    }
+                    cls._write_manifest(manifest)
+                    logger.info("Pinned chromedriver for Chrome %s: %s", chrome["major"], driver_path)
+
+        cls._resolved_path = driver_path
+        return driver_path
+
+    @classmethod
+    def chrome_major(cls) -> str:
+        """
+        Get the installed Chrome major version, reusing the manifest's cached value.
+
+        Returns:
+            str: Major version, or "unknown".
+        """
+        return cls._chrome_info(cls._read_manifest())["major"]
+
+    @classmethod
+    def chrome_binary(cls) -> str | None:
+        """
+        Get the Chrome executable used for version detection.
+
+        Returns:
+            str | None: Path to Chrome, or None if it cannot be found.
+        """
+        return cls._find_chrome_binary()
+
+    @classmethod
+    def _resolve(cls, chrome_major: str) -> str:
+        """
+        Find or download a chromedriver matching the Chrome major version.
+
+        Args:
+            chrome_major (str): Installed Chrome major version.
+
+        Returns:
+            str: Path to the chromedriver binary.
+
+        Raises:
+            RuntimeError: If no matching driver is found and downloads are disabled.
+        """
+        on_path = shutil.which("chromedriver")
+        if on_path and cls._major(cls._binary_version(on_path)) == chrome_major:
+            return os.path.abspath(on_path)
+
+        if Config.DRIVER_OFFLINE:
+            raise RuntimeError(
+                f"No chromedriver for Chrome {chrome_major} found and DRIVER_OFFLINE is set. "
+                f"Install one on PATH or set CHROMEDRIVER_PATH."
+            )
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver_path = ChromeDriverManager().install()
+        driver_major = cls._major(cls._binary_version(driver_path))
+        if chrome_major != "unknown" and driver_major != chrome_major:
+            logger.warning(
+                "Downloaded chromedriver %s does not match Chrome %s", driver_major, chrome_major
+            )
+        return os.path.abspath(driver_path)
+
+    @classmethod
+    def _chrome_info(cls, manifest: dict) -> dict:
+        """
+        Get the installed Chrome binary and major version.
+
+        The version from the manifest is reused as long as the binary has not
+        changed on disk, which avoids spawning Chrome on every run.
+
+        Args:
+            manifest (dict): Current manifest contents.
+
+        Returns:
+            dict: Chrome "binary", "mtime", "version" and "major".
+        """
+        binary = cls._find_chrome_binary()
+        mtime = os.path.getmtime(binary) if binary and os.path.exists(binary) else None
+        cached = manifest.get("chrome", {})
+        if binary and cached.get("binary") == binary and cached.get("mtime") == mtime:
+            return cached
+
+        version = cls._chrome_version(binary)
+        return {"binary": binary, "mtime": mtime, "version": version, "major": cls._major(version)}
+
+    @staticmethod
+    def _find_chrome_binary() -> str | None:
+        """
+        Locate the Chrome executable.
+
+        Returns:
+            str | None: Path to Chrome, or None if it cannot be found.
+        """
+        if Config.CHROME_BINARY:
+            return Config.CHROME_BINARY
+        platform = "linux" if sys.platform.startswith("linux") else sys.platform
+        for candidate in CHROME_CANDIDATES.get(platform, []):
+            path = shutil.which(candidate) or (candidate if os.path.exists(candidate) else None)
+            if path:
+                return os.path.realpath(path)
+        return None
+
+    @classmethod
+    def _chrome_version(cls, binary: str | None) -> str:
+        """
+        Read the Chrome version from the binary (or the registry on Windows).
+
+        Args:
+            binary (str | None): Chrome executable path.
+
+        Returns:
+            str: Full version string, or "unknown".
+        """
+        if sys.platform == "win32":
+            try:
+                import winreg
+                with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as key:
+                    return winreg.QueryValueEx(key, "version")[0]
+            except OSError:
+                return "unknown"
+        return cls._binary_version(binary) if binary else "unknown"
+
+    @staticmethod
+    def _binary_version(binary: str) -> str:
+        """
+        Run `<binary> --version` and extract the version number.
+
+        Args:
+            binary (str): Executable path.
+
+        Returns:
+            str: Version string, or "unknown" if it cannot be determined.
+        """
+        try:
+            output = subprocess.run(
+                [binary, "--version"], capture_output=True, text=True, timeout=15
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return "unknown"
+        match = VERSION_PATTERN.search(output)
+        return match.group(0) if match else "unknown"
+
+    @staticmethod
+    def _major(version: str) -> str:
+        """Return the major component of a version string."""
+        return version.split(".", 1)[0]
+
+    @staticmethod
+    def _lookup(manifest: dict, chrome_major: str) -> str | None:
+        """
+        Find a pinned driver path in the manifest that still exists on disk.
+
+        Args:
+            manifest (dict): Manifest contents.
+            chrome_major (str): Installed Chrome major version.
+
+        Returns:
+            str | None: Driver path if pinned and present, otherwise None.
+        """
+        entry = manifest.get("drivers", {}).get(chrome_major)
+        if entry and os.path.isfile(entry["path"]):
+            return entry["path"]
+        return None
+
+    @staticmethod
+    def _manifest_path() -> str:
+        """Return the manifest file location."""
+        return os.path.join(Config.DRIVER_CACHE_DIR, "chromedriver_manifest.json")
+
+    @classmethod
+    def _read_manifest(cls) -> dict:
+        """
+        Load the manifest, treating a missing or corrupt file as empty.
+
+        Returns:
+            dict: Manifest contents.
+        """
+        try:
+            with open(cls._manifest_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def _write_manifest(cls, manifest: dict) -> None:
+        """
+        Atomically replace the manifest so concurrent readers never see a partial file.
+
+        Args:
+            manifest (dict): Manifest contents to write.
+        """
+        path = cls._manifest_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,192 @@
+"""
+Failure artifacts captured concurrently within a time budget.
+
+When a test fails, the screenshot, DOM, browser console log, page URL and recent
+network events are collected in parallel and saved as one zip per failure under
+REPORT_DIR/failures. Collection stops at FAILURE_ARTIFACT_BUDGET_S: artifacts not
+ready by then are left out, and artifacts whose typical capture time exceeds the
+budget are not started at all, so a hung page cannot stall the suite. Collectors
+still running after the budget are tracked per driver; call settle() before the
+driver is reused so they no longer touch it.
+"""
+import json
+import os
+import re
+import threading
+import time
+import weakref
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.performance_log import PerformanceLog
+from config.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest capture time in each artifact's running estimate
+ESTIMATE_WEIGHT: float = 0.5
+
+
+def _page(driver: WebDriver) -> bytes:
+    return json.dumps({"url": driver.current_url, "title": driver.title}, indent=2).encode("utf-8")
+
+
+def _screenshot(driver: WebDriver) -> bytes:
+    return driver.get_screenshot_as_png()
+
+
+def _dom(driver: WebDriver) -> bytes:
+    return driver.page_source.encode("utf-8")
+
+
+def _console(driver: WebDriver) -> bytes:
+    return json.dumps(driver.get_log("browser"), indent=2).encode("utf-8")
+
+
+def _network(driver: WebDriver) -> bytes:
+    if not Config.PERFORMANCE_LOG:
+        raise RuntimeError("PERFORMANCE_LOG is disabled")
+    events = [e for e in PerformanceLog.events(driver) if (e["method"] or "").startswith("Network.")]
+    return json.dumps(events).encode("utf-8")
+
+
+# Artifact name: (file name in the bundle, collector)
+COLLECTORS: dict[str, tuple[str, Callable[[WebDriver], bytes]]] = {
+    "page": ("page.json", _page),
+    "screenshot": ("screenshot.png", _screenshot),
+    "dom": ("dom.html", _dom),
+    "console": ("console.json", _console),
+    "network": ("network.json", _network),
+}
+
+
+class FailureArtifacts:
+    """Collects failure artifacts from a driver into a zip bundle."""
+
+    # Running capture time estimate (s) per artifact, across the failures of this process
+    _estimates: dict[str, float] = {}
+    _lock: threading.Lock = threading.Lock()
+    # Collectors still running after their budget, per driver
+    _late: "weakref.WeakKeyDictionary[WebDriver, list[Future]]" = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def capture(
+        cls,
+        driver: WebDriver,
+        test_id: str,
+        budget_s: float | None = None,
+        directory: str | None = None
+    ) -> str:
+        """
+        Collect every artifact in parallel and write the ones ready within the budget.
+
+        Args:
+            driver (WebDriver): Driver of the failed test.
+            test_id (str): Test node id, used for the bundle name.
+            budget_s (float | None): Total collection time. Defaults to Config.FAILURE_ARTIFACT_BUDGET_S.
+            directory (str | None): Output directory. Defaults to REPORT_DIR/failures.
+
+        Returns:
+            str: Path of the zip bundle. Its manifest.json lists the artifacts with
+            their capture times and the ones left out, with the reason.
+        """
+        budget_s = Config.FAILURE_ARTIFACT_BUDGET_S if budget_s is None else budget_s
+        started = time.perf_counter()
+        manifest: dict = {"test": test_id, "budget_s": budget_s, "artifacts": {}, "skipped": {}}
+        jobs: dict[Future, str] = {}
+        executor = ThreadPoolExecutor(max_workers=len(COLLECTORS), thread_name_prefix="failure-artifacts")
+        for name, (_, collect) in COLLECTORS.items():
+            estimate = cls._estimates.get(name)
+            if estimate is not None and estimate > budget_s:
+                manifest["skipped"][name] = f"usually takes {estimate:.2f}s, over the budget"
+                # Decay the estimate so the artifact is tried again after a few skips
+                cls._update_estimate(name, 0.0)
+                continue
+            jobs[executor.submit(cls._timed, collect, driver)] = name
+        # Late collectors keep running in the background; only their estimates are kept
+        executor.shutdown(wait=False)
+        done, not_done = wait(jobs, timeout=budget_s)
+
+        files: dict[str, bytes] = {}
+        for future in done:
+            name = jobs[future]
+            try:
+                data, seconds = future.result()
+            except Exception as e:
+                manifest["skipped"][name] = f"failed: {e}"
+                continue
+            cls._update_estimate(name, seconds)
+            file_name = COLLECTORS[name][0]
+            files[file_name] = data
+            manifest["artifacts"][name] = {"file": file_name, "seconds": round(seconds, 3), "bytes": len(data)}
+        for future in not_done:
+            name = jobs[future]
+            manifest["skipped"][name] = "not ready within the budget"
+            future.add_done_callback(lambda f, name=name: cls._record_late(name, f))
+        if not_done:
+            with cls._lock:
+                cls._late.setdefault(driver, []).extend(not_done)
+        manifest["elapsed_s"] = round(time.perf_counter() - started, 3)
+
+        directory = directory or os.path.join(Config.REPORT_DIR, "failures")
+        os.makedirs(directory, exist_ok=True)
+        safe_name = re.sub(r"\W+", "_", test_id).strip("_")
+        path = os.path.join(directory, f"{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.zip")
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as bundle:
+            bundle.writestr("manifest.json", json.dumps(manifest, indent=2))
+            for file_name, data in files.items():
+                # PNG data is already compressed
+                bundle.writestr(file_name, data, zipfile.ZIP_STORED if file_name.endswith(".png") else None)
+        logger.info(
+            "Failure artifacts for %s saved in %.2fs: %s (left out: %s)",
+            test_id, manifest["elapsed_s"], path, sorted(manifest["skipped"]) or "none",
+        )
+        return path
+
+    @classmethod
+    def settle(cls, driver: WebDriver, timeout_s: float | None = None) -> bool:
+        """
+        Wait for collectors still using a driver after their budget ran out.
+
+        Call before handing the driver to another test; a driver that does not
+        settle should be quit rather than reused.
+
+        Args:
+            driver (WebDriver): Driver passed to capture().
+            timeout_s (float | None): Max wait. Defaults to Config.FAILURE_ARTIFACT_BUDGET_S.
+
+        Returns:
+            bool: True if no collector is still running on the driver.
+        """
+        with cls._lock:
+            pending = cls._late.pop(driver, [])
+        if not pending:
+            return True
+        timeout_s = Config.FAILURE_ARTIFACT_BUDGET_S if timeout_s is None else timeout_s
+        _, not_done = wait(pending, timeout=timeout_s)
+        if not_done:
+            with cls._lock:
+                cls._late.setdefault(driver, []).extend(not_done)
+            logger.warning("%s failure artifact collectors still running after %.2fs", len(not_done), timeout_s)
+        return not not_done
+
+    @staticmethod
+    def _timed(collect: Callable[[WebDriver], bytes], driver: WebDriver) -> tuple[bytes, float]:
+        started = time.perf_counter()
+        return collect(driver), time.perf_counter() - started
+
+    @classmethod
+    def _update_estimate(cls, name: str, seconds: float) -> None:
+        with cls._lock:
+            previous = cls._estimates.get(name)
+            cls._estimates[name] = seconds if previous is None else \
+                ESTIMATE_WEIGHT * seconds + (1 - ESTIMATE_WEIGHT) * previous
+
+    @classmethod
+    def _record_late(cls, name: str, future: Future) -> None:
+        """Learn the capture time of an artifact that finished after the budget."""
+        if not future.cancelled() and future.exception() is None:
+            cls._update_estimate(name, future.result()[1])
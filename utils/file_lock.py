@@ -0,0 +1,81 @@
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FileLock:
+    """
+    Cross-process lock backed by an exclusively created lock file.
+
+    Used to serialize one-time, machine-wide setup (driver resolution, profile
+    templates) between parallel pytest workers. Readers never need the lock as long
+    as writers replace files atomically.
+    """
+
+    def __init__(self, path: str, timeout: float = 120, stale_after: float = 600):
+        """
+        Initialize FileLock.
+
+        Args:
+            path (str): Path of the lock file to create.
+            timeout (float): Max seconds to wait for the lock.
+            stale_after (float): Age in seconds after which an existing lock file
+                is considered abandoned and removed.
+        """
+        self.path: str = path
+        self.timeout: float = timeout
+        self.stale_after: float = stale_after
+        self._fd: int | None = None
+
+    def acquire(self) -> None:
+        """
+        Block until the lock is held.
+
+        Raises:
+            TimeoutError: If the lock cannot be acquired within the timeout.
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._fd, str(os.getpid()).encode())
+                return
+            except FileExistsError:
+                self._remove_if_stale()
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for lock: {self.path}")
+                time.sleep(0.1)
+
+    def release(self) -> None:
+        """Release the lock if held."""
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _remove_if_stale(self) -> None:
+        """Remove the lock file if its owner has clearly abandoned it."""
+        try:
+            age = time.time() - os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return
+        if age > self.stale_after:
+            logger.warning("Removing stale lock file: %s", self.path)
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
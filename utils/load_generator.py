@@ -0,0 +1,318 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable
+from selenium.webdriver.remote.webdriver import WebDriver
+from pages.journey import Journey, JourneyContext, JourneyStep, watch_streamer_journey
+from utils.driver_pool import DriverPool
+from utils.standin_server import StandInOptions, StandInServer
+from utils.stats import summarize
+from utils.webdriver_factory import WebDriverFactory
+from config.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadOptions:
+    """Shape of a load run."""
+
+    users: int = 5
+    ramp_up_s: float = 30
+    duration_s: float = 300
+    # Upper bound on journeys started per minute across all users (0 = unlimited)
+    journeys_per_minute: float = 0
+    search_term: str = "StarCraft II"
+    journey_mode: str = "ui"
+    under_test: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_config(cls) -> "LoadOptions":
+        """
+        Build options from Config (and therefore from environment variables).
+
+        Returns:
+            LoadOptions: Options reflecting the current configuration.
+        """
+        return cls(
+            users=Config.LOAD_USERS,
+            ramp_up_s=Config.LOAD_RAMP_UP_SECONDS,
+            duration_s=Config.LOAD_DURATION_SECONDS,
+            journeys_per_minute=Config.LOAD_JOURNEYS_PER_MINUTE,
+            journey_mode=Config.JOURNEY_MODE,
+        )
+
+
+@dataclass
+class JourneyRecord:
+    """Result of one journey run by one virtual user."""
+
+    user: int
+    started_s: float
+    duration_ms: float
+    steps: list[tuple[str, float]]
+    failed_step: str | None = None
+    error: str | None = None
+
+
+class RateLimiter:
+    """Spaces journey starts evenly so all users together stay under a target rate."""
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize RateLimiter.
+
+        Args:
+            per_minute (float): Max starts per minute; 0 disables limiting.
+        """
+        self.interval: float = 60 / per_minute if per_minute else 0
+        self._next: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+
+    def wait(self, stop: threading.Event) -> bool:
+        """
+        Block until the next start slot.
+
+        Args:
+            stop (threading.Event): Abandons the wait when set.
+
+        Returns:
+            bool: True if a slot was granted, False if stopped while waiting.
+        """
+        if not self.interval:
+            return not stop.is_set()
+        with self._lock:
+            slot = max(self._next, time.monotonic())
+            self._next = slot + self.interval
+        return not stop.wait(max(0.0, slot - time.monotonic()))
+
+
+class LoadGenerator:
+    """
+    Runs the user journey concurrently as synthetic users and reports throughput,
+    error rate and latency percentiles per journey step.
+
+    Each virtual user owns one browser for the whole run and resets it between
+    journeys. Users start evenly spread over the ramp-up, then keep running journeys
+    until the steady-state duration ends or the run is interrupted.
+    """
+
+    def __init__(
+        self,
+        options: LoadOptions,
+        steps_factory: Callable[[], list[JourneyStep]] = watch_streamer_journey,
+        driver_factory: Callable[[], WebDriver] = WebDriverFactory.get_driver
+    ):
+        """
+        Initialize LoadGenerator.
+
+        Args:
+            options (LoadOptions): Users, ramp-up, duration and rate limit.
+            steps_factory (Callable[[], list[JourneyStep]]): Builds the journey steps.
+            driver_factory (Callable[[], WebDriver]): Creates one browser per user.
+        """
+        self.options: LoadOptions = options
+        self.steps_factory: Callable[[], list[JourneyStep]] = steps_factory
+        self.driver_factory: Callable[[], WebDriver] = driver_factory
+        self.records: list[JourneyRecord] = []
+        self.interrupted: bool = False
+        self._lock: threading.Lock = threading.Lock()
+        self._stop: threading.Event = threading.Event()
+        self._limiter: RateLimiter = RateLimiter(options.journeys_per_minute)
+        self._started: float = 0
+        self._elapsed: float = 0
+
+    def run(self) -> dict:
+        """
+        Run the load and return the report. Ctrl-C stops all users after their
+        current journey and still returns a (partial) report.
+
+        Returns:
+            dict: See report().
+        """
+        self._started = time.monotonic()
+        deadline = self._started + self.options.ramp_up_s + self.options.duration_s
+        threads = [
+            threading.Thread(target=self._user, args=(user, deadline), name=f"load-user-{user}", daemon=True)
+            for user in range(self.options.users)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                if self._stop.wait(0.5):
+                    break
+        except KeyboardInterrupt:
+            logger.warning("Load run interrupted, stopping users after their current journey")
+            self.interrupted = True
+            self._stop.set()
+            try:
+                for thread in threads:
+                    thread.join(timeout=max(Config.PAGE_LOAD_TIMEOUT, Config.EXPLICIT_WAIT) * 2)
+            except KeyboardInterrupt:
+                logger.warning("Second interrupt, reporting without waiting for users")
+        self._stop.set()
+        self._elapsed = time.monotonic() - self._started
+        return self.report()
+
+    def _user(self, user: int, deadline: float) -> None:
+        """Run journeys as one virtual user until the deadline or a stop."""
+        if self.options.users > 1 and self._stop.wait(self.options.ramp_up_s * user / self.options.users):
+            return
+        driver = None
+        try:
+            while time.monotonic() < deadline and self._limiter.wait(self._stop):
+                if driver is None:
+                    driver = self.driver_factory()
+                driver = self._run_journey(user, driver)
+        except Exception as e:
+            logger.error("Load user %s stopped: %s", user, e)
+        finally:
+            if driver:
+                try:
+                    driver.quit()
+                except Exception as e:
+                    logger.debug("Error quitting load user %s driver: %s", user, e)
+
+    def _run_journey(self, user: int, driver: WebDriver) -> WebDriver | None:
+        """
+        Run one journey and record it.
+
+        Returns:
+            WebDriver | None: The driver to reuse, or None if it must be replaced.
+        """
+        steps = self.steps_factory()
+        journey = Journey(
+            steps, JourneyContext(driver, self.options.search_term),
+            self.options.under_test, self.options.journey_mode
+        )
+        started = time.monotonic()
+        failed_step = error = None
+        try:
+            journey.run()
+        except Exception as e:
+            executed = len(journey.outcomes)
+            failed_step = steps[executed].name if executed < len(steps) else "unknown"
+            error = f"{type(e).__name__}: {e}"
+            logger.warning("Load user %s journey failed at '%s': %s", user, failed_step, error)
+        record = JourneyRecord(
+            user=user,
+            started_s=started - self._started,
+            duration_ms=(time.monotonic() - started) * 1000,
+            steps=[(o.name, o.duration_ms) for o in journey.outcomes if o.path != "skipped"],
+            failed_step=failed_step,
+            error=error,
+        )
+        with self._lock:
+            self.records.append(record)
+        try:
+            DriverPool.reset(driver)
+            return driver
+        except Exception as e:
+            logger.warning("Load user %s browser could not be reset, replacing it: %s", user, e)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return None
+
+    def report(self) -> dict:
+        """
+        Summarize the journeys recorded so far.
+
+        Returns:
+            dict: options, elapsed time, journeys, errors, error rate, throughput per
+            minute, journey latency and per-step latency (summarize() stats, ms),
+            and errors per failed step.
+        """
+        with self._lock:
+            records = list(self.records)
+        elapsed = self._elapsed or (time.monotonic() - self._started if self._started else 0)
+        failed = [r for r in records if r.error]
+        succeeded = [r for r in records if not r.error]
+        step_durations: dict[str, list[float]] = defaultdict(list)
+        for record in records:
+            for name, duration in record.steps:
+                step_durations[name].append(duration)
+        errors_by_step: dict[str, int] = defaultdict(int)
+        for record in failed:
+            errors_by_step[record.failed_step] += 1
+        return {
+            "options": asdict(self.options),
+            "interrupted": self.interrupted,
+            "elapsed_s": round(elapsed, 1),
+            "journeys": len(records),
+            "errors": len(failed),
+            "error_rate": len(failed) / len(records) if records else None,
+            "throughput_per_minute": len(succeeded) / elapsed * 60 if elapsed else None,
+            "journey_ms": summarize([r.duration_ms for r in succeeded]),
+            "steps_ms": {name: summarize(durations) for name, durations in step_durations.items()},
+            "errors_by_step": dict(errors_by_step),
+        }
+
+    def write(self, path: str) -> str:
+        """
+        Write the report and every journey record as JSON.
+
+        Args:
+            path (str): Output file path.
+
+        Returns:
+            str: The path written.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"report": self.report(), "records": [asdict(r) for r in self.records]}, f, indent=2)
+        return path
+
+
+def main() -> None:
+    """Run a load test from the command line."""
+    defaults = LoadOptions.from_config()
+    parser = argparse.ArgumentParser(description="Run concurrent synthetic user journeys.")
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--ramp-up", type=float, default=defaults.ramp_up_s, help="seconds")
+    parser.add_argument("--duration", type=float, default=defaults.duration_s, help="steady state seconds")
+    parser.add_argument("--rate", type=float, default=defaults.journeys_per_minute, help="max journeys per minute")
+    parser.add_argument("--search-term", default=defaults.search_term)
+    parser.add_argument("--journey-mode", choices=["ui", "fast"], default=defaults.journey_mode)
+    parser.add_argument("--under-test", nargs="*", default=[], help="steps kept on the UI path in fast mode")
+    parser.add_argument("--url", default=None, help="site to load (defaults to TWITCH_URL)")
+    parser.add_argument("--standin", action="store_true", help="serve and load the local stand-in site")
+    parser.add_argument("--output", default=None, help="JSON report path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    options = LoadOptions(
+        users=args.users, ramp_up_s=args.ramp_up, duration_s=args.duration,
+        journeys_per_minute=args.rate, search_term=args.search_term,
+        journey_mode=args.journey_mode, under_test=args.under_test,
+    )
+    server = None
+    if args.standin:
+        server = StandInServer(StandInOptions.from_config(), port=Config.STANDIN_PORT).start()
+        Config.TWITCH_URL = server.url
+    elif args.url:
+        Config.TWITCH_URL = args.url.rstrip("/")
+    try:
+        generator = LoadGenerator(options)
+        report = generator.run()
+    finally:
+        if server:
+            server.stop()
+    output = args.output or os.path.join(
+        Config.REPORT_DIR, "load", f"load_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    generator.write(output)
+    print(json.dumps(report, indent=2))
+    logger.info("Load report saved: %s", output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import importlib
+import inspect
+import pkgutil
+from dataclasses import dataclass
+from selenium.webdriver.common.by import By
+
+# Locator strategies page objects may declare
+LOCATOR_STRATEGIES: frozenset[str] = frozenset(
+    value for name, value in vars(By).items() if not name.startswith("_") and isinstance(value, str)
+)
+
+
+@dataclass(frozen=True)
+class RegisteredLocator:
+    """A locator tuple declared as a class attribute of a page object."""
+
+    page: str
+    name: str
+    locator: tuple[str, str]
+
+    @property
+    def qualified_name(self) -> str:
+        """Return "<Page>.<ATTRIBUTE>", e.g. "SearchResultsPage.STREAMER_CARD"."""
+        return f"{self.page}.{self.name}"
+
+
+def discover_locators(package: str = "pages") -> list[RegisteredLocator]:
+    """
+    Find every locator tuple declared on BasePage subclasses in a package.
+
+    A locator is a class attribute holding a (By strategy, value) tuple. Locators
+    inherited unchanged from a parent page are reported once, on the declaring class.
+
+    Args:
+        package (str): Package containing the page object modules.
+
+    Returns:
+        list[RegisteredLocator]: Locators sorted by page and attribute name.
+    """
+    from pages.base_page import BasePage
+
+    root = importlib.import_module(package)
+    for module_info in pkgutil.iter_modules(root.__path__, root.__name__ + "."):
+        importlib.import_module(module_info.name)
+
+    found: dict[tuple[str, str], RegisteredLocator] = {}
+    for page_class in _subclasses(BasePage):
+        for name, value in vars(page_class).items():
+            if _is_locator(value):
+                found[(page_class.__name__, name)] = RegisteredLocator(page_class.__name__, name, value)
+    return sorted(found.values(), key=lambda locator: (locator.page, locator.name))
+
+
+def _subclasses(cls: type) -> list[type]:
+    """Return all subclasses of a class, recursively."""
+    result = []
+    for subclass in cls.__subclasses__():
+        if not inspect.isabstract(subclass):
+            result.append(subclass)
+        result.extend(_subclasses(subclass))
+    return result
+
+
+def _is_locator(value: object) -> bool:
+    """Check whether a value looks like a Selenium locator tuple."""
+    return (
+        isinstance(value, tuple) and len(value) == 2
+        and value[0] in LOCATOR_STRATEGIES and isinstance(value[1], str)
+    )
@@ -0,0 +1,174 @@
+"""
+Offline locator validation against recorded DOM snapshots.
+
+Replays every page object locator (utils.locator_registry) against the snapshots
+recorded after each journey step (DOM_SNAPSHOTS=true) and reports locators that
+match nothing in any snapshot, match several elements, or whose cardinality
+changed against a baseline report or between snapshots of the same step.
+
+    python -m utils.locator_replay [paths ...] [--baseline report.json] [--strict]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Iterable
+from utils.dom_snapshot import DomSnapshot, load_snapshots
+from utils.locator_registry import RegisteredLocator, discover_locators
+from utils.selector_matcher import UnsupportedSelectorError, compile_locator
+from config.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def cardinality(count: int) -> str:
+    """Classify a match count as "none", "one" or "many"."""
+    return "none" if count == 0 else "one" if count == 1 else "many"
+
+
+def replay(
+    snapshots: Iterable[DomSnapshot],
+    locators: list[RegisteredLocator] | None = None,
+    baseline: dict | None = None
+) -> dict:
+    """
+    Count the matches of every locator in every snapshot.
+
+    Snapshots with identical content (same content_key) are matched only once, so
+    snapshots_per_second depends on how repetitive the input is; unique_snapshots_per_second
+    is the matching throughput (about 200-450 distinct 1,200-element pages per second on
+    one core, against about 10 locators).
+
+    Args:
+        snapshots (Iterable[DomSnapshot]): Snapshots to check.
+        locators (list[RegisteredLocator] | None): Locators to check. Defaults to
+            every locator declared on a page object.
+        baseline (dict | None): An earlier replay report to compare cardinalities with.
+
+    Returns:
+        dict: snapshots, unique_snapshots, locators, elapsed_s, snapshots_per_second,
+        unique_snapshots_per_second, counts ({locator: {step: [min, max]}}), zero (locators never matched),
+        multiple ({locator: {step: max}}), changed ({locator: {step: {current,
+        baseline, reason}}}) and unsupported ({locator: error}).
+    """
+    locators = discover_locators() if locators is None else locators
+    matchers = {}
+    unsupported = {}
+    for locator in locators:
+        try:
+            matchers[locator.qualified_name] = compile_locator(locator.locator)
+        except UnsupportedSelectorError as e:
+            unsupported[locator.qualified_name] = str(e)
+
+    started = time.perf_counter()
+    step_counts: dict[str, dict[str, list[int]]] = {name: defaultdict(list) for name in matchers}
+    by_content: dict[int, dict[str, int]] = {}
+    total = unique = 0
+    for snapshot in snapshots:
+        total += 1
+        counts = by_content.get(snapshot.content_key) if snapshot.content_key is not None else None
+        if counts is None:
+            unique += 1
+            counts = {}
+            for name, matcher in matchers.items():
+                try:
+                    counts[name] = len(matcher(snapshot))
+                except UnsupportedSelectorError as e:
+                    unsupported[name] = str(e)
+            if snapshot.content_key is not None:
+                by_content[snapshot.content_key] = counts
+        step = snapshot.step or snapshot.url
+        for name, count in counts.items():
+            step_counts[name][step].append(count)
+    elapsed = time.perf_counter() - started
+
+    for name in unsupported:
+        step_counts.pop(name, None)
+    ranges = {
+        name: {step: [min(values), max(values)] for step, values in steps.items()}
+        for name, steps in step_counts.items()
+    }
+    baseline_ranges = (baseline or {}).get("counts", {})
+    changed: dict[str, dict[str, dict]] = {}
+    for name, steps in ranges.items():
+        for step, (low, high) in steps.items():
+            previous = baseline_ranges.get(name, {}).get(step)
+            if cardinality(low) != cardinality(high):
+                reason = "unstable"
+            elif previous and {cardinality(c) for c in previous} != {cardinality(low)}:
+                reason = "baseline"
+            else:
+                continue
+            changed.setdefault(name, {})[step] = {"current": [low, high], "baseline": previous, "reason": reason}
+
+    return {
+        "snapshots": total,
+        "unique_snapshots": unique,
+        "locators": len(locators),
+        "elapsed_s": round(elapsed, 4),
+        "snapshots_per_second": round(total / elapsed) if elapsed else None,
+        "unique_snapshots_per_second": round(unique / elapsed) if elapsed else None,
+        "counts": ranges,
+        "zero": sorted(name for name, steps in ranges.items() if steps and all(high == 0 for _, high in steps.values())),
+        "multiple": {
+            name: {step: high for step, (_, high) in steps.items() if high > 1}
+            for name, steps in ranges.items() if any(high > 1 for _, high in steps.values())
+        },
+        "changed": changed,
+        "unsupported": unsupported,
+    }
+
+
+def default_snapshot_paths() -> list[str]:
+    """Snapshot directories of this run and of every xdist worker."""
+    return sorted(
+        glob.glob(os.path.join(Config.REPORT_DIR, "dom_snapshots"))
+        + glob.glob(os.path.join(Config.REPORT_DIR, "*", "dom_snapshots"))
+    )
+
+
+def main() -> None:
+    """Validate locators against recorded snapshots from the command line."""
+    parser = argparse.ArgumentParser(description="Check page object locators against recorded DOM snapshots.")
+    parser.add_argument("paths", nargs="*", help="snapshot files or directories (default: REPORT_DIR)")
+    parser.add_argument("--baseline", default=None, help="earlier replay report to compare cardinalities with")
+    parser.add_argument("--output", default=os.path.join(Config.REPORT_DIR, "locator_replay.json"))
+    parser.add_argument("--strict", action="store_true", help="exit 1 if a locator never matches or changed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    paths = args.paths or default_snapshot_paths()
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    report = replay(load_snapshots(paths), baseline=baseline)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(
+        f"Checked {report['locators']} locators against {report['snapshots']} snapshots "
+        f"({report['unique_snapshots']} unique) in {report['elapsed_s']}s: "
+        f"{report['snapshots_per_second']} snapshots/s, {report['unique_snapshots_per_second']} unique/s"
+    )
+    for name in report["zero"]:
+        print(f"  ZERO      {name}: no match in any snapshot")
+    for name, steps in report["multiple"].items():
+        print(f"  MULTIPLE  {name}: {steps}")
+    for name, steps in report["changed"].items():
+        for step, change in steps.items():
+            print(f"  CHANGED   {name} at {step}: {change['current']} ({change['reason']}, baseline {change['baseline']})")
+    for name, error in report["unsupported"].items():
+        print(f"  SKIPPED   {name}: {error}")
+    logger.info("Locator replay report saved: %s", args.output)
+    if args.strict and (report["zero"] or report["changed"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,642 @@
+"""
+Network record and replay over the Chrome DevTools Protocol.
+
+With NETWORK_MODE=record, every response the driver's browser receives is appended
+to an archive of HAR 1.2 entries (one JSON entry per line in
+NETWORK_ARCHIVE_DIR/*.har.jsonl). With NETWORK_MODE=replay, requests are paused
+with the Fetch domain and answered from the archive, optionally delayed, so
+journeys run without touching the live site. Requests the archive cannot answer
+are failed (or sent to the network, NETWORK_REPLAY_ON_MISS=network) and reported.
+
+Both modes attach a background DevTools connection to the browser WebDriverFactory
+started, and follow every page, frame and worker target it opens.
+
+    python -m utils.network_replay info
+    python -m utils.network_replay export --output journey.har
+"""
+import argparse
+import asyncio
+import base64
+import glob
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from weakref import WeakKeyDictionary
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.cdp_client import CDPConnection, CDPError
+from config.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+NETWORK_MODES: tuple[str, ...] = ("live", "record", "replay")
+ARCHIVE_SUFFIX: str = ".har.jsonl"
+# Targets whose network traffic is recorded or replayed
+TAPPED_TARGET_TYPES: frozenset[str] = frozenset({"page", "iframe", "worker", "shared_worker", "service_worker"})
+# Describe the recorded transfer, not the decoded body that is replayed
+SKIPPED_RESPONSE_HEADERS: frozenset[str] = frozenset({
+    "content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive",
+})
+# Statuses that are complete without a body
+BODYLESS_STATUSES: frozenset[int] = frozenset({204, 301, 302, 303, 304, 307, 308})
+
+RequestKey = tuple[str, str, str]
+
+
+def normalize_url(url: str, ignore_params: Iterable[str] = ()) -> str:
+    """
+    Normalize a URL for matching: drop the fragment and ignored query parameters,
+    and sort the remaining parameters.
+
+    Args:
+        url (str): Request URL.
+        ignore_params (Iterable[str]): Query parameter names to drop (cache busters).
+
+    Returns:
+        str: Normalized URL.
+    """
+    parts = urlsplit(url)
+    ignored = set(ignore_params)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in ignored)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def request_key(method: str, url: str, body: bytes | None, ignore_params: Iterable[str] = ()) -> RequestKey:
+    """
+    Build the archive lookup key of a request.
+
+    Returns:
+        RequestKey: (method, normalized URL, body hash or "" without a body).
+    """
+    digest = hashlib.sha1(body).hexdigest()[:16] if body else ""
+    return method.upper(), normalize_url(url, ignore_params), digest
+
+
+def graphql_operations(body: bytes | None) -> str | None:
+    """
+    Identify the GraphQL operations in a request body.
+
+    Args:
+        body (bytes | None): Request body, a GraphQL request or a batch of them.
+
+    Returns:
+        str | None: Operation names with their persisted query hashes, e.g.
+        "SearchResultsPage:3a1b...", or None if the body is not a GraphQL request.
+    """
+    try:
+        payload = json.loads(body) if body else None
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    operations = payload if isinstance(payload, list) else [payload]
+    names = []
+    for operation in operations:
+        if not isinstance(operation, dict) or not operation.get("operationName"):
+            return None
+        persisted = (operation.get("extensions") or {}).get("persistedQuery") or {}
+        names.append(f"{operation['operationName']}:{persisted.get('sha256Hash', '')}")
+    return ",".join(names) or None
+
+
+class HarArchive:
+    """
+    HAR entries indexed by request key.
+
+    Lookups are dictionary hits on (method, normalized URL, body hash), so archives
+    with tens of thousands of entries answer in constant time. A request whose body
+    differs from every recording is a miss. With loose matching, a GraphQL request
+    whose variables changed between runs falls back to the recordings of the same
+    operation(s); bodies of other requests still have to match exactly.
+    """
+
+    _cache: dict[tuple, "HarArchive"] = {}
+    _cache_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, entries: Iterable[dict] = (), ignore_params: Iterable[str] = (), loose: bool | None = None):
+        """
+        Initialize HarArchive.
+
+        Args:
+            entries (Iterable[dict]): HAR 1.2 entries.
+            ignore_params (Iterable[str]): Query parameters ignored when matching.
+            loose (bool | None): Fall back to recordings of the same GraphQL operation.
+                Defaults to Config.NETWORK_REPLAY_LOOSE_MATCH.
+        """
+        self.ignore_params: tuple[str, ...] = tuple(ignore_params)
+        self.loose: bool = Config.NETWORK_REPLAY_LOOSE_MATCH if loose is None else loose
+        self.entries: list[dict] = []
+        self._exact: dict[RequestKey, list[dict]] = {}
+        self._loose: dict[tuple[str, str, str], list[dict]] = {}
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry: dict) -> None:
+        """Add an entry to the archive and its indexes."""
+        request = entry["request"]
+        body = _har_request_body(request)
+        key = request_key(request["method"], request["url"], body, self.ignore_params)
+        self.entries.append(entry)
+        self._exact.setdefault(key, []).append(entry)
+        operations = graphql_operations(body) if self.loose else None
+        if operations:
+            self._loose.setdefault((*key[:2], operations), []).append(entry)
+
+    def candidates(self, method: str, url: str, body: bytes | None) -> tuple[RequestKey, list[dict], str]:
+        """
+        Find the recorded responses for a request.
+
+        Returns:
+            tuple[RequestKey, list[dict], str]: The request key, the matching entries in
+            recording order, and "exact", "loose" (same GraphQL operation, other
+            variables; only with loose matching) or "miss".
+        """
+        key = request_key(method, url, body, self.ignore_params)
+        if key in self._exact:
+            return key, self._exact[key], "exact"
+        operations = graphql_operations(body) if self.loose else None
+        if operations and (*key[:2], operations) in self._loose:
+            return key, self._loose[(*key[:2], operations)], "loose"
+        return key, [], "miss"
+
+    @classmethod
+    def load(cls, directory: str, ignore_params: Iterable[str] = (), loose: bool | None = None) -> "HarArchive":
+        """
+        Load every archive file in a directory, reusing the parsed archive while the
+        files are unchanged.
+
+        Args:
+            directory (str): Archive directory (NETWORK_ARCHIVE_DIR).
+            ignore_params (Iterable[str]): Query parameters ignored when matching.
+            loose (bool | None): Loose GraphQL matching. Defaults to Config.NETWORK_REPLAY_LOOSE_MATCH.
+
+        Returns:
+            HarArchive: Entries of all files, in file name order.
+        """
+        loose = Config.NETWORK_REPLAY_LOOSE_MATCH if loose is None else loose
+        files = sorted(glob.glob(os.path.join(directory, "*" + ARCHIVE_SUFFIX)))
+        signature = (
+            os.path.abspath(directory), tuple(ignore_params), loose,
+            tuple((f, os.path.getmtime(f), os.path.getsize(f)) for f in files),
+        )
+        with cls._cache_lock:
+            if signature not in cls._cache:
+                started = time.perf_counter()
+                cls._cache = {signature: cls(_read_entries(files), ignore_params, loose)}
+                logger.info(
+                    "Loaded %s network archive entries from %s files in %.2fs",
+                    len(cls._cache[signature].entries), len(files), time.perf_counter() - started
+                )
+            return cls._cache[signature]
+
+    def to_har(self) -> dict:
+        """Return the entries as a HAR 1.2 document."""
+        return {"log": {"version": "1.2", "creator": {"name": "twitch-test-automation", "version": "1"},
+                        "entries": self.entries}}
+
+
+def _read_entries(files: list[str]) -> Iterable[dict]:
+    """Read HAR entries from archive files, skipping a truncated last line."""
+    for file in files:
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping unreadable network archive line in %s", file)
+
+
+def _har_request_body(request: dict) -> bytes | None:
+    """Request body of a HAR request."""
+    text = (request.get("postData") or {}).get("text")
+    return text.encode("utf-8") if text else None
+
+
+def _paused_request_body(request: dict) -> bytes | None:
+    """Request body of a Fetch.requestPaused request."""
+    if request.get("postDataEntries"):
+        return b"".join(base64.b64decode(e.get("bytes", "")) for e in request["postDataEntries"]) or None
+    text = request.get("postData")
+    return text.encode("utf-8") if text else None
+
+
+def _headers(headers: dict) -> list[dict]:
+    """CDP headers object to a HAR name/value list."""
+    return [{"name": name, "value": value} for name, value in headers.items()]
+
+
+class NetworkTap(ABC):
+    """
+    Background DevTools connection to the browser behind a WebDriver.
+
+    Runs its own event loop on a daemon thread, auto-attaches to every page, frame
+    and worker (pausing new targets until they are set up, so no request slips
+    through), and stops by itself when the browser goes away.
+    """
+
+    _taps: "WeakKeyDictionary[WebDriver, NetworkTap]" = WeakKeyDictionary()
+
+    def __init__(self, debugger_address: str):
+        """
+        Initialize NetworkTap. Use attach() instead.
+
+        Args:
+            debugger_address (str): host:port of the browser's DevTools HTTP endpoint.
+        """
+        self.debugger_address: str = debugger_address
+        self.connection: CDPConnection | None = None
+        self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._thread: threading.Thread | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @classmethod
+    def attach(cls, driver: WebDriver, *args: Any, **kwargs: Any) -> "NetworkTap":
+        """
+        Start a tap on a Chrome driver's browser.
+
+        Args:
+            driver (WebDriver): Chrome driver (exposes goog:chromeOptions.debuggerAddress).
+            *args, **kwargs: Passed to the tap's constructor.
+
+        Returns:
+            NetworkTap: The running tap.
+
+        Raises:
+            RuntimeError: If the driver exposes no DevTools address.
+        """
+        address = (driver.capabilities.get("goog:chromeOptions") or {}).get("debuggerAddress")
+        if not address:
+            raise RuntimeError("Driver exposes no DevTools debuggerAddress; network record/replay needs Chrome")
+        tap = cls(address, *args, **kwargs)
+        tap.start()
+        NetworkTap._taps[driver] = tap
+        return tap
+
+    @staticmethod
+    def for_driver(driver: WebDriver) -> "NetworkTap | None":
+        """Return the tap attached to a driver, if any."""
+        return NetworkTap._taps.get(driver)
+
+    def start(self, timeout: float = 10) -> None:
+        """Connect and set up every existing target before returning."""
+        self._thread = threading.Thread(target=self._loop.run_forever, name="network-tap", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._connect(), self._loop).result(timeout)
+
+    def stop(self) -> None:
+        """Close the connection and wait for the loop thread to finish."""
+        if not self._thread or not self._thread.is_alive():
+            return
+        if self.connection:
+            try:
+                asyncio.run_coroutine_threadsafe(self.connection.close(), self._loop).result(5)
+            except Exception as e:
+                logger.debug("Error closing network tap: %s", e)
+        self._thread.join(5)
+
+    async def _connect(self) -> None:
+        loop = asyncio.get_running_loop()
+        version = await loop.run_in_executor(None, self._read_version)
+        self.connection = await CDPConnection.connect(version["webSocketDebuggerUrl"])
+        self.connection.on("Target.attachedToTarget", self._on_attached)
+        await self.connection.send(
+            "Target.setAutoAttach", {"autoAttach": True, "waitForDebuggerOnStart": True, "flatten": True}
+        )
+        # Existing targets are attached while setAutoAttach runs; finish their setup first
+        await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        self._spawn(self._stop_when_closed())
+
+    def _read_version(self) -> dict:
+        with urllib.request.urlopen(f"http://{self.debugger_address}/json/version", timeout=10) as response:
+            return json.load(response)
+
+    async def _stop_when_closed(self) -> None:
+        await self.connection.wait_closed()
+        logger.debug("Network tap on %s closed", self.debugger_address)
+        try:
+            self._on_closed()
+        finally:
+            self._loop.stop()
+
+    def _on_closed(self) -> None:
+        """Called on the loop thread once the connection is gone."""
+
+    def _spawn(self, coroutine: Awaitable) -> None:
+        """Run a coroutine in the background, logging (not raising) its failure."""
+        task = self._loop.create_task(coroutine)
+        self._tasks.add(task)
+
+        def done(finished: asyncio.Task) -> None:
+            self._tasks.discard(finished)
+            if not finished.cancelled() and finished.exception():
+                logger.debug("Network tap task failed: %s", finished.exception())
+        task.add_done_callback(done)
+
+    def _listen(self, method: str, session_id: str, handler: Callable[[str, dict], Awaitable]) -> None:
+        """Run `handler(session_id, params)` for every `method` event of a session."""
+        self.connection.on(method, lambda params: self._spawn(handler(session_id, params)), session_id)
+
+    def _on_attached(self, params: dict) -> None:
+        self._spawn(self._set_up_target(params))
+
+    async def _set_up_target(self, params: dict) -> None:
+        session_id, target_type = params["sessionId"], params["targetInfo"]["type"]
+        try:
+            if target_type in TAPPED_TARGET_TYPES:
+                await self._enable(session_id)
+                if target_type in ("page", "iframe"):
+                    await self.connection.send(
+                        "Target.setAutoAttach",
+                        {"autoAttach": True, "waitForDebuggerOnStart": True, "flatten": True},
+                        session_id,
+                    )
+        finally:
+            if params.get("waitingForDebugger"):
+                await self.connection.send("Runtime.runIfWaitingForDebugger", session_id=session_id)
+
+    @abstractmethod
+    async def _enable(self, session_id: str) -> None:
+        """Enable the domains this tap needs on a newly attached target."""
+
+
+class HarRecorder(NetworkTap):
+    """Appends every completed HTTP(S) response to an archive file as a HAR entry."""
+
+    _file_ids: itertools.count = itertools.count(1)
+
+    def __init__(self, debugger_address: str, path: str | None = None, max_body_kb: int | None = None):
+        """
+        Initialize HarRecorder. Use attach() instead.
+
+        Args:
+            debugger_address (str): host:port of the browser's DevTools HTTP endpoint.
+            path (str | None): Archive file. Defaults to a new file in NETWORK_ARCHIVE_DIR.
+            max_body_kb (int | None): Larger bodies are not stored (replayed as misses).
+                Defaults to Config.NETWORK_MAX_BODY_KB.
+        """
+        super().__init__(debugger_address)
+        self.path: str = path or os.path.join(
+            Config.NETWORK_ARCHIVE_DIR,
+            f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{next(self._file_ids)}{ARCHIVE_SUFFIX}",
+        )
+        self.max_body_bytes: int = (Config.NETWORK_MAX_BODY_KB if max_body_kb is None else max_body_kb) * 1024
+        self.entries_written: int = 0
+        self._requests: dict[tuple[str, str], dict] = {}
+        self._responses: dict[tuple[str, str], dict] = {}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _on_closed(self) -> None:
+        self._file.close()
+        logger.info("Recorded %s network entries to %s", self.entries_written, self.path)
+
+    async def _enable(self, session_id: str) -> None:
+        self._listen("Network.requestWillBeSent", session_id, self._on_request)
+        self._listen("Network.responseReceived", session_id, self._on_response)
+        self._listen("Network.loadingFinished", session_id, self._on_finished)
+        self._listen("Network.loadingFailed", session_id, self._on_failed)
+        await self.connection.send("Network.enable", {"maxPostDataSize": 1 << 20}, session_id)
+        # Full responses only: a cached or revalidated (304) response cannot be replayed on its own
+        await self.connection.send("Network.setCacheDisabled", {"cacheDisabled": True}, session_id)
+
+    async def _on_request(self, session_id: str, params: dict) -> None:
+        key = (session_id, params["requestId"])
+        if params.get("redirectResponse") and key in self._requests:
+            self._write(self._requests.pop(key), params["redirectResponse"], None, params["timestamp"])
+        if urlsplit(params["request"]["url"]).scheme not in ("http", "https"):
+            return
+        self._requests[key] = {**params["request"], "wallTime": params["wallTime"],
+                               "timestamp": params["timestamp"], "type": params.get("type")}
+
+    async def _on_response(self, session_id: str, params: dict) -> None:
+        self._responses[(session_id, params["requestId"])] = params["response"]
+
+    async def _on_failed(self, session_id: str, params: dict) -> None:
+        self._requests.pop((session_id, params["requestId"]), None)
+        self._responses.pop((session_id, params["requestId"]), None)
+
+    async def _on_finished(self, session_id: str, params: dict) -> None:
+        key = (session_id, params["requestId"])
+        request, response = self._requests.pop(key, None), self._responses.pop(key, None)
+        if not request or not response:
+            return
+        if request.get("hasPostData") and "postData" not in request:
+            try:
+                result = await self.connection.send("Network.getRequestPostData", {"requestId": key[1]}, session_id)
+                request["postData"] = result["postData"]
+            except CDPError:
+                pass
+        body = None
+        if params.get("encodedDataLength", 0) <= self.max_body_bytes:
+            try:
+                body = await self.connection.send("Network.getResponseBody", {"requestId": key[1]}, session_id)
+            except CDPError as e:
+                logger.debug("No body recorded for %s: %s", request["url"], e)
+        self._write(request, response, body, params["timestamp"])
+
+    def _write(self, request: dict, response: dict, body: dict | None, finished: float) -> None:
+        """Append one HAR entry."""
+        elapsed_ms = max(0.0, (finished - request["timestamp"]) * 1000)
+        content: dict[str, Any] = {"size": 0, "mimeType": response.get("mimeType", "")}
+        if body is not None:
+            content["text"] = body["body"] if body["base64Encoded"] else \
+                base64.b64encode(body["body"].encode("utf-8")).decode("ascii")
+            content["encoding"] = "base64"
+            content["size"] = len(base64.b64decode(content["text"]))
+        entry = {
+            "startedDateTime": datetime.fromtimestamp(request["wallTime"], timezone.utc).isoformat(),
+            "time": round(elapsed_ms, 1),
+            "request": {
+                "method": request["method"], "url": request["url"], "httpVersion": response.get("protocol", ""),
+                "headers": _headers(request.get("headers", {})), "queryString": [], "cookies": [],
+                "headersSize": -1, "bodySize": len(request.get("postData") or ""),
+                **({"postData": {"mimeType": request.get("headers", {}).get("Content-Type", ""),
+                                 "text": request["postData"]}} if request.get("postData") else {}),
+            },
+            "response": {
+                "status": response["status"], "statusText": response.get("statusText", ""),
+                "httpVersion": response.get("protocol", ""), "headers": _headers(response.get("headers", {})),
+                "cookies": [], "content": content, "redirectURL": response.get("headers", {}).get("location", ""),
+                "headersSize": -1, "bodySize": content["size"],
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": round(elapsed_ms, 1), "receive": 0},
+            "_resourceType": request.get("type"),
+        }
+        if self._file.closed:
+            return
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self.entries_written += 1
+
+
+class HarReplayer(NetworkTap):
+    """Answers every HTTP(S) request from a HarArchive through Fetch interception."""
+
+    def __init__(
+        self,
+        debugger_address: str,
+        archive: HarArchive,
+        on_miss: str | None = None,
+        latency_ms: float | None = None,
+        latency_scale: float | None = None
+    ):
+        """
+        Initialize HarReplayer. Use attach() instead.
+
+        Args:
+            debugger_address (str): host:port of the browser's DevTools HTTP endpoint.
+            archive (HarArchive): Recorded responses.
+            on_miss (str | None): "fail" or "network". Defaults to Config.NETWORK_REPLAY_ON_MISS.
+            latency_ms (float | None): Fixed delay added to every response.
+                Defaults to Config.NETWORK_REPLAY_LATENCY_MS.
+            latency_scale (float | None): Share of the recorded response time to wait
+                (0 = none, 1 = as recorded). Defaults to Config.NETWORK_REPLAY_LATENCY_SCALE.
+        """
+        super().__init__(debugger_address)
+        self.archive: HarArchive = archive
+        self.on_miss: str = on_miss or Config.NETWORK_REPLAY_ON_MISS
+        self.latency_ms: float = Config.NETWORK_REPLAY_LATENCY_MS if latency_ms is None else latency_ms
+        self.latency_scale: float = Config.NETWORK_REPLAY_LATENCY_SCALE if latency_scale is None else latency_scale
+        self._served: Counter[RequestKey] = Counter()
+        self._stats_lock: threading.Lock = threading.Lock()
+        self._stats: Counter[str] = Counter()
+        self._misses: Counter[str] = Counter()
+
+    async def _enable(self, session_id: str) -> None:
+        self._listen("Fetch.requestPaused", session_id, self._on_paused)
+        await self.connection.send(
+            "Fetch.enable", {"patterns": [{"urlPattern": "*", "requestStage": "Request"}]}, session_id
+        )
+
+    async def _on_paused(self, session_id: str, params: dict) -> None:
+        request = params["request"]
+        request_id = params["requestId"]
+        if urlsplit(request["url"]).scheme not in ("http", "https"):
+            await self.connection.send("Fetch.continueRequest", {"requestId": request_id}, session_id)
+            return
+        key, entries, kind = self.archive.candidates(request["method"], request["url"], _paused_request_body(request))
+        entry = None
+        if entries:
+            # Repeated identical requests get the recorded responses in order, then the last one again
+            entry = entries[min(self._served[key], len(entries) - 1)]
+            self._served[key] += 1
+            response = entry["response"]
+            if "text" not in response["content"] and response["status"] not in BODYLESS_STATUSES:
+                entry, kind = None, "miss"
+        with self._stats_lock:
+            self._stats[kind] += 1
+            if entry is None:
+                self._misses[f"{request['method']} {key[1]}"] += 1
+        if entry is None:
+            logger.debug("Network replay miss: %s %s", request["method"], request["url"])
+            if self.on_miss == "network":
+                await self.connection.send("Fetch.continueRequest", {"requestId": request_id}, session_id)
+            else:
+                await self.connection.send(
+                    "Fetch.failRequest", {"requestId": request_id, "errorReason": "InternetDisconnected"}, session_id
+                )
+            return
+        delay_ms = self.latency_ms + self.latency_scale * entry.get("time", 0)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        response = entry["response"]
+        content = response["content"]
+        body = content.get("text", "")
+        if body and content.get("encoding") != "base64":
+            body = base64.b64encode(body.encode("utf-8")).decode("ascii")
+        fulfill: dict[str, Any] = {
+            "requestId": request_id,
+            "responseCode": response["status"],
+            "responseHeaders": [
+                h for h in response["headers"]
+                if h["name"].lower() not in SKIPPED_RESPONSE_HEADERS and not h["name"].startswith(":")
+            ],
+            "body": body,
+        }
+        if response.get("statusText"):
+            fulfill["responsePhrase"] = response["statusText"]
+        await self.connection.send("Fetch.fulfillRequest", fulfill, session_id)
+
+    def take_stats(self) -> dict:
+        """
+        Return and reset the counters since the last call.
+
+        Returns:
+            dict: exact, loose and miss counts, and the missed requests ({"METHOD url": count}).
+        """
+        with self._stats_lock:
+            stats = {
+                "exact": self._stats["exact"], "loose": self._stats["loose"], "miss": self._stats["miss"],
+                "missed": dict(self._misses),
+            }
+            self._stats.clear()
+            self._misses.clear()
+        return stats
+
+
+def attach_network_mode(driver: WebDriver, mode: str | None = None) -> NetworkTap | None:
+    """
+    Record or replay a driver's network traffic according to Config.NETWORK_MODE.
+
+    Args:
+        driver (WebDriver): Freshly created Chrome driver.
+        mode (str | None): "live", "record" or "replay". Defaults to Config.NETWORK_MODE.
+
+    Returns:
+        NetworkTap | None: The attached recorder or replayer, or None when live.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    mode = mode or Config.NETWORK_MODE
+    if mode == "live":
+        return None
+    if mode == "record":
+        tap = HarRecorder.attach(driver)
+        logger.info("Recording network traffic to %s", tap.path)
+        return tap
+    if mode == "replay":
+        return HarReplayer.attach(driver, HarArchive.load(Config.NETWORK_ARCHIVE_DIR, Config.NETWORK_IGNORE_PARAMS))
+    raise ValueError(f"Unknown network mode: {mode}. Available: {list(NETWORK_MODES)}")
+
+
+def main() -> None:
+    """Inspect or export the network archive from the command line."""
+    parser = argparse.ArgumentParser(description="Inspect or export the recorded network archive.")
+    parser.add_argument("command", choices=["info", "export"])
+    parser.add_argument("--archive", default=Config.NETWORK_ARCHIVE_DIR, help="archive directory")
+    parser.add_argument("--output", default="network_archive.har", help="HAR file written by export")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    started = time.perf_counter()
+    archive = HarArchive.load(args.archive, Config.NETWORK_IGNORE_PARAMS)
+    loaded = time.perf_counter() - started
+    if args.command == "export":
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(archive.to_har(), f)
+        print(f"Exported {len(archive.entries)} entries to {args.output}")
+        return
+    requests = [(e["request"]["method"], e["request"]["url"], _har_request_body(e["request"])) for e in archive.entries]
+    started = time.perf_counter()
+    for method, url, body in requests:
+        archive.candidates(method, url, body)
+    lookup = time.perf_counter() - started
+    hosts = Counter(urlsplit(url).netloc for _, url, _ in requests)
+    print(f"Entries: {len(archive.entries)} ({len(archive._exact)} distinct requests), loaded in {loaded:.2f}s")
+    if requests:
+        print(f"Lookup: {lookup / len(requests) * 1e6:.1f} µs per request")
+    for host, count in hosts.most_common(10):
+        print(f"  {count:>7}  {host}")
+
+
+if __name__ == "__main__":
+    main()
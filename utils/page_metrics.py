@@ -0,0 +1,245 @@
+import json
+import os
+import re
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from config.config import Config
+import logging
+
+if TYPE_CHECKING:
+    from pages.base_page import BasePage
+
+logger = logging.getLogger(__name__)
+
+_active_recorder: ContextVar["PageMetricsRecorder | None"] = ContextVar("active_page_metrics_recorder", default=None)
+
+# Installed before any page script runs: buffers LCP, long tasks and SPA route changes
+OBSERVER_SCRIPT: str = """
+(function () {
+    if (window.__pageMetrics) return;
+    var state = window.__pageMetrics = {lcp: null, longTasks: [], routes: []};
+    function observe(type, callback) {
+        try {
+            new PerformanceObserver(function (list) { list.getEntries().forEach(callback); })
+                .observe({type: type, buffered: true});
+        } catch (e) {}
+    }
+    observe('largest-contentful-paint', function (entry) { state.lcp = entry.startTime; });
+    observe('longtask', function (entry) {
+        state.longTasks.push({start: entry.startTime, duration: entry.duration});
+    });
+    function recordRoute() { state.routes.push({url: location.href, time: performance.now()}); }
+    ['pushState', 'replaceState'].forEach(function (name) {
+        var original = history[name];
+        history[name] = function () {
+            var result = original.apply(this, arguments);
+            recordRoute();
+            return result;
+        };
+    });
+    window.addEventListener('popstate', recordRoute);
+})();
+"""
+
+# arguments[0]: true to return null unless this document or a route change is not yet collected
+COLLECT_SCRIPT: str = """
+    var state = window.__pageMetrics || (window.__pageMetrics = {lcp: null, longTasks: [], routes: []});
+    var routes = state.routes.splice(0);
+    if (arguments[0] && state.collected && !routes.length) return null;
+    state.collected = true;
+    var nav = performance.getEntriesByType('navigation')[0];
+    var paints = {};
+    performance.getEntriesByType('paint').forEach(function (p) { paints[p.name] = p.startTime; });
+    var longTasks = state.longTasks.splice(0);
+    return {
+        url: location.href,
+        routes: routes,
+        navigation: nav ? {
+            ttfb: nav.responseStart - nav.startTime,
+            dom_interactive: nav.domInteractive - nav.startTime,
+            dom_content_loaded: nav.domContentLoadedEventEnd ? nav.domContentLoadedEventEnd - nav.startTime : null,
+            load_event: nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : null,
+            transfer_size: nav.transferSize,
+            type: nav.type
+        } : null,
+        paint: {
+            first_paint: paints['first-paint'] || null,
+            first_contentful_paint: paints['first-contentful-paint'] || null,
+            largest_contentful_paint: state.lcp
+        },
+        long_tasks: {
+            count: longTasks.length,
+            total_ms: longTasks.reduce(function (sum, t) { return sum + t.duration; }, 0)
+        }
+    };
+"""
+
+CDP_METRICS = {
+    "JSHeapUsedSize": "js_heap_used_mb",
+    "LayoutCount": "layout_count",
+    "RecalcStyleCount": "recalc_style_count",
+    "ScriptDuration": "script_duration_ms",
+    "TaskDuration": "task_duration_ms",
+    "Nodes": "dom_nodes",
+}
+
+
+class PerformanceBudgetExceeded(AssertionError):
+    """Raised when a captured page metric exceeds the page object's budget."""
+
+
+class PageMetricsRecorder:
+    """
+    Captures page performance metrics for one test.
+
+    After each BasePage.go_to_link, and after interactions or waits that land on
+    a new document or SPA route, the recorder collects Navigation Timing, paint
+    timings, long tasks and CDP Performance.getMetrics, and checks them against
+    the page object's PERFORMANCE_BUDGET.
+    """
+
+    def __init__(self, test_id: str, enforce_budgets: bool | None = None):
+        """
+        Initialize PageMetricsRecorder.
+
+        Args:
+            test_id (str): Identifier of the test (usually the nodeid).
+            enforce_budgets (bool | None): Raise on budget violations.
+                Defaults to Config.PAGE_METRICS_ENFORCE_BUDGETS.
+        """
+        self.test_id: str = test_id
+        self.enforce_budgets: bool = (
+            Config.PAGE_METRICS_ENFORCE_BUDGETS if enforce_budgets is None else enforce_budgets
+        )
+        self.records: list[dict] = []
+        self.violations: list[str] = []
+        self._token = None
+
+    @staticmethod
+    def current() -> "PageMetricsRecorder | None":
+        """Return the recorder active in the current context, if any."""
+        return _active_recorder.get()
+
+    def activate(self) -> "PageMetricsRecorder":
+        """Make this recorder the active one for the current context."""
+        self._token = _active_recorder.set(self)
+        return self
+
+    def deactivate(self) -> None:
+        """Stop recording into this recorder."""
+        if self._token is not None:
+            _active_recorder.reset(self._token)
+            self._token = None
+
+    @staticmethod
+    def prepare(driver: WebDriver) -> None:
+        """
+        Install the in-page observers and enable CDP metrics once per driver.
+
+        Must run before navigating so long tasks and LCP are observed from the start.
+
+        Args:
+            driver (WebDriver): Driver to prepare.
+        """
+        if getattr(driver, "_page_metrics_installed", False) or not hasattr(driver, "execute_cdp_cmd"):
+            return
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": OBSERVER_SCRIPT})
+        driver.execute_cdp_cmd("Performance.enable", {"timeDomain": "timeTicks"})
+        driver._page_metrics_installed = True
+
+    def capture(self, page: "BasePage", trigger: str) -> dict | None:
+        """
+        Collect metrics for the current document and check the page's budget.
+
+        Args:
+            page (BasePage): Page object that triggered the capture.
+            trigger (str): "navigation", or "interaction" to capture only when the
+                document or SPA route changed since the last capture.
+
+        Returns:
+            dict | None: The captured record, or None if nothing new was loaded.
+
+        Raises:
+            PerformanceBudgetExceeded: If a budgeted metric is exceeded and budgets are enforced.
+        """
+        driver = page.driver
+        try:
+            data = driver.execute_script(COLLECT_SCRIPT, trigger == "interaction")
+        except WebDriverException as e:
+            logger.warning("Failed to collect page metrics: %s", e)
+            return None
+        if data is None:
+            return None
+
+        if hasattr(driver, "execute_cdp_cmd"):
+            raw = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+            values = {m["name"]: m["value"] for m in raw}
+            data["cdp"] = {
+                alias: self._convert(name, values[name]) for name, alias in CDP_METRICS.items() if name in values
+            }
+
+        record = {
+            "page": type(page).__name__,
+            "trigger": trigger,
+            **data,
+            "summary": self._summarize(data),
+        }
+        self.records.append(record)
+        logger.info("Page metrics for %s (%s): %s", record["page"], trigger, record["summary"])
+        self._check_budget(page, record)
+        return record
+
+    def _check_budget(self, page: "BasePage", record: dict) -> None:
+        """Compare a record against the page object's PERFORMANCE_BUDGET."""
+        exceeded = [
+            f"{record['page']} {metric}={record['summary'][metric]:.1f} > {limit}"
+            for metric, limit in page.PERFORMANCE_BUDGET.items()
+            if record["summary"].get(metric) is not None and record["summary"][metric] > limit
+        ]
+        if not exceeded:
+            return
+        self.violations.extend(exceeded)
+        logger.warning("Performance budget exceeded: %s", exceeded)
+        if self.enforce_budgets:
+            raise PerformanceBudgetExceeded(f"Performance budget exceeded at {record['url']}: {', '.join(exceeded)}")
+
+    @staticmethod
+    def _convert(name: str, value: float) -> float:
+        """Convert CDP metric units (bytes, seconds) to MB and ms."""
+        if name == "JSHeapUsedSize":
+            return value / (1024 * 1024)
+        if name.endswith("Duration"):
+            return value * 1000
+        return value
+
+    @staticmethod
+    def _summarize(data: dict) -> dict[str, float | None]:
+        """Flatten a record into the metric names used by budgets."""
+        summary: dict[str, float | None] = {}
+        for key, value in (data.get("navigation") or {}).items():
+            if key != "type":
+                summary[f"{key}_ms" if key != "transfer_size" else key] = value
+        for key, value in data["paint"].items():
+            summary[f"{key}_ms"] = value
+        summary["long_task_count"] = data["long_tasks"]["count"]
+        summary["long_task_total_ms"] = data["long_tasks"]["total_ms"]
+        summary.update(data.get("cdp", {}))
+        return summary
+
+    def write(self, directory: str) -> str:
+        """
+        Write all records for the test as JSON.
+
+        Args:
+            directory (str): Output directory.
+
+        Returns:
+            str: Path of the written file.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, re.sub(r"\W+", "_", self.test_id).strip("_") + ".json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"test": self.test_id, "violations": self.violations, "records": self.records}, f, indent=2)
+        return path
@@ -0,0 +1,144 @@
+import json
+import os
+import re
+import sys
+from config.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+def worker_id() -> str:
+    """
+    Get the pytest-xdist worker id of this process.
+
+    Returns:
+        str: "gw0", "gw1", ... inside xdist workers, "main" otherwise.
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def is_worker() -> bool:
+    """Return True when running inside a pytest-xdist worker."""
+    return "PYTEST_XDIST_WORKER" in os.environ
+
+
+def worker_artifact_dir(base: str) -> str:
+    """
+    Get a per-worker subdirectory of an artifact directory.
+
+    Args:
+        base (str): Shared artifact directory.
+
+    Returns:
+        str: `base/<worker_id>` inside xdist workers, `base` otherwise.
+    """
+    return os.path.join(base, worker_id()) if is_worker() else base
+
+
+def available_memory_mb() -> int | None:
+    """
+    Get the memory available for new processes.
+
+    Returns:
+        int | None: Available memory in MB, or None if it cannot be determined.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/meminfo", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) // 1024
+        except OSError:
+            return None
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def available_cpus() -> int:
+    """Return the number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def auto_worker_count() -> int:
+    """
+    Choose a worker count so each worker's Chrome gets enough CPU and memory.
+
+    Each worker drives one Chrome, budgeted at Config.CPUS_PER_WORKER cores and
+    Config.CHROME_MEMORY_MB of RAM. Config.MAX_WORKERS caps the result when set.
+
+    Returns:
+        int: Number of workers, at least 1.
+    """
+    by_cpu = int(available_cpus() / Config.CPUS_PER_WORKER)
+    memory = available_memory_mb()
+    by_memory = memory // Config.CHROME_MEMORY_MB if memory else by_cpu
+    count = max(1, min(by_cpu, by_memory))
+    if Config.MAX_WORKERS:
+        count = min(count, Config.MAX_WORKERS)
+    logger.info("Auto worker count: %s (cpu limit %s, memory limit %s)", count, by_cpu, by_memory)
+    return count
+
+
+def merge_worker_logs(log_dir: str, log_name: str, merged_name: str) -> str | None:
+    """
+    Merge per-worker JSON-lines logs into one chronologically ordered log.
+
+    Every line is one record that already names its worker; records are ordered by
+    their "time". The merged log is a separate file, so the controller's own log
+    (which may still be open) is never written to.
+
+    Args:
+        log_dir (str): Directory containing one subdirectory per worker.
+        log_name (str): Log file name inside each worker directory.
+        merged_name (str): Name of the merged log in log_dir; replaced if it exists.
+
+    Returns:
+        str | None: Path of the merged log, or None if no worker logs were found.
+    """
+    records: list[tuple[str, str, int, str]] = []
+    worker_dirs = sorted(d for d in os.listdir(log_dir) if re.fullmatch(r"gw\d+", d)) if os.path.isdir(log_dir) else []
+    for worker in worker_dirs:
+        path = os.path.join(log_dir, worker, log_name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for index, line in enumerate(f):
+                try:
+                    records.append((json.loads(line)["time"], worker, index, line))
+                except (ValueError, KeyError):
+                    logger.warning("Skipping unreadable log line %s in %s", index + 1, path)
+    if not records:
+        return None
+    records.sort(key=lambda record: record[:3])
+    merged_path = os.path.join(log_dir, merged_name)
+    with open(merged_path, "w", encoding="utf-8") as f:
+        f.writelines(record[3] for record in records)
+    return merged_path
+
+
+def write_artifact_index(roots: list[str], index_path: str) -> dict[str, list[str]]:
+    """
+    Index artifacts written by each worker so they can be found from one report.
+
+    Args:
+        roots (list[str]): Shared artifact directories containing gw* subdirectories.
+        index_path (str): JSON file to write.
+
+    Returns:
+        dict[str, list[str]]: Artifact paths per worker.
+    """
+    index: dict[str, list[str]] = {}
+    for root in roots:
+        if not os.path.isdir(root):
+            continue
+        for worker in sorted(d for d in os.listdir(root) if re.fullmatch(r"gw\d+", d)):
+            for dirpath, _, filenames in os.walk(os.path.join(root, worker)):
+                index.setdefault(worker, []).extend(os.path.join(dirpath, name) for name in sorted(filenames))
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return index
@@ -0,0 +1,61 @@
+import json
+from collections import deque
+from weakref import WeakKeyDictionary
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from config.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PerformanceLog:
+    """
+    Shared buffer over Chrome's "performance" (DevTools event) log.
+
+    `driver.get_log("performance")` drains the log, so several consumers reading it
+    directly would steal each other's events. Everything goes through this buffer
+    instead, which keeps the most recent Config.PERFORMANCE_LOG_MAX_EVENTS events
+    per driver. Requires Config.PERFORMANCE_LOG when the driver is created.
+    """
+
+    _buffers: "WeakKeyDictionary[WebDriver, deque[dict]]" = WeakKeyDictionary()
+
+    @classmethod
+    def events(cls, driver: WebDriver) -> list[dict]:
+        """
+        Get all buffered DevTools events, pulling any new ones from the driver first.
+
+        Args:
+            driver (WebDriver): Driver created with performance logging enabled.
+
+        Returns:
+            list[dict]: Events as {"method", "params", "timestamp"} dicts, oldest first.
+        """
+        buffer = cls._buffers.setdefault(driver, deque(maxlen=Config.PERFORMANCE_LOG_MAX_EVENTS))
+        if not Config.PERFORMANCE_LOG:
+            return list(buffer)
+        try:
+            entries = driver.get_log("performance")
+        except WebDriverException as e:
+            logger.debug("Performance log unavailable: %s", e)
+            return list(buffer)
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            buffer.append({
+                "method": message.get("method"),
+                "params": message.get("params", {}),
+                "timestamp": entry["timestamp"],
+            })
+        return list(buffer)
+
+    @classmethod
+    def clear(cls, driver: WebDriver) -> None:
+        """
+        Discard buffered and pending events, e.g. at the start of a test.
+
+        Args:
+            driver (WebDriver): Driver whose events should be dropped.
+        """
+        cls.events(driver)
+        cls._buffers[driver].clear()
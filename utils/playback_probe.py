@@ -0,0 +1,267 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Callable
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.stats import summarize
+from config.config import Config
+import logging
+
+if TYPE_CHECKING:
+    from pages.stream_page import StreamPage
+
+logger = logging.getLogger(__name__)
+
+# Installed before page scripts run. Media events do not bubble, so they are caught in the
+# capture phase on the document; times are performance.now() values. Time to first frame is
+# measured from the video's loadstart, not from navigation start, so time spent on earlier
+# SPA routes (e.g. the search page before clicking a streamer) is not counted. A loadstart
+# on a new route (location.href changed) starts a new measurement for the new stream.
+EARLY_PROBE_SCRIPT: str = """
+(function () {
+    if (window.__qoe) return;
+    var qoe = window.__qoe = {
+        href: null, loadStart: null, firstFrame: null, rebuffers: [], waitingSince: null, stalled: 0
+    };
+    function begin(time) {
+        qoe.href = location.href;
+        qoe.loadStart = time;
+        qoe.firstFrame = null;
+        qoe.rebuffers = [];
+        qoe.waitingSince = null;
+        qoe.stalled = 0;
+    }
+    function onFirstFrame(time) {
+        if (qoe.loadStart !== null && qoe.firstFrame === null) qoe.firstFrame = Math.max(time, qoe.loadStart);
+    }
+    document.addEventListener('loadstart', function (e) {
+        var video = e.target;
+        if (video.tagName !== 'VIDEO') return;
+        if (qoe.loadStart === null || qoe.href !== location.href) begin(performance.now());
+        if (video.requestVideoFrameCallback) video.requestVideoFrameCallback(function (now) { onFirstFrame(now); });
+    }, true);
+    document.addEventListener('timeupdate', function (e) {
+        if (e.target.currentTime > 0) onFirstFrame(performance.now());
+    }, true);
+    document.addEventListener('waiting', function () {
+        if (qoe.firstFrame !== null && qoe.waitingSince === null) qoe.waitingSince = performance.now();
+    }, true);
+    document.addEventListener('playing', function () {
+        if (qoe.waitingSince !== null) {
+            qoe.rebuffers.push(performance.now() - qoe.waitingSince);
+            qoe.waitingSince = null;
+        }
+    }, true);
+    document.addEventListener('stalled', function () { qoe.stalled++; }, true);
+})();
+"""
+
+# arguments: [videoSelector, observeMs, callback]. Installs the probe late if it was not
+# injected before navigation, samples the player for observeMs and resolves with a summary.
+# Time to first frame (ms after loadstart) is unknown when the probe was installed late or
+# no loadstart was seen on the current route. Media without a video track (e.g. the
+# stand-in server's synthesized audio) has no frames, so frame metrics are left out.
+OBSERVE_SCRIPT: str = "var lateInstall = !window.__qoe;" + EARLY_PROBE_SCRIPT + """
+    var selector = arguments[0], observeMs = arguments[1], done = arguments[arguments.length - 1];
+    var qoe = window.__qoe;
+    var video = document.querySelector(selector);
+    if (!video) { done({error: 'No video element for ' + selector}); return; }
+    var startTime = video.currentTime, minReadyState = video.readyState;
+    function sample() { minReadyState = Math.min(minReadyState, video.readyState); }
+    sample();
+    var ticker = setInterval(sample, 250);
+    setTimeout(function () {
+        clearInterval(ticker);
+        sample();
+        var quality = video.getVideoPlaybackQuality ? video.getVideoPlaybackQuality() : null;
+        var openRebuffer = qoe.waitingSince !== null ? performance.now() - qoe.waitingSince : 0;
+        var measured = !lateInstall && qoe.loadStart !== null && qoe.href === location.href;
+        var videoTrack = video.videoWidth > 0;
+        if (!videoTrack) quality = null;
+        done({
+            url: location.href,
+            videoTrack: videoTrack,
+            firstFrame: measured && videoTrack && qoe.firstFrame !== null ? qoe.firstFrame - qoe.loadStart : null,
+            firstFrameUnknown: !measured || !videoTrack,
+            rebuffers: qoe.rebuffers.concat(openRebuffer ? [openRebuffer] : []),
+            stalled: qoe.stalled,
+            droppedFrames: quality ? quality.droppedVideoFrames : null,
+            totalFrames: quality ? quality.totalVideoFrames : null,
+            advanced: video.currentTime - startTime,
+            readyState: video.readyState,
+            minReadyState: minReadyState
+        });
+    }, observeMs);
+"""
+
+
+@dataclass
+class PlaybackReport:
+    """Quality-of-experience measurements for one stream."""
+
+    url: str
+    # False for audio-only media; time to first frame and frame counts are then None
+    has_video_track: bool
+    # From the video's loadstart on the current route to its first decoded frame
+    time_to_first_frame_ms: float | None
+    rebuffer_count: int
+    rebuffer_duration_ms: float
+    stalled_count: int
+    dropped_frames: int | None
+    total_frames: int | None
+    dropped_frame_ratio: float | None
+    playback_advanced_s: float
+    observed_s: float
+    ready_state: int
+    min_ready_state: int
+
+    @property
+    def is_playing(self) -> bool:
+        """True if the media position advanced during the observation window."""
+        return self.playback_advanced_s > 0
+
+
+class PlaybackProbe:
+    """Measures video playback quality inside the page."""
+
+    @staticmethod
+    def install(driver: WebDriver) -> None:
+        """
+        Inject the probe into every new document so the stream's first loadstart is
+        seen. Call before navigating to the stream; once per driver.
+
+        Args:
+            driver (WebDriver): Chrome driver.
+        """
+        if getattr(driver, "_playback_probe_installed", False) or not hasattr(driver, "execute_cdp_cmd"):
+            return
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": EARLY_PROBE_SCRIPT})
+        driver._playback_probe_installed = True
+
+    @staticmethod
+    def measure(driver: WebDriver, video_selector: str, observe_seconds: float) -> PlaybackReport:
+        """
+        Observe the player for a while and summarize playback quality.
+
+        The driver's async script timeout must exceed observe_seconds.
+
+        Args:
+            driver (WebDriver): Driver on a stream page.
+            video_selector (str): CSS selector of the video element.
+            observe_seconds (float): Length of the observation window.
+
+        Returns:
+            PlaybackReport: Measurements for the current stream.
+
+        Raises:
+            Exception: If no video element is found.
+        """
+        data = driver.execute_async_script(OBSERVE_SCRIPT, video_selector, int(observe_seconds * 1000))
+        if data.get("error"):
+            raise Exception(data["error"])
+        dropped, total = data["droppedFrames"], data["totalFrames"]
+        report = PlaybackReport(
+            url=data["url"],
+            has_video_track=data["videoTrack"],
+            time_to_first_frame_ms=None if data["firstFrameUnknown"] else data["firstFrame"],
+            rebuffer_count=len(data["rebuffers"]),
+            rebuffer_duration_ms=sum(data["rebuffers"]),
+            stalled_count=data["stalled"],
+            dropped_frames=dropped,
+            total_frames=total,
+            dropped_frame_ratio=dropped / total if total else None,
+            playback_advanced_s=data["advanced"],
+            observed_s=observe_seconds,
+            ready_state=data["readyState"],
+            min_ready_state=data["minReadyState"],
+        )
+        if not report.has_video_track:
+            logger.warning("No video track at %s; frame metrics skipped", report.url)
+        logger.info("Playback QoE for %s: %s", report.url, report)
+        return report
+
+
+class PlaybackBenchmark:
+    """Runs the playback probe over several streams and reports percentile distributions."""
+
+    METRICS: tuple[str, ...] = (
+        "time_to_first_frame_ms", "rebuffer_count", "rebuffer_duration_ms", "dropped_frame_ratio"
+    )
+
+    def __init__(self, stream_page: "StreamPage", observe_seconds: float | None = None):
+        """
+        Initialize PlaybackBenchmark.
+
+        Args:
+            stream_page (StreamPage): Stream page object used to measure each stream.
+            observe_seconds (float | None): Observation window per stream.
+                Defaults to Config.PLAYBACK_OBSERVE_SECONDS.
+        """
+        self.stream_page: "StreamPage" = stream_page
+        self.observe_seconds: float = observe_seconds or Config.PLAYBACK_OBSERVE_SECONDS
+        self.reports: list[PlaybackReport] = []
+        self.errors: list[str] = []
+
+    def run(self, open_stream: Callable[[int], None], count: int) -> dict:
+        """
+        Open and measure `count` streams.
+
+        Args:
+            open_stream (Callable[[int], None]): Opens the i-th stream (e.g. by searching
+                and clicking a streamer, or navigating to a channel URL).
+            count (int): Number of streams to measure.
+
+        Returns:
+            dict: Percentile summary per metric (see summary()).
+        """
+        PlaybackProbe.install(self.stream_page.driver)
+        for index in range(count):
+            try:
+                open_stream(index)
+                self.stream_page.handle_streamer_popups()
+                self.stream_page.wait_for_video_load()
+                self.reports.append(self.stream_page.measure_playback(self.observe_seconds))
+            except Exception as e:
+                logger.warning("Playback benchmark stream %s failed: %s", index, e)
+                self.errors.append(f"{index}: {e}")
+        return self.summary()
+
+    def summary(self) -> dict:
+        """
+        Summarize collected reports as percentile distributions.
+
+        Returns:
+            dict: streams, errors, playing ratio, streams without a video track and
+            summarize() stats per metric.
+        """
+        result: dict = {
+            "streams": len(self.reports),
+            "errors": len(self.errors),
+            "playing_ratio": (
+                sum(r.is_playing for r in self.reports) / len(self.reports) if self.reports else None
+            ),
+            "without_video_track": sum(not r.has_video_track for r in self.reports),
+        }
+        for metric in self.METRICS:
+            values = [getattr(r, metric) for r in self.reports if getattr(r, metric) is not None]
+            result[metric] = summarize(values)
+        return result
+
+    def write(self, path: str) -> str:
+        """
+        Write per-stream reports and the summary as JSON.
+
+        Args:
+            path (str): Output file path.
+
+        Returns:
+            str: The path written.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "summary": self.summary(),
+                "reports": [asdict(r) for r in self.reports],
+                "errors": self.errors,
+            }, f, indent=2)
+        return path
@@ -0,0 +1,261 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import weakref
+from urllib.parse import urlsplit
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from config.config import Config
+from utils.driver_resolver import ChromeDriverResolver
+from utils.file_lock import FileLock
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when the warm-up changes so existing templates are rebuilt
+TEMPLATE_VERSION: int = 1
+
+# Overlays accepted during warm-up so their dismissal is persisted in the profile
+WARMUP_DISMISS_SELECTORS: list[str] = [
+    "[data-a-target='consent-banner-accept']",
+    "[data-a-target='content-classification-gate-overlay-start-watching-button']",
+]
+
+# Per-process lock files Chrome leaves in a running profile; never copied into a session
+SINGLETON_FILES: tuple[str, ...] = ("SingletonLock", "SingletonCookie", "SingletonSocket")
+
+
+class ProfileTemplate:
+    """
+    Pre-warmed Chrome user-data-dir that new sessions start from.
+
+    A one-time warm-up visits Config.PROFILE_TEMPLATE_WARMUP_PATHS twice each (the
+    second visit makes Chrome write its V8 code cache), accepts consent overlays and
+    quits cleanly so the HTTP cache, code cache and first-run state are on disk.
+    Each session then gets its own copy of the template: a reflink (copy-on-write)
+    where the filesystem supports it, a plain copy otherwise. Hardlinks are not used
+    because Chrome rewrites profile files in place.
+
+    Templates are keyed by site origin and stored in versioned directories under
+    Config.DRIVER_CACHE_DIR; an atomically replaced JSON pointer names the current
+    one. A template is rebuilt when TEMPLATE_VERSION or the Chrome major version
+    changes, or when it is older than Config.PROFILE_TEMPLATE_MAX_AGE_HOURS.
+    """
+
+    @classmethod
+    def session_copy(cls, driver_owner: object | None = None) -> str:
+        """
+        Create a private copy of the current template for one browser session.
+
+        Args:
+            driver_owner (object | None): Object whose lifetime bounds the copy
+                (usually the WebDriver); the copy is deleted when it is collected.
+                Without an owner the caller must delete the directory.
+
+        Returns:
+            str: Path of the session's user-data-dir.
+        """
+        template_dir = cls.ensure()
+        session_root = os.path.join(cls._root(), "sessions")
+        os.makedirs(session_root, exist_ok=True)
+        session_dir = tempfile.mkdtemp(prefix="profile-", dir=session_root)
+        started = time.perf_counter()
+        cls._copy_tree(template_dir, session_dir)
+        for name in SINGLETON_FILES:
+            try:
+                os.remove(os.path.join(session_dir, name))
+            except FileNotFoundError:
+                pass
+        logger.info("Profile copied from template in %.0f ms: %s", (time.perf_counter() - started) * 1000, session_dir)
+        if driver_owner is not None:
+            cls.cleanup_with(driver_owner, session_dir)
+        return session_dir
+
+    @staticmethod
+    def cleanup_with(owner: object, session_dir: str) -> None:
+        """
+        Delete a session profile once its owner is garbage collected (or at exit).
+
+        Args:
+            owner (object): Object whose lifetime bounds the profile.
+            session_dir (str): Session user-data-dir to delete.
+        """
+        weakref.finalize(owner, shutil.rmtree, session_dir, True)
+
+    @classmethod
+    def ensure(cls) -> str:
+        """
+        Get the current template directory, building it first if missing or stale.
+
+        Returns:
+            str: Path of the template user-data-dir.
+        """
+        expected = cls._expected_metadata()
+        current = cls._read_pointer()
+        if cls._is_fresh(current, expected):
+            return current["path"]
+        with FileLock(cls._pointer_path() + ".lock", timeout=300):
+            # Another worker may have rebuilt it while we waited for the lock
+            current = cls._read_pointer()
+            if cls._is_fresh(current, expected):
+                return current["path"]
+            template_dir = cls._build(expected)
+            cls._write_pointer({**expected, "path": template_dir, "created": time.time()})
+            cls._prune(keep=template_dir)
+        return template_dir
+
+    @classmethod
+    def _build(cls, metadata: dict) -> str:
+        """
+        Run the warm-up in a new versioned template directory.
+
+        Args:
+            metadata (dict): Template metadata (origin, version, chrome).
+
+        Returns:
+            str: Path of the new template directory.
+        """
+        from utils.webdriver_factory import WebDriverFactory
+
+        os.makedirs(cls._root(), exist_ok=True)
+        template_dir = tempfile.mkdtemp(prefix=f"{cls._origin_key()}-v{metadata['version']}-", dir=cls._root())
+        started = time.perf_counter()
+        driver = WebDriverFactory._create_chrome_driver(Config.HEADLESS, Config.MOBILE_DEVICE, template_dir)
+        try:
+            for path in Config.PROFILE_TEMPLATE_WARMUP_PATHS:
+                url = Config.TWITCH_URL + path
+                for _ in range(2):
+                    try:
+                        driver.get(url)
+                        cls._dismiss_overlays(driver)
+                    except Exception as e:
+                        logger.warning("Profile warm-up failed for %s: %s", url, e)
+        finally:
+            driver.quit()
+        logger.info("Profile template built in %.1f s: %s", time.perf_counter() - started, template_dir)
+        return template_dir
+
+    @staticmethod
+    def _dismiss_overlays(driver: WebDriver) -> None:
+        """Click any consent or content gate overlay present on the page."""
+        for selector in WARMUP_DISMISS_SELECTORS:
+            for button in driver.find_elements(By.CSS_SELECTOR, selector):
+                if button.is_displayed():
+                    button.click()
+
+    @staticmethod
+    def _copy_tree(source: str, target: str) -> None:
+        """
+        Copy a profile directory, cloning file extents where the filesystem allows.
+
+        Args:
+            source (str): Template directory.
+            target (str): Existing, empty session directory.
+        """
+        if sys.platform.startswith("linux"):
+            command = ["cp", "-a", "--reflink=auto", os.path.join(source, "."), target]
+        elif sys.platform == "darwin":
+            command = ["cp", "-c", "-R", os.path.join(source, "."), target]
+        else:
+            command = None
+        if command:
+            try:
+                subprocess.run(command, check=True, capture_output=True, timeout=120)
+                return
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.warning("Fast profile copy failed, falling back to a plain copy: %s", e)
+        shutil.copytree(
+            source, target, symlinks=True, dirs_exist_ok=True, ignore=shutil.ignore_patterns(*SINGLETON_FILES)
+        )
+
+    @classmethod
+    def _prune(cls, keep: str) -> None:
+        """
+        Delete superseded templates and abandoned session copies.
+
+        Old templates are kept for an hour so sessions copying them can finish.
+
+        Args:
+            keep (str): Current template directory.
+        """
+        root = cls._root()
+        prefix = cls._origin_key() + "-"
+        cutoff = time.time() - 3600
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            if name.startswith(prefix) and path != keep and os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        session_root = os.path.join(root, "sessions")
+        if os.path.isdir(session_root):
+            session_cutoff = time.time() - Config.PROFILE_TEMPLATE_MAX_AGE_HOURS * 3600
+            for name in os.listdir(session_root):
+                path = os.path.join(session_root, name)
+                if os.path.getmtime(path) < session_cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+
+    @staticmethod
+    def _expected_metadata() -> dict:
+        """Return the metadata a fresh template must match."""
+        return {
+            "version": TEMPLATE_VERSION,
+            "origin": Config.TWITCH_URL,
+            "chrome": ChromeDriverResolver.chrome_major(),
+        }
+
+    @staticmethod
+    def _is_fresh(current: dict, expected: dict) -> bool:
+        """Check a template pointer against the expected metadata and max age."""
+        if not current or not os.path.isdir(current.get("path", "")):
+            return False
+        if any(current.get(key) != value for key, value in expected.items()):
+            return False
+        age_hours = (time.time() - current.get("created", 0)) / 3600
+        return age_hours < Config.PROFILE_TEMPLATE_MAX_AGE_HOURS
+
+    @staticmethod
+    def _root() -> str:
+        """Return the directory holding templates and session copies."""
+        return os.path.join(Config.DRIVER_CACHE_DIR, "profile_templates")
+
+    @staticmethod
+    def _origin_key() -> str:
+        """Return a filesystem-safe key for the current site origin."""
+        parts = urlsplit(Config.TWITCH_URL)
+        return f"{parts.hostname or 'local'}_{parts.port or parts.scheme}"
+
+    @classmethod
+    def _pointer_path(cls) -> str:
+        """Return the JSON file naming the current template for this origin."""
+        return os.path.join(cls._root(), f"{cls._origin_key()}.json")
+
+    @classmethod
+    def _read_pointer(cls) -> dict:
+        """
+        Load the current template pointer, treating a missing or corrupt file as empty.
+
+        Returns:
+            dict: Template metadata including "path" and "created".
+        """
+        try:
+            with open(cls._pointer_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def _write_pointer(cls, pointer: dict) -> None:
+        """
+        Atomically replace the template pointer.
+
+        Args:
+            pointer (dict): Template metadata to write.
+        """
+        path = cls._pointer_path()
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(pointer, f, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,156 @@
+from collections import Counter
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.performance_log import PerformanceLog
+from config.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# URL patterns (CDP wildcard syntax) grouped by what they load
+ANALYTICS_AND_ADS: list[str] = [
+    "*spade.twitch.tv*",
+    "*countess.twitch.tv*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*amazon-adsystem.com*",
+    "*imasdk.googleapis.com*",
+    "*scorecardresearch.com*",
+    "*sentry.io*",
+]
+
+# CDP Network.setBlockedURLs only matches URLs, so resource types are mapped to URL patterns
+RESOURCE_TYPE_PATTERNS: dict[str, list[str]] = {
+    "image": [
+        "*.png", "*.png?*", "*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.gif", "*.gif?*",
+        "*.webp", "*.webp?*", "*.avif", "*.avif?*",
+        "*static-cdn.jtvnw.net/previews-ttv/*", "*static-cdn.jtvnw.net/jtv_user_pictures/*",
+    ],
+    "media": [
+        "*.ts", "*.ts?*", "*.m4s", "*.m4s?*", "*.mp4", "*.mp4?*", "*.m3u8", "*.m3u8?*",
+        "*.wav", "*.webm", "*usher.ttvnw.net*", "*video-weaver*", "*video-edge*", "*/media/*",
+    ],
+    "font": ["*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.otf"],
+}
+
+RESOURCE_PROFILES: dict[str, dict[str, list[str]]] = {
+    "full": {"urls": [], "types": []},
+    "no_third_party": {"urls": ANALYTICS_AND_ADS, "types": []},
+    "no_media": {"urls": ANALYTICS_AND_ADS, "types": ["media"]},
+    "lean": {"urls": ANALYTICS_AND_ADS, "types": ["image", "media", "font"]},
+}
+
+# Fallback size estimates (bytes) when no request of a blocked type was loaded to average from
+DEFAULT_RESOURCE_SIZES: dict[str, int] = {
+    "Image": 40_000,
+    "Media": 500_000,
+    "Font": 30_000,
+    "Script": 60_000,
+    "XHR": 5_000,
+    "Fetch": 5_000,
+    "Other": 5_000,
+}
+
+
+class ResourceBlocker:
+    """Applies named request-blocking profiles over CDP and reports what was avoided."""
+
+    @staticmethod
+    def blocked_patterns(profile: str) -> list[str]:
+        """
+        Get the URL patterns blocked by a profile.
+
+        Args:
+            profile (str): Profile name from RESOURCE_PROFILES.
+
+        Returns:
+            list[str]: CDP URL patterns.
+
+        Raises:
+            ValueError: If the profile is unknown.
+        """
+        if profile not in RESOURCE_PROFILES:
+            raise ValueError(f"Unknown resource profile: {profile}. Available: {sorted(RESOURCE_PROFILES)}")
+        definition = RESOURCE_PROFILES[profile]
+        patterns = list(definition["urls"])
+        for resource_type in definition["types"]:
+            patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        return patterns
+
+    @classmethod
+    def apply(cls, driver: WebDriver, profile: str | None = None) -> None:
+        """
+        Apply a blocking profile to the driver, replacing any previous one.
+
+        Nothing is sent to the browser when the profile is already applied, or when
+        it blocks nothing and no profile was applied before.
+
+        Args:
+            driver (WebDriver): Chrome driver.
+            profile (str | None): Profile name. Defaults to Config.RESOURCE_PROFILE.
+
+        Raises:
+            ValueError: If the profile is unknown.
+        """
+        profile = profile or Config.RESOURCE_PROFILE
+        patterns = cls.blocked_patterns(profile)
+        previous = getattr(driver, "_resource_profile", None)
+        if previous == profile or (not patterns and previous is None):
+            driver._resource_profile = profile
+            return
+        if not hasattr(driver, "execute_cdp_cmd"):
+            if patterns:
+                logger.warning("Resource profile '%s' requires Chrome DevTools; ignoring it", profile)
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        driver._resource_profile = profile
+        logger.info("Applied resource profile '%s' (%s blocked patterns)", profile, len(patterns))
+
+    @staticmethod
+    def report(driver: WebDriver) -> dict:
+        """
+        Summarize requests blocked since the performance log was last cleared.
+
+        Blocked requests never download, so bytes avoided are estimated from the
+        average size of loaded requests of the same type (or DEFAULT_RESOURCE_SIZES).
+        Requires Config.PERFORMANCE_LOG.
+
+        Args:
+            driver (WebDriver): Chrome driver.
+
+        Returns:
+            dict: profile, blocked_requests, blocked_by_type, estimated_bytes_avoided,
+            loaded_requests and loaded_bytes.
+        """
+        types: dict[str, str] = {}
+        blocked: Counter = Counter()
+        loaded_bytes: Counter = Counter()
+        loaded_counts: Counter = Counter()
+        for event in PerformanceLog.events(driver):
+            params = event["params"]
+            if event["method"] == "Network.requestWillBeSent":
+                types[params["requestId"]] = params.get("type", "Other")
+            elif event["method"] == "Network.loadingFailed" and params.get("blockedReason") == "inspector":
+                blocked[params.get("type") or types.get(params["requestId"], "Other")] += 1
+            elif event["method"] == "Network.loadingFinished":
+                resource_type = types.get(params["requestId"], "Other")
+                loaded_counts[resource_type] += 1
+                loaded_bytes[resource_type] += params.get("encodedDataLength", 0)
+
+        estimated = 0
+        for resource_type, count in blocked.items():
+            if loaded_counts[resource_type]:
+                average = loaded_bytes[resource_type] / loaded_counts[resource_type]
+            else:
+                average = DEFAULT_RESOURCE_SIZES.get(resource_type, DEFAULT_RESOURCE_SIZES["Other"])
+            estimated += int(average * count)
+
+        return {
+            "profile": getattr(driver, "_resource_profile", "full"),
+            "blocked_requests": sum(blocked.values()),
+            "blocked_by_type": dict(blocked),
+            "estimated_bytes_avoided": estimated,
+            "loaded_requests": sum(loaded_counts.values()),
+            "loaded_bytes": sum(loaded_bytes.values()),
+        }
@@ -1,16 +1,30 @@
+import base64
 import os
 import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
 from config.config import Config
+from utils.step_timer import timed_step
 import logging
 
 logger = logging.getLogger(__name__)
 
+# CDP Page.captureScreenshot formats by file extension
+CDP_FORMATS: dict[str, str] = {"png": "png", "jpg": "jpeg", "jpeg": "jpeg", "webp": "webp"}
+
 class ScreenshotUtils:
     """Utility class for taking and managing screenshots."""
 
+    _executor: ThreadPoolExecutor | None = None
+    _slots: threading.BoundedSemaphore | None = None
+    _pending: set[Future] = set()
+    _lock: threading.Lock = threading.Lock()
+
     @staticmethod
+    @timed_step()
     def take_screenshot(
         driver: WebDriver,
         name: str | None = None,
@@ -19,6 +33,10 @@ class ScreenshotUtils:
         """
         Take a screenshot and save it to the specified directory.
 
+        With SCREENSHOT_MODE=cdp the screenshot is captured over CDP and written in
+        the background; the path is returned immediately and the file exists once
+        the write finishes (at the latest when flush() returns).
+
         Args:
             driver (WebDriver): Selenium WebDriver instance.
             name (str | None): Optional base name for the screenshot file.
@@ -30,23 +48,104 @@ class ScreenshotUtils:
         Raises:
             Exception: If the screenshot cannot be saved.
         """
+        if Config.SCREENSHOT_MODE == "cdp" and hasattr(driver, "execute_cdp_cmd"):
+            future = ScreenshotUtils.take_screenshot_async(driver, name, directory)
+            return future.path
         try:
-            screenshot_dir = directory or Config.SCREENSHOT_DIR
-            os.makedirs(screenshot_dir, exist_ok=True)
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_name = re.sub(r'\W+', '_', name) if name else "screenshot"
-            filename = f"{safe_name}_{timestamp}.{Config.SCREENSHOT_FORMAT}"
-            screenshot_path = os.path.join(screenshot_dir, filename)
-
+            screenshot_path = ScreenshotUtils._build_path(name, directory, Config.SCREENSHOT_FORMAT)
             driver.save_screenshot(screenshot_path)
             abs_path = os.path.abspath(screenshot_path)
-            logger.info(f"Screenshot saved: {abs_path}")
+            logger.info("Screenshot saved: %s", abs_path)
             return abs_path
         except Exception as e:
-            logger.error(f"Failed to take screenshot: {str(e)}")
+            logger.error("Failed to take screenshot: %s", str(e))
             raise
 
+    @staticmethod
+    def take_screenshot_async(
+        driver: WebDriver,
+        name: str | None = None,
+        directory: str | None = None,
+        image_format: str | None = None,
+        quality: int | None = None,
+        clip: dict[str, float] | None = None,
+        element: WebElement | None = None
+    ) -> Future:
+        """
+        Capture a screenshot over CDP and decode/write it on a background thread.
+
+        The capture itself happens before returning, so the image reflects the page
+        at call time. If SCREENSHOT_QUEUE_DEPTH writes are already pending, the call
+        blocks until one finishes.
+
+        Args:
+            driver (WebDriver): Chrome WebDriver instance.
+            name (str | None): Optional base name for the screenshot file.
+            directory (str | None): Optional directory to save the screenshot.
+            image_format (str | None): png, jpeg or webp. Defaults to Config.SCREENSHOT_FORMAT.
+            quality (int | None): 0-100 quality for jpeg/webp. Defaults to Config.SCREENSHOT_QUALITY.
+            clip (dict[str, float] | None): Page region {x, y, width, height} in CSS pixels.
+            element (WebElement | None): Capture only this element (overrides clip).
+
+        Returns:
+            Future: Resolves to the absolute path once written; its `path` attribute
+            holds the same path immediately.
+
+        Raises:
+            ValueError: If the format is not supported by CDP.
+        """
+        extension = (image_format or Config.SCREENSHOT_FORMAT).lower()
+        if extension not in CDP_FORMATS:
+            raise ValueError(f"Unsupported screenshot format: {extension}")
+        params: dict = {"format": CDP_FORMATS[extension], "captureBeyondViewport": False}
+        if params["format"] != "png":
+            params["quality"] = quality if quality is not None else Config.SCREENSHOT_QUALITY
+        if element is not None:
+            clip = driver.execute_script("""
+                var r = arguments[0].getBoundingClientRect();
+                return {x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height};
+            """, element)
+        if clip:
+            params["clip"] = {**clip, "scale": clip.get("scale", 1)}
+            params["captureBeyondViewport"] = True
+
+        abs_path = os.path.abspath(ScreenshotUtils._build_path(name, directory, extension))
+        data = driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+
+        executor, slots = ScreenshotUtils._get_executor()
+        slots.acquire()
+        future = executor.submit(ScreenshotUtils._write_image, data, abs_path)
+        future.path = abs_path
+        with ScreenshotUtils._lock:
+            ScreenshotUtils._pending.add(future)
+        future.add_done_callback(ScreenshotUtils._on_write_done)
+        return future
+
+    @staticmethod
+    def flush(timeout: float | None = None) -> None:
+        """
+        Wait for all pending background screenshot writes.
+
+        Args:
+            timeout (float | None): Max seconds to wait; None waits indefinitely.
+        """
+        with ScreenshotUtils._lock:
+            pending = list(ScreenshotUtils._pending)
+        if not pending:
+            return
+        _, not_done = wait(pending, timeout=timeout)
+        if not_done:
+            logger.warning("%s screenshot writes still pending after %ss", len(not_done), timeout)
+
+    @staticmethod
+    def shutdown() -> None:
+        """Flush pending writes and stop the background writer threads."""
+        ScreenshotUtils.flush()
+        if ScreenshotUtils._executor:
+            ScreenshotUtils._executor.shutdown(wait=True)
+            ScreenshotUtils._executor = None
+            ScreenshotUtils._slots = None
+
     @staticmethod
     def take_screenshot_on_failure(
         driver: WebDriver,
@@ -64,3 +163,42 @@ class ScreenshotUtils:
         """
         failure_dir = os.path.join(Config.SCREENSHOT_DIR, "failures")
         return ScreenshotUtils.take_screenshot(driver, f"FAIL_{test_name}", failure_dir)
+
+    @staticmethod
+    def _build_path(name: str | None, directory: str | None, extension: str) -> str:
+        """Create the target directory and return a timestamped screenshot path."""
+        screenshot_dir = directory or Config.SCREENSHOT_DIR
+        os.makedirs(screenshot_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        safe_name = re.sub(r'\W+', '_', name) if name else "screenshot"
+        return os.path.join(screenshot_dir, f"{safe_name}_{timestamp}.{extension}")
+
+    @staticmethod
+    def _get_executor() -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+        """Lazily create the writer pool and its queue-depth semaphore."""
+        with ScreenshotUtils._lock:
+            if ScreenshotUtils._executor is None:
+                ScreenshotUtils._executor = ThreadPoolExecutor(
+                    max_workers=Config.SCREENSHOT_WORKERS, thread_name_prefix="screenshot-writer"
+                )
+                ScreenshotUtils._slots = threading.BoundedSemaphore(Config.SCREENSHOT_QUEUE_DEPTH)
+            return ScreenshotUtils._executor, ScreenshotUtils._slots
+
+    @staticmethod
+    def _write_image(data: str, path: str) -> str:
+        """Decode base64 image data and write it to disk (runs on a writer thread)."""
+        with open(path, "wb") as f:
+            f.write(base64.b64decode(data))
+        logger.info("Screenshot saved: %s", path)
+        return path
+
+    @staticmethod
+    def _on_write_done(future: Future) -> None:
+        """Release the queue slot of a finished write and log failures."""
+        with ScreenshotUtils._lock:
+            ScreenshotUtils._pending.discard(future)
+            slots = ScreenshotUtils._slots
+        if slots:
+            slots.release()
+        if future.exception():
+            logger.error("Failed to write screenshot %s: %s", future.path, future.exception())
@@ -0,0 +1,826 @@
+"""
+Pure-Python CSS selector and XPath matching against recorded DOM snapshots.
+
+Supports the selector features page objects use: type, id, class and attribute
+selectors (all operators, with the `i` flag), the four combinators, selector lists,
+and the structural pseudo-classes :first-child, :last-child, :only-child,
+:nth-child(), :not() and :empty (plus :checked, :disabled and :enabled judged from
+attributes). XPath covers location paths on the element axes, predicates with
+position, comparisons, and/or, and the common string functions. Anything that
+needs a live browser (:hover, layout, text node results) raises
+UnsupportedSelectorError instead of guessing.
+
+Selectors are compiled once and matched against the snapshot's tag/id/class/attribute
+indexes, so one compiled locator can be checked against many snapshots cheaply.
+"""
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable
+from selenium.webdriver.common.by import By
+from pages.browser_scripts import to_browser_query
+
+if TYPE_CHECKING:
+    from utils.dom_snapshot import DomSnapshot
+
+
+class UnsupportedSelectorError(ValueError):
+    """Raised when a locator uses a feature that cannot be evaluated on a snapshot."""
+
+
+# A compiled selector: returns the indexes of matching elements in document order
+Matcher = Callable[["DomSnapshot"], list[int]]
+
+
+@lru_cache(maxsize=1024)
+def compile_locator(locator: tuple[str, str]) -> Matcher:
+    """
+    Compile a Selenium locator into a snapshot matcher.
+
+    Args:
+        locator (tuple[str, str]): Locator tuple (By, value).
+
+    Returns:
+        Matcher: Function returning matching element indexes for a DomSnapshot.
+
+    Raises:
+        UnsupportedSelectorError: If the locator cannot be evaluated offline.
+    """
+    by, value = locator
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        partial = by == By.PARTIAL_LINK_TEXT
+
+        def match_link_text(snapshot: "DomSnapshot") -> list[int]:
+            result = []
+            for index in snapshot.by_tag.get("a", ()):
+                text = snapshot.string_value(index).strip()
+                if (value in text) if partial else text == value:
+                    result.append(index)
+            return result
+        return match_link_text
+    query = to_browser_query(locator)
+    if not query:
+        raise UnsupportedSelectorError(f"Unsupported locator strategy: {by}")
+    kind, expression = query
+    return compile_css(expression) if kind == "css" else compile_xpath(expression)
+
+
+# --- CSS ---
+
+_CSS_IDENT = r"(?:\\[0-9a-fA-F]{1,6}\s?|\\.|[\w\-\u00a0-\uffff])+"
+_CSS_TOKEN = re.compile(
+    rf"""
+    (?P<ws>\s+)
+    | (?P<comb>[>+~])
+    | (?P<comma>,)
+    | (?P<star>\*)
+    | (?P<id>\#{_CSS_IDENT})
+    | (?P<cls>\.{_CSS_IDENT})
+    | (?P<attr>\[\s*(?P<aname>{_CSS_IDENT})\s*
+        (?:(?P<aop>[~|^$*]?=)\s*(?P<aval>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|{_CSS_IDENT})\s*(?P<aflag>[iIsS])?\s*)?\])
+    | (?P<pseudo>::?{_CSS_IDENT})(?P<popen>\()?
+    | (?P<tag>{_CSS_IDENT})
+    """,
+    re.VERBOSE,
+)
+_CSS_TOKEN_KINDS: tuple[str, ...] = ("ws", "comb", "comma", "star", "id", "cls", "attr", "pseudo", "tag")
+
+_CSS_ATTRIBUTE_OPS: dict[str, Callable[[str, str], bool]] = {
+    "=": lambda actual, expected: actual == expected,
+    "~=": lambda actual, expected: expected in actual.split(),
+    "|=": lambda actual, expected: actual == expected or actual.startswith(expected + "-"),
+    "^=": lambda actual, expected: bool(expected) and actual.startswith(expected),
+    "$=": lambda actual, expected: bool(expected) and actual.endswith(expected),
+    "*=": lambda actual, expected: bool(expected) and expected in actual,
+}
+
+
+def _css_unescape(value: str) -> str:
+    """Resolve CSS backslash escapes in an identifier or string."""
+    return re.sub(
+        r"\\([0-9a-fA-F]{1,6})\s?|\\(.)",
+        lambda m: chr(int(m.group(1), 16)) if m.group(1) else m.group(2),
+        value,
+    )
+
+
+class _Compound:
+    """One compound selector, e.g. `button.tw-link[data-href]:not(.hidden)`."""
+
+    __slots__ = ("tag", "element_id", "classes", "attributes", "attribute_equals", "pseudos")
+
+    def __init__(self):
+        self.tag: str | None = None
+        self.element_id: str | None = None
+        self.classes: list[str] = []
+        self.attributes: list[tuple[str, Callable[[str], bool] | None]] = []
+        # Case-sensitive [name="value"] tests, answered from the snapshot's value index
+        self.attribute_equals: list[tuple[str, str]] = []
+        self.pseudos: list[Callable[["DomSnapshot", int], bool]] = []
+
+    def is_empty(self) -> bool:
+        return not (self.tag or self.element_id or self.classes or self.attributes or self.pseudos)
+
+    def candidates(self, snapshot: "DomSnapshot"):
+        """Smallest index bucket that can contain matches."""
+        if self.element_id is not None:
+            return snapshot.by_id.get(self.element_id, ())
+        buckets = [snapshot.by_class.get(name, ()) for name in self.classes]
+        buckets.extend(
+            snapshot.attribute_values(name).get(value, ()) for name, value in self.attribute_equals
+        )
+        if self.tag:
+            buckets.append(snapshot.by_tag.get(self.tag, ()))
+        if not buckets and self.attributes:
+            buckets.append(snapshot.by_attribute.get(self.attributes[0][0], ()))
+        return min(buckets, key=len) if buckets else range(len(snapshot))
+
+    def matches(self, snapshot: "DomSnapshot", index: int) -> bool:
+        if self.tag and snapshot.tags[index] != self.tag:
+            return False
+        attrs = snapshot.attrs[index]
+        if self.element_id is not None and attrs.get("id") != self.element_id:
+            return False
+        if self.classes:
+            classes = snapshot.class_sets[index]
+            if not all(name in classes for name in self.classes):
+                return False
+        for name, test in self.attributes:
+            value = attrs.get(name)
+            if value is None or (test is not None and not test(value)):
+                return False
+        return all(pseudo(snapshot, index) for pseudo in self.pseudos)
+
+
+def _nth(expression: str) -> Callable[[int], bool]:
+    """Compile an An+B expression into a 1-based position test."""
+    expression = expression.replace(" ", "").lower()
+    if expression == "odd":
+        expression = "2n+1"
+    elif expression == "even":
+        expression = "2n"
+    match = re.fullmatch(r"([+-]?\d*)n([+-]\d+)?|([+-]?\d+)", expression)
+    if not match:
+        raise UnsupportedSelectorError(f"Unsupported :nth-child argument: {expression}")
+    if match.group(3) is not None:
+        b = int(match.group(3))
+        return lambda position: position == b
+    a = int(match.group(1) + "1" if match.group(1) in ("", "+", "-") else match.group(1))
+    b = int(match.group(2) or 0)
+    if a == 0:
+        return lambda position: position == b
+    return lambda position: (position - b) % a == 0 and (position - b) // a >= 0
+
+
+def _pseudo(name: str, argument: str | None) -> Callable[["DomSnapshot", int], bool]:
+    """Compile a supported pseudo-class."""
+    if name == "first-child":
+        return lambda s, i: s.sibling_position[i] == 0
+    if name == "last-child":
+        return lambda s, i: s.sibling_position[i] == len(s.children_of(s.parents[i])) - 1
+    if name == "only-child":
+        return lambda s, i: len(s.children_of(s.parents[i])) == 1
+    if name == "nth-child" and argument is not None:
+        test = _nth(argument)
+        return lambda s, i: test(s.sibling_position[i] + 1)
+    if name == "nth-last-child" and argument is not None:
+        test = _nth(argument)
+        return lambda s, i: test(len(s.children_of(s.parents[i])) - s.sibling_position[i])
+    if name == "empty":
+        return lambda s, i: not s.children[i] and not s.texts[i]
+    if name == "checked":
+        return lambda s, i: "checked" in s.attrs[i] or "selected" in s.attrs[i]
+    if name == "disabled":
+        return lambda s, i: "disabled" in s.attrs[i]
+    if name == "enabled":
+        return lambda s, i: "disabled" not in s.attrs[i]
+    if name == "not" and argument is not None:
+        negated = _parse_css(argument)
+        return lambda s, i: not any(_matches_complex(s, i, parts, 0) for parts in negated)
+    raise UnsupportedSelectorError(f"Unsupported pseudo-class: :{name}")
+
+
+def _closing_paren(selector: str, start: int) -> int:
+    """Index of the parenthesis closing the one opened just before `start`."""
+    depth = 1
+    quote = None
+    for position in range(start, len(selector)):
+        char = selector[position]
+        if quote:
+            if char == quote and selector[position - 1] != "\\":
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if not depth:
+                return position
+    raise UnsupportedSelectorError(f"Unbalanced parenthesis in selector: {selector}")
+
+
+def _parse_css(selector: str) -> list[list[tuple[_Compound, str]]]:
+    """
+    Parse a selector list.
+
+    Returns:
+        list[list[tuple[_Compound, str]]]: Per selector, its compounds from right to
+        left, each with the combinator linking it to the next compound on the left.
+    """
+    selectors: list[list[tuple[_Compound, str]]] = []
+    parts: list[tuple[_Compound, str]] = []
+    compound = _Compound()
+    combinator = ""
+    position = 0
+    selector = selector.strip()
+
+    def invalid() -> UnsupportedSelectorError:
+        return UnsupportedSelectorError(f"Invalid selector: {selector}")
+
+    while position < len(selector):
+        match = _CSS_TOKEN.match(selector, position)
+        if not match:
+            raise UnsupportedSelectorError(f"Cannot parse selector at {selector[position:]!r}: {selector}")
+        position = match.end()
+        kind = next(k for k in _CSS_TOKEN_KINDS if match.group(k) is not None)
+        if kind in ("ws", "comb", "comma"):
+            if not compound.is_empty():
+                # Each compound is stored with the combinator that preceded it, which is
+                # the one linking it to its left neighbour when matching right to left
+                parts.append((compound, combinator))
+                compound, combinator = _Compound(), ""
+            if kind == "comb":
+                if not parts or combinator.strip():
+                    raise invalid()
+                combinator = match.group("comb")
+            elif kind == "ws" and parts and not combinator:
+                combinator = " "
+            elif kind == "comma":
+                if not parts or combinator.strip():
+                    raise invalid()
+                selectors.append(parts[::-1])
+                parts, combinator = [], ""
+            continue
+        if kind == "tag":
+            compound.tag = _css_unescape(match.group("tag")).lower()
+        elif kind == "id":
+            compound.element_id = _css_unescape(match.group("id")[1:])
+        elif kind == "cls":
+            compound.classes.append(_css_unescape(match.group("cls")[1:]))
+        elif kind == "attr":
+            compound.attributes.append(_attribute_test(match))
+            if match.group("aop") == "=" and (match.group("aflag") or "").lower() != "i":
+                raw = match.group("aval")
+                compound.attribute_equals.append(
+                    (compound.attributes[-1][0], _css_unescape(raw[1:-1] if raw[0] in "'\"" else raw))
+                )
+        elif kind == "pseudo":
+            name = match.group("pseudo")
+            if name.startswith("::"):
+                raise UnsupportedSelectorError(f"Pseudo-elements cannot be matched: {name}")
+            argument = None
+            if match.group("popen"):
+                end = _closing_paren(selector, position)
+                argument = selector[position:end]
+                position = end + 1
+            compound.pseudos.append(_pseudo(_css_unescape(name[1:]).lower(), argument))
+        elif kind == "star" and compound.is_empty():
+            # `*` alone must still count as a compound
+            compound.pseudos.append(lambda s, i: True)
+    if compound.is_empty():
+        raise invalid()
+    parts.append((compound, combinator))
+    selectors.append(parts[::-1])
+    return selectors
+
+
+def _attribute_test(match: re.Match) -> tuple[str, Callable[[str], bool] | None]:
+    """Compile an attribute selector token into (name, value test or None for presence)."""
+    name = _css_unescape(match.group("aname")).lower()
+    op = match.group("aop")
+    if not op:
+        return name, None
+    raw = match.group("aval")
+    expected = _css_unescape(raw[1:-1] if raw[0] in "'\"" else raw)
+    compare = _CSS_ATTRIBUTE_OPS[op]
+    if (match.group("aflag") or "").lower() == "i":
+        expected = expected.lower()
+        return name, lambda actual: compare(actual.lower(), expected)
+    return name, lambda actual: compare(actual, expected)
+
+
+def _matches_complex(
+    snapshot: "DomSnapshot", index: int, parts: list[tuple[_Compound, str]], position: int
+) -> bool:
+    """Check compound `position` (counted from the right) and everything to its left."""
+    compound, combinator = parts[position]
+    if not compound.matches(snapshot, index):
+        return False
+    if position + 1 == len(parts):
+        return True
+    if combinator == ">":
+        parent = snapshot.parents[index]
+        return parent >= 0 and _matches_complex(snapshot, parent, parts, position + 1)
+    if combinator == " ":
+        ancestor = snapshot.parents[index]
+        while ancestor >= 0:
+            if _matches_complex(snapshot, ancestor, parts, position + 1):
+                return True
+            ancestor = snapshot.parents[ancestor]
+        return False
+    siblings = snapshot.children_of(snapshot.parents[index])
+    sibling_position = snapshot.sibling_position[index]
+    if combinator == "+":
+        return sibling_position > 0 and _matches_complex(snapshot, siblings[sibling_position - 1], parts, position + 1)
+    return any(_matches_complex(snapshot, sibling, parts, position + 1) for sibling in siblings[:sibling_position])
+
+
+def compile_css(selector: str) -> Matcher:
+    """
+    Compile a CSS selector (list) into a snapshot matcher.
+
+    Args:
+        selector (str): CSS selector.
+
+    Returns:
+        Matcher: Function returning matching element indexes for a DomSnapshot.
+
+    Raises:
+        UnsupportedSelectorError: If the selector is invalid or uses unsupported features.
+    """
+    selectors = _parse_css(selector)
+
+    def match_css(snapshot: "DomSnapshot") -> list[int]:
+        if len(selectors) == 1:
+            parts = selectors[0]
+            rightmost = parts[0][0]
+            return [i for i in rightmost.candidates(snapshot) if _matches_complex(snapshot, i, parts, 0)]
+        found = set()
+        for parts in selectors:
+            found.update(i for i in parts[0][0].candidates(snapshot) if _matches_complex(snapshot, i, parts, 0))
+        return sorted(found)
+    return match_css
+
+
+# --- XPath ---
+
+_XPATH_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<literal>"[^"]*"|'[^']*')
+        | (?P<number>\d+(?:\.\d+)?|\.\d+)
+        | (?P<op>//|::|\.\.|!=|<=|>=|[/()\[\]@,=<>|.*])
+        | (?P<name>[A-Za-z_][\w\-]*(?::[A-Za-z_][\w\-]*)?)
+    )""",
+    re.VERBOSE,
+)
+
+_AXES: frozenset[str] = frozenset({
+    "child", "descendant", "descendant-or-self", "self", "parent", "ancestor", "ancestor-or-self",
+    "following-sibling", "preceding-sibling", "following", "preceding",
+})
+_NODE_TYPES: frozenset[str] = frozenset({"node", "text"})
+
+# An evaluated XPath expression: (snapshot, context node, position, size) -> value
+_Evaluator = Callable[["DomSnapshot", int, int, int], object]
+
+
+class _NodeSet(list):
+    """Element indexes in document order (-1 is the document node)."""
+
+
+class _Strings(list):
+    """Attribute values or text node contents selected by a path."""
+
+
+def _string(snapshot: "DomSnapshot", value: object) -> str:
+    """XPath string() conversion."""
+    if isinstance(value, _NodeSet):
+        return snapshot.string_value(value[0]) if value else ""
+    if isinstance(value, _Strings):
+        return value[0] if value else ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else str(value)
+    return value
+
+
+def _number(snapshot: "DomSnapshot", value: object) -> float:
+    """XPath number() conversion."""
+    if isinstance(value, (float, bool)):
+        return float(value)
+    try:
+        return float(_string(snapshot, value).strip())
+    except ValueError:
+        return float("nan")
+
+
+def _boolean(value: object) -> bool:
+    """XPath boolean() conversion."""
+    if isinstance(value, float):
+        return value == value and value != 0
+    return bool(value)
+
+
+def _compare(snapshot: "DomSnapshot", op: str, left: object, right: object) -> bool:
+    """XPath comparison, with existential semantics for node-sets."""
+    if isinstance(left, (_NodeSet, _Strings)):
+        items = [snapshot.string_value(i) for i in left] if isinstance(left, _NodeSet) else left
+        if isinstance(right, bool):
+            return _compare(snapshot, op, bool(items), right)
+        return any(_compare(snapshot, op, item, right) for item in items)
+    if isinstance(right, (_NodeSet, _Strings)):
+        flipped = {"<": ">", ">": "<", "<=": ">=", ">=": "<="}.get(op, op)
+        return _compare(snapshot, flipped, right, left)
+    if op in ("=", "!="):
+        if isinstance(left, bool) or isinstance(right, bool):
+            equal = _boolean(left) == _boolean(right)
+        elif isinstance(left, float) or isinstance(right, float):
+            equal = _number(snapshot, left) == _number(snapshot, right)
+        else:
+            equal = left == right
+        return equal if op == "=" else not equal
+    left_number, right_number = _number(snapshot, left), _number(snapshot, right)
+    return {
+        "<": left_number < right_number, ">": left_number > right_number,
+        "<=": left_number <= right_number, ">=": left_number >= right_number,
+    }[op]
+
+
+def _axis(snapshot: "DomSnapshot", axis: str, node: int, tag: str | None) -> list[int]:
+    """
+    Nodes on an axis from `node`, in axis order (reverse document order for reverse axes).
+
+    Args:
+        tag (str | None): Keep only elements with this tag; None keeps every node,
+            "*" every element.
+    """
+    if axis == "descendant":
+        if tag and tag != "*":
+            return snapshot.descendants_with_tag(node, tag)
+        return list(snapshot.descendants(node))
+    if axis == "child":
+        nodes = snapshot.children_of(node)
+    elif axis == "descendant-or-self":
+        nodes = [node, *snapshot.descendants(node)]
+    elif axis == "self":
+        nodes = [node]
+    elif axis == "parent":
+        nodes = [snapshot.parents[node]] if node >= 0 else []
+    elif axis in ("ancestor", "ancestor-or-self"):
+        nodes = [node] if axis == "ancestor-or-self" else []
+        current = node
+        while current >= 0:
+            current = snapshot.parents[current]
+            nodes.append(current)
+    elif axis in ("following-sibling", "preceding-sibling"):
+        if node < 0:
+            return []
+        siblings = snapshot.children_of(snapshot.parents[node])
+        position = snapshot.sibling_position[node]
+        nodes = siblings[position + 1:] if axis == "following-sibling" else siblings[:position][::-1]
+    elif axis == "following":
+        nodes = range(snapshot.subtree_end[node], len(snapshot)) if node >= 0 else []
+    else:
+        ancestors = set(snapshot.ancestors(node))
+        nodes = [i for i in range(node - 1, -1, -1) if i not in ancestors] if node >= 0 else []
+    if tag is None:
+        return list(nodes)
+    if tag == "*":
+        return [i for i in nodes if i >= 0]
+    return [i for i in nodes if i >= 0 and snapshot.tags[i] == tag]
+
+
+class _XPathParser:
+    """Recursive descent parser compiling an XPath 1.0 subset into evaluators."""
+
+    def __init__(self, expression: str):
+        self.expression: str = expression
+        self.tokens: list[tuple[str, str]] = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _XPATH_TOKEN.match(expression, position)
+            if not match or match.end() == position:
+                raise UnsupportedSelectorError(f"Cannot parse XPath at {expression[position:]!r}: {self.expression}")
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind)))
+            position = match.end()
+        self.index: int = 0
+        # Set while compiling a predicate that depends on the node's position
+        self.positional: bool = False
+
+    def error(self, message: str = "Unsupported XPath") -> UnsupportedSelectorError:
+        return UnsupportedSelectorError(f"{message}: {self.expression}")
+
+    def peek(self, offset: int = 0) -> tuple[str, str] | None:
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def accept(self, value: str) -> bool:
+        token = self.peek()
+        if token and token[0] in ("op", "name") and token[1] == value:
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, value: str) -> None:
+        if not self.accept(value):
+            raise self.error(f"Expected {value!r}")
+
+    def parse(self) -> _Evaluator:
+        evaluator = self.parse_or()
+        if self.peek():
+            raise self.error(f"Unexpected {self.peek()[1]!r}")
+        return evaluator
+
+    def parse_or(self) -> _Evaluator:
+        left = self.parse_and()
+        while self.accept("or"):
+            left = (lambda a, b: lambda s, n, p, z: _boolean(a(s, n, p, z)) or _boolean(b(s, n, p, z)))(
+                left, self.parse_and()
+            )
+        return left
+
+    def parse_and(self) -> _Evaluator:
+        left = self.parse_comparison()
+        while self.accept("and"):
+            left = (lambda a, b: lambda s, n, p, z: _boolean(a(s, n, p, z)) and _boolean(b(s, n, p, z)))(
+                left, self.parse_comparison()
+            )
+        return left
+
+    def parse_comparison(self) -> _Evaluator:
+        left = self.parse_union()
+        while (token := self.peek()) and token[0] == "op" and token[1] in ("=", "!=", "<", ">", "<=", ">="):
+            self.index += 1
+            left = (lambda a, b, op: lambda s, n, p, z: _compare(s, op, a(s, n, p, z), b(s, n, p, z)))(
+                left, self.parse_union(), token[1]
+            )
+        return left
+
+    def parse_union(self) -> _Evaluator:
+        paths = [self.parse_path()]
+        while self.accept("|"):
+            paths.append(self.parse_path())
+        if len(paths) == 1:
+            return paths[0]
+
+        def union(s, n, p, z):
+            found = set()
+            for path in paths:
+                value = path(s, n, p, z)
+                if not isinstance(value, _NodeSet):
+                    raise UnsupportedSelectorError("Union operands must be element node-sets")
+                found.update(value)
+            return _NodeSet(sorted(found))
+        return union
+
+    def parse_path(self) -> _Evaluator:
+        token = self.peek()
+        if token is None:
+            raise self.error("Unexpected end of expression")
+        kind, value = token
+        if kind == "literal":
+            self.index += 1
+            literal = value[1:-1]
+            return lambda s, n, p, z: literal
+        if kind == "number":
+            self.index += 1
+            number = float(value)
+            return lambda s, n, p, z: number
+        if kind == "op" and value == "(":
+            self.index += 1
+            inner = self.parse_or()
+            self.expect(")")
+            return self.parse_filter(inner)
+        if kind == "name" and self.peek(1) == ("op", "(") and value not in _NODE_TYPES:
+            return self.parse_filter(self.parse_function())
+        return self.parse_location_path()
+
+    def parse_filter(self, primary: _Evaluator) -> _Evaluator:
+        """Predicates applied to a parenthesized node-set, e.g. (//a)[1]."""
+        predicates = []
+        while self.accept("["):
+            predicates.append(self.parse_predicate())
+        if not predicates:
+            return primary
+
+        def filtered(s, n, p, z):
+            nodes = primary(s, n, p, z)
+            if not isinstance(nodes, _NodeSet):
+                raise UnsupportedSelectorError("Predicates can only filter element node-sets")
+            for predicate in predicates:
+                nodes = _apply_predicate(s, predicate, nodes)
+            return _NodeSet(nodes)
+        return filtered
+
+    def parse_function(self) -> _Evaluator:
+        name = self.peek()[1]
+        self.index += 2
+        args: list[_Evaluator] = []
+        if not self.accept(")"):
+            args.append(self.parse_or())
+            while self.accept(","):
+                args.append(self.parse_or())
+            self.expect(")")
+        return self.function(name, args)
+
+    def function(self, name: str, args: list[_Evaluator]) -> _Evaluator:
+        def arg_or_context(s, n, p, z):
+            return args[0](s, n, p, z) if args else _NodeSet([n])
+
+        if name == "position":
+            self.positional = True
+            return lambda s, n, p, z: float(p)
+        if name == "last":
+            self.positional = True
+            return lambda s, n, p, z: float(z)
+        if name == "contains" and len(args) == 2:
+            return lambda s, n, p, z: _string(s, args[1](s, n, p, z)) in _string(s, args[0](s, n, p, z))
+        if name == "starts-with" and len(args) == 2:
+            return lambda s, n, p, z: _string(s, args[0](s, n, p, z)).startswith(_string(s, args[1](s, n, p, z)))
+        if name == "normalize-space" and len(args) <= 1:
+            return lambda s, n, p, z: " ".join(_string(s, arg_or_context(s, n, p, z)).split())
+        if name == "string" and len(args) <= 1:
+            return lambda s, n, p, z: _string(s, arg_or_context(s, n, p, z))
+        if name == "string-length" and len(args) <= 1:
+            return lambda s, n, p, z: float(len(_string(s, arg_or_context(s, n, p, z))))
+        if name == "concat" and len(args) >= 2:
+            return lambda s, n, p, z: "".join(_string(s, arg(s, n, p, z)) for arg in args)
+        if name == "translate" and len(args) == 3:
+            def translate(s, n, p, z):
+                source, search, replace = (_string(s, arg(s, n, p, z)) for arg in args)
+                table = {ord(c): (replace[i] if i < len(replace) else None) for i, c in reversed(list(enumerate(search)))}
+                return source.translate(table)
+            return translate
+        if name == "not" and len(args) == 1:
+            return lambda s, n, p, z: not _boolean(args[0](s, n, p, z))
+        if name == "boolean" and len(args) == 1:
+            return lambda s, n, p, z: _boolean(args[0](s, n, p, z))
+        if name == "count" and len(args) == 1:
+            return lambda s, n, p, z: float(len(args[0](s, n, p, z)))
+        if name in ("name", "local-name") and len(args) <= 1:
+            def node_name(s, n, p, z):
+                nodes = arg_or_context(s, n, p, z)
+                return s.tags[nodes[0]] if isinstance(nodes, _NodeSet) and nodes and nodes[0] >= 0 else ""
+            return node_name
+        if name == "true" and not args:
+            return lambda s, n, p, z: True
+        if name == "false" and not args:
+            return lambda s, n, p, z: False
+        raise self.error(f"Unsupported XPath function {name}()")
+
+    def parse_predicate(self) -> tuple[_Evaluator, bool]:
+        """Compile a predicate body; returns (evaluator, depends on position)."""
+        outer, self.positional = self.positional, False
+        evaluator = self.parse_or()
+        self.expect("]")
+        positional, self.positional = self.positional, outer
+        token = self.tokens[self.index - 2]
+        if token[0] == "number" and self.tokens[self.index - 3] == ("op", "["):
+            positional = True
+        return evaluator, positional
+
+    def parse_location_path(self) -> _Evaluator:
+        steps: list[tuple[str, str | None, list]] = []
+        absolute = False
+        if self.accept("/"):
+            absolute = True
+            token = self.peek()
+            if token is None or (token[0] == "op" and token[1] not in (".", "..", "@", "*")):
+                return lambda s, n, p, z: _NodeSet([-1])
+        elif self.accept("//"):
+            absolute = True
+            steps.append(("descendant-or-self", None, []))
+        steps.append(self.parse_step())
+        while True:
+            if self.accept("/"):
+                steps.append(self.parse_step())
+            elif self.accept("//"):
+                steps.append(("descendant-or-self", None, []))
+                steps.append(self.parse_step())
+            else:
+                break
+        steps = _collapse_descendant_steps(steps)
+        for axis, _, _ in steps[:-1]:
+            if axis in ("attribute", "text"):
+                raise self.error("Attribute and text() steps must come last")
+
+        def evaluate_path(s, n, p, z):
+            nodes = [-1] if absolute else [n]
+            for axis, tag, predicates in steps:
+                if axis == "attribute":
+                    return _Strings(
+                        value for node in nodes if node >= 0
+                        for name, value in s.attrs[node].items() if tag == "*" or name == tag
+                    )
+                if axis == "text":
+                    return _Strings(s.texts[node] for node in nodes if node >= 0 and s.texts[node])
+                found: set[int] = set()
+                for node in nodes:
+                    candidates = _axis(s, axis, node, tag)
+                    for predicate in predicates:
+                        candidates = _apply_predicate(s, predicate, candidates)
+                    found.update(candidates)
+                nodes = sorted(found)
+            return _NodeSet(nodes)
+        return evaluate_path
+
+    def parse_step(self) -> tuple[str, str | None, list]:
+        if self.accept("."):
+            return "self", None, []
+        if self.accept(".."):
+            return "parent", None, []
+        if self.accept("@"):
+            token = self.peek()
+            if token is None or not (token[0] == "name" or token[1] == "*"):
+                raise self.error("Expected attribute name")
+            self.index += 1
+            return "attribute", token[1].lower(), []
+        axis = "child"
+        token = self.peek()
+        if token and token[0] == "name" and self.peek(1) == ("op", "::"):
+            axis = token[1]
+            if axis not in _AXES:
+                raise self.error(f"Unsupported XPath axis {axis}")
+            self.index += 2
+            token = self.peek()
+        if token is None:
+            raise self.error("Expected a node test")
+        self.index += 1
+        if token == ("op", "*"):
+            tag = "*"
+        elif token[0] == "name" and token[1] in _NODE_TYPES and self.accept("("):
+            self.expect(")")
+            if token[1] == "text":
+                if axis != "child":
+                    raise self.error("text() is only supported on the child axis")
+                return "text", None, []
+            tag = None
+        elif token[0] == "name":
+            tag = token[1].lower()
+        else:
+            raise self.error(f"Unexpected {token[1]!r}")
+        predicates = []
+        while self.accept("["):
+            predicates.append(self.parse_predicate())
+        return axis, tag, predicates
+
+
+def _collapse_descendant_steps(steps: list[tuple[str, str | None, list]]) -> list[tuple[str, str | None, list]]:
+    """
+    Rewrite `descendant-or-self::node()/child::x[p]` as `descendant::x[p]`.
+
+    Equivalent whenever no predicate depends on position, and lets `//x` use the
+    snapshot's tag index instead of walking the tree.
+    """
+    result: list[tuple[str, str | None, list]] = []
+    for step in steps:
+        if (
+            result and result[-1] == ("descendant-or-self", None, [])
+            and step[0] == "child" and not any(positional for _, positional in step[2])
+        ):
+            result[-1] = ("descendant", step[1], step[2])
+        else:
+            result.append(step)
+    return result
+
+
+def _apply_predicate(snapshot: "DomSnapshot", predicate: tuple[_Evaluator, bool], nodes: list[int]) -> list[int]:
+    """Filter nodes (in axis order) through one predicate."""
+    evaluator, positional = predicate
+    size = len(nodes)
+    kept = []
+    for position, node in enumerate(nodes, 1):
+        value = evaluator(snapshot, node, position, size)
+        if isinstance(value, float) and not isinstance(value, bool):
+            if value == position:
+                kept.append(node)
+        elif _boolean(value):
+            kept.append(node)
+    return kept
+
+
+def compile_xpath(expression: str) -> Matcher:
+    """
+    Compile an XPath expression selecting elements into a snapshot matcher.
+
+    Args:
+        expression (str): XPath 1.0 expression.
+
+    Returns:
+        Matcher: Function returning matching element indexes for a DomSnapshot.
+
+    Raises:
+        UnsupportedSelectorError: If the expression is invalid, uses unsupported
+            features or does not select elements.
+    """
+    evaluator = _XPathParser(expression).parse()
+
+    def match_xpath(snapshot: "DomSnapshot") -> list[int]:
+        value = evaluator(snapshot, -1, 1, 1)
+        if not isinstance(value, _NodeSet):
+            raise UnsupportedSelectorError(f"XPath does not select elements: {expression}")
+        return [i for i in value if i >= 0]
+    return match_xpath
@@ -0,0 +1,267 @@
+"""
+In-browser cost profile of page object locators.
+
+Times every locator declared on a page object (utils.locator_registry) with
+querySelectorAll / document.evaluate inside the live page, or inside a recorded
+DOM snapshot rebuilt in an inert page, at several DOM sizes. Reports cost per call,
+match counts and how cost grows with the number of elements.
+
+    python -m utils.selector_profiler --standin
+    python -m utils.selector_profiler --url https://www.twitch.tv --paths / /directory
+    python -m utils.selector_profiler --snapshots reports/dom_snapshots
+"""
+import argparse
+import json
+import math
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from urllib.parse import quote
+from selenium.webdriver.remote.webdriver import WebDriver
+from pages import browser_scripts
+from utils.dom_snapshot import DomSnapshot, load_snapshots
+from utils.locator_registry import RegisteredLocator, discover_locators
+from utils.locator_replay import default_snapshot_paths
+from utils.standin_server import StandInOptions, StandInServer
+from utils.webdriver_factory import WebDriverFactory
+from config.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Blank page whose Content-Security-Policy blocks every load, so rebuilt snapshots stay inert
+INERT_PAGE: str = "data:text/html," + quote(
+    "<!DOCTYPE html><meta http-equiv=\"Content-Security-Policy\" content=\"default-src 'none'\">"
+)
+# Scaling exponent above which a locator's cost grows faster than the DOM
+SUPERLINEAR_EXPONENT: float = 1.2
+
+
+@dataclass
+class SelectorCost:
+    """Cost of one locator on one page at one DOM scale."""
+
+    locator: str
+    query: str
+    page: str
+    scale: int
+    nodes: int
+    matches: int | None
+    per_call_us: float | None
+    iterations: int = 0
+    error: str | None = None
+
+
+class SelectorProfiler:
+    """Measures page object locator costs in a browser."""
+
+    def __init__(
+        self,
+        driver: WebDriver,
+        locators: list[RegisteredLocator] | None = None,
+        scales: tuple[int, ...] = (1, 2, 4),
+        min_time_ms: float = 25,
+        max_iterations: int = 10000
+    ):
+        """
+        Initialize SelectorProfiler.
+
+        Args:
+            driver (WebDriver): Driver used for measuring.
+            locators (list[RegisteredLocator] | None): Locators to profile. Defaults
+                to every locator declared on a page object.
+            scales (tuple[int, ...]): DOM size multipliers; the body content is copied
+                scale - 1 times into a hidden container.
+            min_time_ms (float): Minimum measuring time per locator and scale.
+            max_iterations (int): Maximum calls per locator and scale.
+        """
+        self.driver: WebDriver = driver
+        self.locators: list[RegisteredLocator] = discover_locators() if locators is None else locators
+        self.scales: list[int] = sorted(set(scales))
+        self.min_time_ms: float = min_time_ms
+        self.max_iterations: int = max_iterations
+        self.costs: list[SelectorCost] = []
+
+    def profile_current_page(self, page: str | None = None) -> list[SelectorCost]:
+        """
+        Profile every locator on the page the driver currently shows.
+
+        Args:
+            page (str | None): Label for the page. Defaults to the current URL.
+
+        Returns:
+            list[SelectorCost]: One entry per locator and scale.
+        """
+        page = page or self.driver.current_url
+        queries = {}
+        costs = []
+        for locator in self.locators:
+            query = browser_scripts.to_browser_query(locator.locator)
+            if query:
+                queries[locator.qualified_name] = query
+            else:
+                costs.append(SelectorCost(
+                    locator.qualified_name, locator.locator[1], page, 1, 0, None, None,
+                    error=f"No browser query for strategy {locator.locator[0]}",
+                ))
+        names = list(queries)
+        results = self.driver.execute_script(
+            browser_scripts.SELECTOR_COST, [list(queries[name]) for name in names],
+            self.scales, self.min_time_ms, self.max_iterations,
+        )
+        for result in results:
+            for name, cost in zip(names, result["costs"]):
+                costs.append(SelectorCost(
+                    name, queries[name][1], page, result["scale"], result["nodes"],
+                    cost.get("matches"), cost.get("per_call_us"), cost.get("iterations", 0), cost.get("error"),
+                ))
+        self.costs.extend(costs)
+        logger.info("Profiled %s locators on %s at scales %s", len(names), page, self.scales)
+        return costs
+
+    def profile_url(self, url: str) -> list[SelectorCost]:
+        """
+        Open a URL and profile every locator on it.
+
+        Args:
+            url (str): Page to load.
+
+        Returns:
+            list[SelectorCost]: One entry per locator and scale.
+        """
+        self.driver.get(url)
+        return self.profile_current_page(url)
+
+    def profile_snapshot(self, snapshot: DomSnapshot) -> list[SelectorCost]:
+        """
+        Rebuild a recorded snapshot in an inert page and profile every locator on it.
+
+        Args:
+            snapshot (DomSnapshot): Snapshot recorded by DomSnapshotRecorder.
+
+        Returns:
+            list[SelectorCost]: One entry per locator and scale.
+        """
+        self.driver.get(INERT_PAGE)
+        self.driver.execute_script(browser_scripts.REBUILD_DOM_SNAPSHOT, snapshot.elements)
+        label = f"{snapshot.step or 'snapshot'}: {snapshot.url}" if snapshot.url else snapshot.step
+        return self.profile_current_page(label)
+
+    def report(self) -> dict:
+        """
+        Summarize the costs measured so far.
+
+        Returns:
+            dict: Per locator and page: query, matches and per-call cost (µs) by
+            node count, and the scaling exponent (slope of log cost over log nodes;
+            1.0 means cost grows linearly with the DOM). Also "slow": locators over
+            Config.SELECTOR_COST_WARN_US at scale 1 or with an exponent above SUPERLINEAR_EXPONENT.
+        """
+        grouped: dict[str, dict[str, list[SelectorCost]]] = {}
+        for cost in self.costs:
+            grouped.setdefault(cost.locator, {}).setdefault(cost.page, []).append(cost)
+        locators = {}
+        slow = []
+        for name, pages in grouped.items():
+            locators[name] = {}
+            for page, costs in pages.items():
+                measured = sorted((c for c in costs if c.per_call_us is not None), key=lambda c: c.scale)
+                errors = sorted({c.error for c in costs if c.error})
+                entry = {
+                    "query": costs[0].query,
+                    "matches": {c.nodes: c.matches for c in measured},
+                    "per_call_us": {c.nodes: round(c.per_call_us, 2) for c in measured},
+                    "scaling_exponent": _scaling_exponent(measured),
+                    "errors": errors,
+                }
+                locators[name][page] = entry
+                base = measured[0].per_call_us if measured else None
+                if (base is not None and base > Config.SELECTOR_COST_WARN_US) or \
+                        (entry["scaling_exponent"] or 0) > SUPERLINEAR_EXPONENT:
+                    slow.append({"locator": name, "page": page, "per_call_us": base,
+                                 "scaling_exponent": entry["scaling_exponent"]})
+        return {"scales": self.scales, "locators": locators, "slow": slow}
+
+    def write(self, path: str) -> str:
+        """
+        Write the report and every measurement as JSON.
+
+        Args:
+            path (str): Output file path.
+
+        Returns:
+            str: The path written.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"report": self.report(), "costs": [asdict(c) for c in self.costs]}, f, indent=2)
+        return path
+
+
+def _scaling_exponent(costs: list[SelectorCost]) -> float | None:
+    """Least-squares slope of log(cost) over log(nodes), or None with fewer than two sizes."""
+    points = [(math.log(c.nodes), math.log(c.per_call_us)) for c in costs if c.nodes and c.per_call_us]
+    if len({x for x, _ in points}) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+    return round(slope, 2)
+
+
+def main() -> None:
+    """Profile locator costs from the command line."""
+    parser = argparse.ArgumentParser(description="Measure page object locator costs in the browser.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--url", default=None, help="site to profile (defaults to TWITCH_URL)")
+    source.add_argument("--standin", action="store_true", help="profile the local stand-in site")
+    source.add_argument("--snapshots", nargs="*", default=None, help="recorded snapshot files or directories")
+    parser.add_argument("--paths", nargs="*", default=["/", "/directory", "/search?term=StarCraft%20II"])
+    parser.add_argument("--scales", nargs="*", type=int, default=[1, 2, 4])
+    parser.add_argument("--min-time-ms", type=float, default=25)
+    parser.add_argument("--output", default=None, help="JSON report path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    server = None
+    if args.standin:
+        server = StandInServer(StandInOptions.from_config(), port=Config.STANDIN_PORT).start()
+        Config.TWITCH_URL = server.url
+    elif args.url:
+        Config.TWITCH_URL = args.url.rstrip("/")
+    driver = WebDriverFactory.get_driver()
+    profiler = SelectorProfiler(driver, scales=tuple(args.scales), min_time_ms=args.min_time_ms)
+    try:
+        if args.snapshots is not None:
+            seen = set()
+            for snapshot in load_snapshots(args.snapshots or default_snapshot_paths()):
+                if snapshot.content_key in seen:
+                    continue
+                seen.add(snapshot.content_key)
+                profiler.profile_snapshot(snapshot)
+        else:
+            for path in args.paths:
+                profiler.profile_url(Config.TWITCH_URL + path)
+    finally:
+        driver.quit()
+        if server:
+            server.stop()
+    output = args.output or os.path.join(
+        Config.REPORT_DIR, "selector_costs", f"selector_costs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    profiler.write(output)
+    report = profiler.report()
+    print(f"{'locator':<70} {'nodes':>7} {'matches':>7} {'µs/call':>9} {'exp':>5}")
+    for name, pages in sorted(report["locators"].items()):
+        for page, entry in pages.items():
+            for nodes, cost in entry["per_call_us"].items():
+                print(f"{name:<70} {nodes:>7} {entry['matches'][nodes]:>7} {cost:>9.1f} "
+                      f"{entry['scaling_exponent'] if entry['scaling_exponent'] is not None else '-':>5}")
+    for item in report["slow"]:
+        print(f"SLOW {item['locator']} on {item['page']}: {item['per_call_us']} µs/call, "
+              f"scaling exponent {item['scaling_exponent']}")
+    logger.info("Selector cost report saved: %s", output)
+
+
+if __name__ == "__main__":
+    main()
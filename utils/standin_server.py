@@ -0,0 +1,468 @@
+import argparse
+import html
+import io
+import json
+import math
+import os
+import random
+import re
+import struct
+import threading
+import time
+import wave
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+from config.config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+RESERVED_PATHS = {"", "directory", "search", "activity", "home", "api", "media", "favicon.ico"}
+
+
+@dataclass
+class StandInOptions:
+    """Knobs controlling how the stand-in site responds."""
+
+    latency_ms: int = 0
+    jitter_ms: int = 0
+    card_count: int = 40
+    lazy_batch: int = 0
+    failure_rate: float = 0.0
+    failure_paths: str = ""
+    gate_ratio: float = 0.3
+    spinner_ms: int = 500
+    media_file: str = ""
+    seed: int = 0
+
+    @classmethod
+    def from_config(cls) -> "StandInOptions":
+        """
+        Build options from Config (and therefore from environment variables).
+
+        Returns:
+            StandInOptions: Options reflecting the current configuration.
+        """
+        return cls(
+            latency_ms=Config.STANDIN_LATENCY_MS,
+            jitter_ms=Config.STANDIN_JITTER_MS,
+            card_count=Config.STANDIN_CARD_COUNT,
+            lazy_batch=Config.STANDIN_LAZY_BATCH,
+            failure_rate=Config.STANDIN_FAILURE_RATE,
+            failure_paths=Config.STANDIN_FAILURE_PATHS,
+            gate_ratio=Config.STANDIN_GATE_RATIO,
+            spinner_ms=Config.STANDIN_SPINNER_MS,
+            media_file=Config.STANDIN_MEDIA_FILE,
+        )
+
+
+class StandInServer:
+    """
+    Local HTTP server imitating the parts of Twitch the page objects rely on.
+
+    Pages follow the DOM contracts of the locators in `pages/` (navigation links,
+    the `tw-input` search field, `ScCoreLink` streamer cards, the content
+    classification gate and a `video-ref` player with a local media file), so the
+    whole suite can run hermetically by pointing Config.TWITCH_URL at `url`.
+    """
+
+    def __init__(self, options: StandInOptions | None = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize StandInServer.
+
+        Args:
+            options (StandInOptions | None): Response knobs. Defaults to StandInOptions.from_config().
+            host (str): Interface to bind.
+            port (int): Port to bind; 0 picks a free port.
+        """
+        self.options: StandInOptions = options or StandInOptions.from_config()
+        self._httpd = ThreadingHTTPServer((host, port), _StandInRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.options = self.options
+        self._httpd.rng = random.Random(self.options.seed)
+        self._httpd.media = _load_media(self.options.media_file)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server, without a trailing slash."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        """
+        Start serving on a background thread.
+
+        Returns:
+            StandInServer: This server, for chaining.
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        logger.info("Stand-in Twitch server listening on %s", self.url)
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+        logger.info("Stand-in Twitch server stopped")
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    """Routes stand-in requests and applies latency and failure injection."""
+
+    server_version = "TwitchStandIn/1.0"
+
+    def do_GET(self) -> None:
+        options: StandInOptions = self.server.options
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+
+        delay = options.latency_ms + (self.server.rng.uniform(0, options.jitter_ms) if options.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+        if self._should_fail(parsed.path, options):
+            self._send(503, "text/plain", b"Injected failure")
+            return
+
+        segments = [s for s in parsed.path.split("/") if s]
+        route = segments[0] if segments else ""
+        term = query.get("term", [""])[0]
+
+        if route == "":
+            self._send_html(_page("Twitch", "<h1>Welcome to Twitch</h1>"))
+        elif route == "directory":
+            self._send_html(_page("Browse - Twitch", BROWSE_BODY))
+        elif route == "search":
+            self._send_html(_page(f"{term} - Search - Twitch", _search_body(term, options)))
+        elif route == "api" and segments[1:] == ["cards"]:
+            offset = _count_param(query, "offset", 0)
+            limit = _count_param(query, "limit", options.card_count)
+            if offset is None or limit is None:
+                self._send(400, "text/plain", b"offset and limit must be non-negative integers")
+                return
+            self._send_json(_cards_fragment(term, offset, limit, options))
+        elif route == "media":
+            self._send_media()
+        elif route in ("activity", "home"):
+            self._send_html(_page(f"{route.title()} - Twitch", f"<h1>{route.title()}</h1>"))
+        elif route == "favicon.ico":
+            self._send(204, "image/x-icon", b"")
+        elif len(segments) == 1 and route not in RESERVED_PATHS:
+            self._send_html(_page(f"{route} - Twitch", _stream_body(route, options)))
+        else:
+            self._send(404, "text/plain", b"Not found")
+
+    def _should_fail(self, path: str, options: StandInOptions) -> bool:
+        """Decide whether to inject a failure for this request."""
+        if options.failure_rate <= 0:
+            return False
+        if options.failure_paths and not re.search(options.failure_paths, path):
+            return False
+        return self.server.rng.random() < options.failure_rate
+
+    def _send_media(self) -> None:
+        """Serve the media file, honouring single byte-range requests."""
+        content_type, data = self.server.media
+        match = re.match(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+        if not match:
+            self._send(200, content_type, data, {"Accept-Ranges": "bytes"})
+            return
+        start = int(match.group(1) or 0)
+        end = int(match.group(2)) if match.group(2) else len(data) - 1
+        end = min(end, len(data) - 1)
+        self._send(206, content_type, data[start:end + 1], {
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{len(data)}",
+        })
+
+    def _send_html(self, body: str) -> None:
+        self._send(200, "text/html; charset=utf-8", body.encode("utf-8"))
+
+    def _send_json(self, payload: object) -> None:
+        self._send(200, "application/json", json.dumps(payload).encode("utf-8"))
+
+    def _send(self, status: int, content_type: str, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("stand-in %s - " + format, self.address_string(), *args)
+
+
+def _load_media(path: str) -> tuple[str, bytes]:
+    """
+    Load the configured media file, or synthesize a short looping audio track.
+
+    The synthesized track has no video, so PlaybackProbe reports no frame metrics
+    for it (has_video_track=False); set STANDIN_MEDIA_FILE to a small video to
+    measure time to first frame and dropped frames against the stand-in site.
+
+    Args:
+        path (str): Optional media file path.
+
+    Returns:
+        tuple[str, bytes]: Content type and file contents.
+    """
+    if path:
+        extension = os.path.splitext(path)[1].lower()
+        content_type = {".mp4": "video/mp4", ".webm": "video/webm", ".ogg": "video/ogg"}.get(extension, "application/octet-stream")
+        with open(path, "rb") as f:
+            return content_type, f.read()
+
+    rate, seconds = 8000, 2
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"".join(
+            struct.pack("<h", int(3000 * math.sin(2 * math.pi * 440 * i / rate))) for i in range(rate * seconds)
+        ))
+    return "audio/wav", buffer.getvalue()
+
+
+def _card(term: str, index: int) -> dict:
+    """Deterministically generate the data for one streamer card."""
+    slug = re.sub(r"\W+", "", term.lower()) or "stream"
+    rng = random.Random(f"{term}:{index}")
+    return {
+        "channel": f"{slug}_streamer_{index}",
+        "title": f"{term or 'Just Chatting'} stream #{index}",
+        "category": term or "Just Chatting",
+        "viewers": rng.randint(1, 250000),
+        "live": index % 7 != 6,
+    }
+
+
+def _format_viewers(viewers: int) -> str:
+    """Format viewer counts the way Twitch does (e.g. 1.2K viewers)."""
+    if viewers >= 1000:
+        return f"{viewers / 1000:.1f}K viewers"
+    return f"{viewers} viewers"
+
+
+def _card_html(card: dict) -> str:
+    """Render one streamer card matching SearchResultsPage locators."""
+    channel = html.escape(card["channel"])
+    title = html.escape(card["title"])
+    status = '<span class="tw-channel-status-text-indicator">LIVE</span>' if card["live"] else ""
+    return (
+        f'<div class="search-result-card" data-a-target="search-result-card">'
+        f'<button class="ScCoreLink-sc-16kq0mq-0 tw-link" data-href="/{channel}" '
+        f'onclick="window.location.href=this.dataset.href">'
+        f'<div class="card-thumbnail"></div>'
+        f'<p title="{title}">{title}</p>'
+        f'<p class="card-channel" data-a-target="search-result-channel">{channel}</p>'
+        f'<span data-a-target="search-result-category">{html.escape(card["category"])}</span>'
+        f'<span data-a-target="tw-stat-value">{_format_viewers(card["viewers"])}</span>'
+        f"{status}</button></div>"
+    )
+
+
+def _count_param(query: dict[str, list[str]], name: str, default: int) -> int | None:
+    """Read a non-negative integer query parameter; None if it is malformed."""
+    values = query.get(name)
+    if not values:
+        return default
+    value = values[0].strip()
+    return int(value) if value.isascii() and value.isdigit() else None
+
+
+def _cards_fragment(term: str, offset: int, limit: int, options: StandInOptions) -> dict:
+    """Render a batch of cards for lazy loading."""
+    end = min(offset + limit, options.card_count)
+    cards = "".join(_card_html(_card(term, i)) for i in range(offset, end))
+    return {"html": cards, "next": end, "done": end >= options.card_count}
+
+
+def _search_body(term: str, options: StandInOptions) -> str:
+    """Render the search results page, optionally lazy loading further cards."""
+    first_batch = options.lazy_batch or options.card_count
+    fragment = _cards_fragment(term, 0, first_batch, options)
+    return SEARCH_BODY_TEMPLATE % {
+        "cards": fragment["html"],
+        "term": json.dumps(term),
+        "next": fragment["next"],
+        "done": "true" if fragment["done"] else "false",
+        "batch": first_batch,
+    }
+
+
+def _stream_body(channel: str, options: StandInOptions) -> str:
+    """Render a stream page with spinner, optional content gate and player."""
+    gated = random.Random(channel).random() < options.gate_ratio
+    gate = GATE_OVERLAY if gated else ""
+    return STREAM_BODY_TEMPLATE % {
+        "channel": html.escape(channel),
+        "gate": gate,
+        "gated": "true" if gated else "false",
+        "spinner_ms": options.spinner_ms,
+        "media_url": "/media/stream" + quote(os.path.splitext(options.media_file)[1] or ".wav"),
+    }
+
+
+def _page(title: str, body: str) -> str:
+    """Wrap a page body with the shared layout and navigation bar."""
+    return PAGE_TEMPLATE % {"title": html.escape(title), "body": body}
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>%(title)s</title>
+<style>
+  body { margin: 0; font-family: sans-serif; background: #0e0e10; color: #efeff1; }
+  nav { display: flex; gap: 16px; padding: 12px; background: #18181b; }
+  nav a { color: #bf94ff; text-decoration: none; }
+  main { padding: 16px; }
+  .search-results { display: grid; grid-template-columns: repeat(auto-fill, minmax(240px, 1fr)); gap: 12px; }
+  .search-result-card button { width: 100%%; min-height: 220px; text-align: left; background: #1f1f23;
+    color: inherit; border: 0; cursor: pointer; }
+  .card-thumbnail { height: 120px; background: #3a3a3d; }
+  .tw-loading-spinner { width: 48px; height: 48px; border: 4px solid #bf94ff; border-radius: 50%%; }
+  [data-a-target="video-ref"] video { width: 640px; height: 360px; background: #000; }
+  [data-a-target="content-classification-gate-overlay"] { position: fixed; inset: 0;
+    background: rgba(0, 0, 0, 0.9); display: flex; align-items: center; justify-content: center; }
+</style>
+</head>
+<body>
+<nav>
+  <a href="/">Twitch</a>
+  <a href="/directory">Browse</a>
+  <a href="/activity">Activity</a>
+  <a href="/home">Home</a>
+</nav>
+<main>%(body)s</main>
+</body>
+</html>
+"""
+
+BROWSE_BODY = """
+<h1>Browse</h1>
+<form action="/search" method="get">
+  <input type="search" name="term" placeholder="Search" data-a-target="tw-input" autocomplete="off">
+</form>
+"""
+
+SEARCH_BODY_TEMPLATE = """
+<h1>Search results</h1>
+<div class="search-results" data-a-target="search-results">%(cards)s</div>
+<div id="search-results-sentinel" style="height: 1px"></div>
+<script>
+(function () {
+  var term = %(term)s, next = %(next)d, done = %(done)s, batch = %(batch)d, loading = false;
+  var results = document.querySelector('[data-a-target="search-results"]');
+  var sentinel = document.getElementById('search-results-sentinel');
+  function markEnd() { sentinel.setAttribute('data-a-target', 'search-results-end'); }
+  if (done) { markEnd(); return; }
+  function sentinelVisible() { return sentinel.getBoundingClientRect().top <= window.innerHeight; }
+  function loadMore() {
+    if (loading || done) return;
+    loading = true;
+    fetch('/api/cards?term=' + encodeURIComponent(term) + '&offset=' + next + '&limit=' + batch)
+      .then(function (r) { return r.json(); })
+      .then(function (data) {
+        results.insertAdjacentHTML('beforeend', data.html);
+        next = data.next; done = data.done; loading = false;
+        if (done) { observer.disconnect(); markEnd(); }
+        else if (sentinelVisible()) { loadMore(); }
+      })
+      .catch(function () { loading = false; });
+  }
+  var observer = new IntersectionObserver(function (entries) {
+    if (entries[0].isIntersecting) loadMore();
+  });
+  observer.observe(sentinel);
+})();
+</script>
+"""
+
+GATE_OVERLAY = """
+<div data-a-target="content-classification-gate-overlay">
+  <div>
+    <p>The broadcaster has indicated that this channel is intended for mature audiences.</p>
+    <button data-a-target="content-classification-gate-overlay-start-watching-button">Start Watching</button>
+  </div>
+</div>
+"""
+
+STREAM_BODY_TEMPLATE = """
+<h1>%(channel)s</h1>
+<div class="tw-loading-spinner"></div>
+<div data-a-target="video-ref"><video muted autoplay playsinline loop></video></div>
+%(gate)s
+<script>
+(function () {
+  var gated = %(gated)s, spinnerDone = false;
+  var video = document.querySelector('[data-a-target="video-ref"] video');
+  function maybeStart() {
+    if (gated || !spinnerDone || video.getAttribute('src')) return;
+    video.src = '%(media_url)s';
+    video.play().catch(function () {});
+  }
+  setTimeout(function () {
+    var spinner = document.querySelector('.tw-loading-spinner');
+    if (spinner) spinner.remove();
+    spinnerDone = true;
+    maybeStart();
+  }, %(spinner_ms)d);
+  var button = document.querySelector('[data-a-target="content-classification-gate-overlay-start-watching-button"]');
+  if (button) {
+    button.addEventListener('click', function () {
+      document.querySelector('[data-a-target="content-classification-gate-overlay"]').remove();
+      gated = false;
+      maybeStart();
+    });
+  }
+})();
+</script>
+"""
+
+
+def main() -> None:
+    """Run the stand-in server in the foreground."""
+    defaults = StandInOptions.from_config()
+    parser = argparse.ArgumentParser(description="Serve a local Twitch stand-in site.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=Config.STANDIN_PORT)
+    parser.add_argument("--latency-ms", type=int, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=int, default=defaults.jitter_ms)
+    parser.add_argument("--card-count", type=int, default=defaults.card_count)
+    parser.add_argument("--lazy-batch", type=int, default=defaults.lazy_batch)
+    parser.add_argument("--failure-rate", type=float, default=defaults.failure_rate)
+    parser.add_argument("--failure-paths", default=defaults.failure_paths)
+    parser.add_argument("--gate-ratio", type=float, default=defaults.gate_ratio)
+    parser.add_argument("--spinner-ms", type=int, default=defaults.spinner_ms)
+    parser.add_argument("--media-file", default=defaults.media_file)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    options = StandInOptions(**{k: v for k, v in vars(args).items() if k not in ("host", "port")})
+    server = StandInServer(options, args.host, args.port).start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
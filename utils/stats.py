@@ -0,0 +1,44 @@
+import math
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Compute a percentile with linear interpolation between closest ranks.
+
+    Args:
+        values (list[float]): Sample values (need not be sorted).
+        pct (float): Percentile in the range 0-100.
+
+    Returns:
+        float: The percentile value, or NaN for an empty sample.
+    """
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    """
+    Summarize a sample with count, mean and common percentiles.
+
+    Args:
+        values (list[float]): Sample values.
+
+    Returns:
+        dict[str, float]: count, mean, p50, p90, p95, p99 and max.
+    """
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else math.nan,
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else math.nan,
+    }
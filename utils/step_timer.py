@@ -0,0 +1,251 @@
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, TypeVar
+from selenium.webdriver.remote.webdriver import WebDriver
+import logging
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_active_timer: ContextVar["StepTimer | None"] = ContextVar("active_step_timer", default=None)
+
+
+class Span:
+    """A timed step with its WebDriver command count and nested child steps."""
+
+    __slots__ = ("name", "start", "end", "commands", "children")
+
+    def __init__(self, name: str, start: float):
+        self.name: str = name
+        self.start: float = start
+        self.end: float | None = None
+        self.commands: int = 0
+        self.children: list["Span"] = []
+
+    @property
+    def duration_ms(self) -> float:
+        """Wall time of the span in milliseconds (0 while still open)."""
+        return (self.end - self.start) * 1000 if self.end is not None else 0.0
+
+    def to_dict(self, origin: float) -> dict:
+        """
+        Serialize the span tree.
+
+        Args:
+            origin (float): perf_counter value that offsets are relative to.
+
+        Returns:
+            dict: Span name, offsets, duration, command count and children.
+        """
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "commands": self.commands,
+            "children": [child.to_dict(origin) for child in self.children],
+        }
+
+
+class StepTimer:
+    """
+    Records nested timing spans for one test.
+
+    Spans are opened with `span()` or the `timed_step` decorator and count the
+    WebDriver commands issued while they are open (see `instrument_driver`).
+    The timer bound to the current context is the one decorators record into.
+    """
+
+    def __init__(self, test_id: str):
+        """
+        Initialize StepTimer.
+
+        Args:
+            test_id (str): Identifier of the test being timed (usually the nodeid).
+        """
+        self.test_id: str = test_id
+        self.origin: float = time.perf_counter()
+        self.roots: list[Span] = []
+        self._stack: list[Span] = []
+        self._commands: int = 0
+        self._token = None
+
+    @staticmethod
+    def current() -> "StepTimer | None":
+        """Return the timer active in the current context, if any."""
+        return _active_timer.get()
+
+    def activate(self) -> "StepTimer":
+        """Make this timer the active one for the current context."""
+        self._token = _active_timer.set(self)
+        return self
+
+    def deactivate(self) -> None:
+        """Stop recording into this timer."""
+        if self._token is not None:
+            _active_timer.reset(self._token)
+            self._token = None
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        """
+        Time a block of code as a span nested under the currently open span.
+
+        Args:
+            name (str): Step name.
+
+        Yields:
+            Span: The open span.
+        """
+        span = Span(name, time.perf_counter())
+        (self._stack[-1].children if self._stack else self.roots).append(span)
+        self._stack.append(span)
+        commands_before = self._commands
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            span.commands = self._commands - commands_before
+            self._stack.pop()
+
+    @property
+    def current_step(self) -> str | None:
+        """Name of the innermost open span."""
+        return self._stack[-1].name if self._stack else None
+
+    def count_command(self) -> None:
+        """Record one WebDriver command against the open spans."""
+        self._commands += 1
+
+    def iter_spans(self) -> Iterator[Span]:
+        """Iterate over all recorded spans, depth first."""
+        pending = list(reversed(self.roots))
+        while pending:
+            span = pending.pop()
+            yield span
+            pending.extend(reversed(span.children))
+
+    def durations(self) -> list[tuple[str, float]]:
+        """
+        Get (name, duration_ms) pairs for every closed span.
+
+        Returns:
+            list[tuple[str, float]]: Step durations in recording order.
+        """
+        return [(span.name, span.duration_ms) for span in self.iter_spans() if span.end is not None]
+
+    def to_dict(self) -> dict:
+        """Serialize the timer as a JSON-friendly dict."""
+        return {
+            "test": self.test_id,
+            "total_commands": self._commands,
+            "spans": [span.to_dict(self.origin) for span in self.roots],
+        }
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Convert spans to the Chrome trace-event format (chrome://tracing, Perfetto).
+
+        Returns:
+            dict: A {"traceEvents": [...]} document of complete ("X") events.
+        """
+        pid = os.getpid()
+        tid = threading.get_ident()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": self.test_id}}]
+        for span in self.iter_spans():
+            if span.end is None:
+                continue
+            events.append({
+                "name": span.name,
+                "cat": "step",
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1_000_000, 1),
+                "dur": round(span.duration_ms * 1000, 1),
+                "pid": pid,
+                "tid": tid,
+                "args": {"commands": span.commands},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, directory: str) -> tuple[str, str]:
+        """
+        Write the per-test JSON and Chrome trace files.
+
+        Args:
+            directory (str): Output directory.
+
+        Returns:
+            tuple[str, str]: Paths of the JSON file and the trace file.
+        """
+        os.makedirs(directory, exist_ok=True)
+        safe_name = re.sub(r"\W+", "_", self.test_id).strip("_")
+        json_path = os.path.join(directory, f"{safe_name}.json")
+        trace_path = os.path.join(directory, f"{safe_name}.trace.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+        return json_path, trace_path
+
+    @staticmethod
+    def instrument_driver(driver: WebDriver) -> WebDriver:
+        """
+        Count every WebDriver command issued through this driver in the active timer.
+
+        WebElement commands go through their parent driver, so they are counted too.
+        Instrumenting the same driver twice is a no-op.
+
+        Args:
+            driver (WebDriver): Driver to instrument.
+
+        Returns:
+            WebDriver: The same driver.
+        """
+        if getattr(driver, "_step_timer_instrumented", False):
+            return driver
+        execute = driver.execute
+
+        @functools.wraps(execute)
+        def counting_execute(*args, **kwargs):
+            timer = _active_timer.get()
+            if timer is not None:
+                timer.count_command()
+            return execute(*args, **kwargs)
+
+        driver.execute = counting_execute
+        driver._step_timer_instrumented = True
+        return driver
+
+
+def timed_step(name: str | None = None) -> Callable[[F], F]:
+    """
+    Decorate a function so each call is recorded as a span in the active StepTimer.
+
+    Without an active timer the call goes straight through.
+
+    Args:
+        name (str | None): Span name. Defaults to the function's qualified name.
+
+    Returns:
+        Callable[[F], F]: The decorator.
+    """
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timer = _active_timer.get()
+            if timer is None:
+                return func(*args, **kwargs)
+            with timer.span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
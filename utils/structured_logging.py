@@ -0,0 +1,220 @@
+"""
+Asynchronous JSON-lines logging with per-test DEBUG buffers.
+
+Test threads enqueue log records (QueueHandler), merging message arguments only
+for records at LOG_LEVEL and above; JSON formatting and file I/O happen on a
+QueueListener thread. Every record carries the test id, journey step
+and xdist worker it was logged under. Records at LOG_LEVEL and above go to the
+console and to logs/<worker>/test_execution.jsonl. Records of every level are kept
+per test and written to logs/<worker>/failed_tests/<test>.jsonl only when the
+test fails (or is rerun); for passing tests they are dropped unformatted.
+"""
+import copy
+import json
+import logging
+import os
+import queue
+import re
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterator
+from utils import parallel
+from config.config import Config
+
+LOG_FILE_NAME: str = "test_execution.jsonl"
+# Written by the xdist controller from every worker's LOG_FILE_NAME
+MERGED_LOG_FILE_NAME: str = "test_execution_workers.jsonl"
+TEXT_FORMAT: str = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_current_test: ContextVar[str | None] = ContextVar("log_test_id", default=None)
+_current_step: ContextVar[str | None] = ContextVar("log_step", default=None)
+_listener: "_TestAwareListener | None" = None
+_exception_formatter: logging.Formatter = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "test": getattr(record, "test_id", None),
+            "step": getattr(record, "step", None),
+            "worker": getattr(record, "worker", None),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _ContextFilter(logging.Filter):
+    """Stamps records with the test, step and worker of the logging thread."""
+
+    def __init__(self):
+        super().__init__()
+        self.worker: str = parallel.worker_id()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.test_id = _current_test.get()
+        record.step = _current_step.get()
+        record.worker = self.worker
+        return True
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that formats only the records the listener writes straight away.
+
+    Records at emit_level and above go to the console and the log file. As in the stock
+    QueueHandler, their message and traceback are rendered on the logging thread and the
+    arguments dropped, so the log shows values as they were at the call. Records below
+    emit_level only reach the per-test buffer and are written only if the test fails;
+    they are queued unformatted and rendered by the listener at that point, so a mutable
+    argument shows its state at the end of the test.
+    """
+
+    def __init__(self, log_queue: queue.Queue, emit_level: int):
+        """
+        Initialize _DeferredQueueHandler.
+
+        Args:
+            log_queue (queue.Queue): Queue read by the listener.
+            emit_level (int): Lowest level written by the console and file handlers.
+        """
+        super().__init__(log_queue)
+        self.emit_level: int = emit_level
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.levelno >= self.emit_level:
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+                record.exc_info = None
+        return record
+
+
+class _TestEnd:
+    """Queue marker: the test finished; flush or drop its buffered records."""
+
+    def __init__(self, test_id: str, failed: bool):
+        self.test_id: str = test_id
+        self.failed: bool = failed
+
+
+class _TestAwareListener(QueueListener):
+    """QueueListener that also keeps each test's records until the test ends."""
+
+    def __init__(self, log_queue: queue.Queue, buffer_dir: str, buffer_size: int, *handlers: logging.Handler):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.buffer_dir: str = buffer_dir
+        self.buffer_size: int = buffer_size
+        self.buffers: dict[str, deque[logging.LogRecord]] = {}
+        self.formatter: JsonFormatter = JsonFormatter()
+
+    def handle(self, record: "logging.LogRecord | _TestEnd") -> None:
+        if isinstance(record, _TestEnd):
+            self._end_test(record)
+            return
+        test_id = getattr(record, "test_id", None)
+        if test_id and self.buffer_size:
+            self.buffers.setdefault(test_id, deque(maxlen=self.buffer_size)).append(record)
+        super().handle(record)
+
+    def _end_test(self, end: _TestEnd) -> None:
+        records = self.buffers.pop(end.test_id, None)
+        if not end.failed or not records:
+            return
+        os.makedirs(self.buffer_dir, exist_ok=True)
+        path = os.path.join(self.buffer_dir, re.sub(r"\W+", "_", end.test_id).strip("_") + ".jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(self.formatter.format(record) + "\n" for record in records)
+
+
+def configure(log_dir: str, level: str | None = None, buffer_size: int | None = None) -> None:
+    """
+    Route all logging through a queue to the console, a JSON-lines file and the
+    per-test buffers. Replaces any handlers already on the root logger.
+
+    Args:
+        log_dir (str): Directory of test_execution.jsonl and failed_tests/.
+        level (str | None): Console and file level. Defaults to Config.LOG_LEVEL.
+        buffer_size (int | None): Records kept per test (0 disables the buffers and
+            DEBUG logging). Defaults to Config.LOG_TEST_BUFFER_RECORDS.
+    """
+    global _listener
+    shutdown()
+    level = (level or Config.LOG_LEVEL).upper()
+    buffer_size = Config.LOG_TEST_BUFFER_RECORDS if buffer_size is None else buffer_size
+    os.makedirs(log_dir, exist_ok=True)
+
+    file_handler = logging.FileHandler(
+        os.path.join(log_dir, LOG_FILE_NAME), mode="w" if parallel.is_worker() else "a", encoding="utf-8"
+    )
+    file_handler.setLevel(level)
+    file_handler.setFormatter(JsonFormatter())
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(level)
+    console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue()
+    queue_handler = _DeferredQueueHandler(log_queue, file_handler.level)
+    queue_handler.addFilter(_ContextFilter())
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(logging.DEBUG if buffer_size else level)
+
+    _listener = _TestAwareListener(
+        log_queue, os.path.join(log_dir, "failed_tests"), buffer_size, file_handler, console_handler
+    )
+    _listener.start()
+
+
+def shutdown() -> None:
+    """Write every queued record and stop the listener thread."""
+    global _listener
+    if _listener:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def begin_test(test_id: str) -> None:
+    """Attribute records logged from now on (on this thread) to a test."""
+    _current_test.set(test_id)
+
+
+def end_test(test_id: str, failed: bool) -> None:
+    """
+    Close a test's record buffer: written to failed_tests/ if the test failed, dropped otherwise.
+
+    Args:
+        test_id (str): Test id passed to begin_test().
+        failed (bool): Whether any phase or attempt of the test failed.
+    """
+    _current_test.set(None)
+    if _listener:
+        _listener.queue.put_nowait(_TestEnd(test_id, failed))
+
+
+@contextmanager
+def log_step(step: str) -> Iterator[None]:
+    """Attribute records logged inside the block to a journey step."""
+    token = _current_step.set(step)
+    try:
+        yield
+    finally:
+        _current_step.reset(token)
@@ -1,7 +1,10 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from utils.driver_resolver import ChromeDriverResolver
+from utils.network_replay import attach_network_mode
+from utils.profile_templates import ProfileTemplate
+from utils.resource_profiles import ResourceBlocker
 from config.config import Config
 import logging
 
@@ -14,7 +17,8 @@ class WebDriverFactory:
     def get_driver(
         browser_name: str | None = None,
         headless: bool | None = None,
-        mobile_device: str | None = None
+        mobile_device: str | None = None,
+        resource_profile: str | None = None
     ) -> webdriver.Chrome:
         """
         Create and configure a Chrome WebDriver instance with optional mobile emulation.
@@ -23,6 +27,8 @@ class WebDriverFactory:
             browser_name (str, optional): Browser name ("chrome" only supported).
             headless (bool, optional): Whether to run browser in headless mode.
             mobile_device (str, optional): Mobile device name for Chrome emulation (e.g., "iPhone 12").
+            resource_profile (str, optional): Request blocking profile (see utils.resource_profiles).
+                Defaults to Config.RESOURCE_PROFILE.
 
         Returns:
             webdriver.Chrome: Configured Chrome WebDriver instance.
@@ -35,18 +41,35 @@ class WebDriverFactory:
         mobile_device = mobile_device or Config.MOBILE_DEVICE
 
         if browser_name.lower() == "chrome":
-            return WebDriverFactory._create_chrome_driver(headless, mobile_device)
+            user_data_dir = ProfileTemplate.session_copy() if Config.PROFILE_TEMPLATE else None
+            driver = WebDriverFactory._create_chrome_driver(headless, mobile_device, user_data_dir)
+            if user_data_dir:
+                ProfileTemplate.cleanup_with(driver, user_data_dir)
+            try:
+                ResourceBlocker.apply(driver, resource_profile or Config.RESOURCE_PROFILE)
+                attach_network_mode(driver)
+            except Exception:
+                # The caller never gets the driver, so its browser would be left running
+                logger.error("Failed to set up the new driver; quitting it")
+                driver.quit()
+                raise
+            return driver
         else:
             raise ValueError(f"Unsupported browser: {browser_name}")
 
     @staticmethod
-    def _create_chrome_driver(headless: bool, mobile_device: str) -> webdriver.Chrome:
+    def _create_chrome_driver(
+        headless: bool,
+        mobile_device: str,
+        user_data_dir: str | None = None
+    ) -> webdriver.Chrome:
         """
         Create a Chrome driver with optional mobile device emulation.
 
         Args:
             headless (bool): Headless mode.
             mobile_device (str): Chrome device emulation name, e.g., "iPhone 12".
+            user_data_dir (str, optional): Profile directory; Chrome uses a new temporary one if omitted.
 
         Returns:
             webdriver.Chrome: Chrome driver instance.
@@ -62,12 +85,24 @@ class WebDriverFactory:
         options.add_argument("--disable-infobars")
         options.add_argument("--disable-notifications")
         options.add_argument("--disable-popup-blocking")
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+            options.add_argument("--no-first-run")
+            options.add_argument("--no-default-browser-check")
         if headless:
             options.add_argument("--headless=new")  # Chrome 109+; use "--headless" for legacy
+        logging_prefs = {}
+        if Config.PERFORMANCE_LOG:
+            logging_prefs["performance"] = "ALL"
+        if Config.FAILURE_ARTIFACTS:
+            # Console messages of every level for failure bundles
+            logging_prefs["browser"] = "ALL"
+        if logging_prefs:
+            options.set_capability("goog:loggingPrefs", logging_prefs)
 
-        service = Service(ChromeDriverManager().install())
+        service = Service(ChromeDriverResolver.get_driver_path())
         driver = webdriver.Chrome(service=service, options=options)
         driver.implicitly_wait(Config.IMPLICIT_WAIT)
         driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
-        logger.info(f"Chrome driver created successfully (mobile emulation: {mobile_device})")
+        logger.info("Chrome driver created successfully (mobile emulation: %s)", mobile_device)
         return driver